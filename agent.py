@@ -413,58 +413,174 @@ class OutreachAgent:
         # Get draft businesses from Google Sheet
         sys.path.insert(0, str(self.tools_dir))
         from get_draft_businesses import get_draft_businesses
+        from tools.checkpoint import GenerationCheckpoint, campaign_key
+
+        # An interrupted run for the same campaign and sheet can pick up
+        # where it stopped, without re-reading the sheet
+        checkpoint = GenerationCheckpoint()
+        run_key = campaign_key(config)
+        resumed = False
+        if checkpoint.resume(run_key):
+            done = len(checkpoint.businesses) - len(checkpoint.remaining_businesses())
+            answer = input(f"\n⏯️  Resume the previous run ({done}/{len(checkpoint.businesses)} "
+                           f"emails generated)? (yes/no, default yes): ")
+            resumed = answer.strip().lower() not in ("no", "n")
+            if not resumed:
+                checkpoint.close()
+
+        if resumed:
+            logger.info(f"Resuming generation from checkpoint: "
+                        f"{len(checkpoint.remaining_businesses())} businesses left")
+            print(f"📊 Resuming: {len(checkpoint.remaining_businesses())} of "
+                  f"{len(checkpoint.businesses)} businesses left")
+        else:
+            drafts = get_draft_businesses()
 
-        businesses = get_draft_businesses()
+            if not drafts:
+                logger.warning("No draft businesses found in Google Sheet")
+                print("\n❌ No draft businesses found in Google Sheet")
+                return
 
-        if not businesses:
-            logger.warning("No draft businesses found in Google Sheet")
-            print("\n❌ No draft businesses found in Google Sheet")
-            return
+            logger.info(f"Found {len(drafts)} draft businesses")
+            print(f"📊 Found {len(drafts)} businesses with 'Draft' status")
+            checkpoint.start(run_key, drafts)
 
-        logger.info(f"Found {len(businesses)} draft businesses")
-        print(f"📊 Found {len(businesses)} businesses with 'Draft' status")
+        businesses = checkpoint.remaining_businesses()
 
         # Choose the right email generation tool based on strategy
+        from tools.prompt_templates import get_prompt_template
+
         if config['outreach_type'] == "general_help":
             from generate_general_email import generate_general_email as generate_email
+            from generate_general_email import build_general_prompt
+            template = get_prompt_template(build_general_prompt, config['business_type'])
+
             logger.info("Using GENERAL HELP email strategy")
             print("\n🎯 Using GENERAL HELP email strategy")
         else:
             from generate_specific_email import generate_specific_email as generate_email
+            from generate_specific_email import build_specific_prompt
+            template = get_prompt_template(
+                build_specific_prompt, config['business_type'], config.get('automation_focus')
+            )
+
             logger.info(f"Using SPECIFIC AUTOMATION strategy: {config.get('automation_focus', 'N/A')}")
             print(f"\n🎯 Using SPECIFIC AUTOMATION strategy")
             print(f"   Focus: {config.get('automation_focus', 'N/A')}")
 
-        # Generate emails for each business
-        for i, business in enumerate(businesses, 1):
-            logger.info(f"Generating email {i}/{len(businesses)} for: {business['name']}")
-            print(f"\n[{i}/{len(businesses)}] Generating email for: {business['name']}")
-
-            # Scrape website if available
-            website_content = ""
-            if business.get('website'):
-                logger.debug(f"Scraping website: {business['website']}")
-                print(f"   🌐 Scraping website: {business['website']}")
-                from scrape_website import scrape_website
-                website_content = scrape_website(business['website'])
-
-            # Generate email using appropriate strategy
-            subject, body = generate_email(
+        # Websites are fetched concurrently and handed over as they finish,
+        # so generation never waits on a single slow site
+        from scrape_website import prefetch_websites
+        from sheet_writer import BatchSheetWriter
+        from pipeline import generate_emails_pipeline
+        from tools.rate_limiter import get_gemini_limiter
+
+        with_website = sum(1 for b in businesses if b.get('website'))
+        if with_website:
+            logger.info(f"Prefetching {with_website} websites")
+            print(f"\n🌐 Scraping {with_website} websites in the background...")
+
+        # All Gemini workers share one requests/tokens-per-minute budget
+        limiter = get_gemini_limiter()
+
+        # Emails for unchanged prompts are reused unless the user wants fresh ones.
+        # Shared caches are imported through the tools package, the same
+        # modules the tools themselves use, so there is one instance of each
+        from tools.email_cache import get_email_cache
+        email_cache = get_email_cache()
+        use_cache = True
+        if email_cache.stats()['entries']:
+            answer = input("\n♻️  Reuse previously generated emails for unchanged businesses? (yes/no, default yes): ")
+            use_cache = answer.strip().lower() not in ("no", "n")
+            logger.info(f"Email cache {'enabled' if use_cache else 'disabled (regenerating)'}")
+
+        def generate(business, website_content):
+            return generate_email(
                 business_name=business['name'],
                 business_type=config['business_type'],
                 website_content=website_content,
-                automation_focus=config.get('automation_focus')
+                automation_focus=config.get('automation_focus'),
+                limiter=limiter,
+                use_cache=use_cache
             )
 
-            logger.info(f"Generated email: {subject}")
-            print(f"   ✅ Generated: {subject}")
+        def report(completed, total, business, error):
+            if error:
+                logger.error(f"Email generation failed for {business['name']}: {error}")
+            else:
+                logger.info(f"Generated email {completed}/{total} for: {business['name']}")
+                print(f"   [{completed}/{total}] ✅ {business['name']}")
+
+        # Large campaigns can go through the Batch API instead: cheaper,
+        # but results can take hours
+        from batch_generate import generate_emails_batch
+        from constants import GEMINI_BATCH_MIN_BUSINESSES
+
+        use_batch = False
+        if len(businesses) >= GEMINI_BATCH_MIN_BUSINESSES:
+            answer = input("\n📦 Use Gemini batch mode (cheaper, may take hours)? (yes/no, default no): ")
+            use_batch = answer.strip().lower() in ("yes", "y")
+
+        if use_batch:
+            logger.info("Generating emails with Gemini batch mode")
+            print("\n📦 Scraping websites before submitting batch jobs...")
+            jobs = list(prefetch_websites(businesses))
+            results = generate_emails_batch(
+                jobs,
+                lambda business, website_content: template.render(business['name'], website_content),
+                use_cache=use_cache,
+                progress_callback=report
+            )
+        else:
+            # Reading, scraping, generation and write-back each run at their
+            # own pace, linked by bounded queues so memory stays flat
+            results = generate_emails_pipeline(
+                businesses, generate, total=len(businesses), progress_callback=report
+            )
 
-            # Update Google Sheet
-            from update_sheet_emails import update_email
-            update_email(business['row_number'], subject, body)
+        generated = 0
+        print("\n✍️  Generating emails...")
 
-        logger.info(f"Successfully generated {len(businesses)} emails")
-        print("\n✅ All emails generated successfully!")
+        # Generated emails are buffered and written back in batches;
+        # leaving the with-block (including Ctrl-C) flushes the rest.
+        # Every email is journalled before it is queued and every saved
+        # batch after it lands, so a crash loses no finished work
+        try:
+            with BatchSheetWriter(on_flush=checkpoint.record_written) as writer:
+                for row_number, subject, body in checkpoint.unwritten_emails():
+                    writer.add_email(row_number, subject, body)
+
+                for business, subject, body in results:
+                    checkpoint.record_generated(business['row_number'], subject, body)
+                    # Queue Google Sheet update
+                    writer.add_email(business['row_number'], subject, body)
+                    generated += 1
+        finally:
+            checkpoint.close()
+
+        if checkpoint.remaining_businesses() or checkpoint.unwritten_emails():
+            logger.info("Generation incomplete, checkpoint kept for the next run")
+            print("\n⏯️  Some emails are still missing; run generation again to resume")
+        else:
+            checkpoint.complete()
+
+        if with_website:
+            from tools.website_cache import get_website_cache
+            stats = get_website_cache().stats()
+            logger.info(f"Website cache: {stats}")
+            print(f"\n🗄️  Website cache: {stats['hits']} hits, "
+                  f"{stats['revalidated']} revalidated, "
+                  f"{stats['misses'] - stats['revalidated']} fetched")
+
+        if use_cache and email_cache.hits:
+            logger.info(f"Email cache: {email_cache.stats()}")
+            print(f"\n♻️  Reused {email_cache.hits} previously generated emails")
+
+        if limiter.rate_limited:
+            print(f"\n⏳ Gemini rate limit was hit {limiter.rate_limited} times")
+
+        logger.info(f"Successfully generated {generated}/{len(businesses)} emails")
+        print(f"\n✅ Generated {generated}/{len(businesses)} emails!")
         print("   Check your Google Sheet to review them")
 
     def manage_sheet(self):
@@ -490,7 +606,24 @@ class OutreachAgent:
         print("="*60)
         logger.info("Starting email sending workflow")
 
+        print("\nWhen should the emails go out?")
+        print("1. Now")
+        print("2. Scheduled in each recipient's business hours")
+        choice = get_validated_input(
+            "Choose (1-2): ",
+            validate_choice,
+            valid_choices=["1", "2"]
+        )
+
         sys.path.insert(0, str(self.tools_dir))
+
+        if choice == "2":
+            from tools.send_scheduler import schedule_approved_emails
+
+            scheduled_count = schedule_approved_emails()
+            logger.info(f"Email scheduling complete: {scheduled_count} emails scheduled")
+            return
+
         from send_emails import send_approved_emails
 
         sent_count = send_approved_emails()
@@ -704,19 +837,23 @@ class OutreachAgent:
             print("\n🔍 Verification options:")
             print("1. Quick (syntax only) - Fast, basic validation")
             print("2. Full (syntax + DNS) - Slower, checks if domain accepts email")
+            print("3. Deep (syntax + DNS + mailbox) - Asks each mail server if the mailbox exists")
 
             check_choice = get_validated_input(
-                "\nChoose verification level (1-2): ",
+                "\nChoose verification level (1-3): ",
                 validate_choice,
-                valid_choices=["1", "2"]
+                valid_choices=["1", "2", "3"]
             )
 
-            check_dns = (check_choice == "2")
+            check_dns = check_choice in ("2", "3")
+            probe_smtp = (check_choice == "3")
 
             # Confirm
             print(f"\n⚠️  About to verify {len(businesses_with_emails)} email addresses")
             if check_dns:
-                print("   This may take 1-2 minutes with DNS checking...")
+                print("   Each distinct domain is checked once, several at a time...")
+            if probe_smtp:
+                print("   Mailbox probes need outbound port 25 and can be slow on strict servers")
 
             confirm = input("\nProceed with verification? (yes/no): ").strip().lower()
             if confirm != "yes":
@@ -727,7 +864,7 @@ class OutreachAgent:
             print(f"\n🔍 Verifying email addresses...")
             from verify_emails import verify_businesses
 
-            verified = verify_businesses(businesses_with_emails, check_dns=check_dns)
+            verified = verify_businesses(businesses_with_emails, check_dns=check_dns, probe_smtp=probe_smtp)
 
             # Show results
             valid = [b for b in verified if b.get('email_verified')]
@@ -1,6 +1,7 @@
 """Email generation service wrapper using Gemini AI."""
 import os
 import sys
+import asyncio
 from typing import List, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
@@ -9,16 +10,67 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
 
 from tools.generate_general_email import generate_general_email
 from tools.generate_specific_email import generate_specific_email
+from tools.parallel_generate import generate_emails_parallel
+from tools.rate_limiter import get_gemini_limiter
 from app.models import Campaign, UserSettings, OutreachType
 from app.core.security import decrypt_value
 
 
+def gemini_api_key(user_settings: UserSettings) -> str:
+    """
+    Decrypt the user's Gemini API key.
+
+    Args:
+        user_settings: User settings with encrypted Gemini API key
+
+    Returns:
+        Plain-text API key
+    """
+    if not user_settings.gemini_api_key:
+        raise ValueError("Gemini API key not configured for user")
+
+    return decrypt_value(user_settings.gemini_api_key)
+
+
 class EmailGenerationService:
     """Service for generating personalized emails using AI."""
 
     def __init__(self, db: Session):
         self.db = db
 
+    def _generate(
+        self,
+        campaign: Campaign,
+        business: Dict[str, Any],
+        api_key: str,
+        limiter=None
+    ) -> Tuple[str, str]:
+        """
+        Generate subject and body with the campaign's strategy.
+
+        Args:
+            campaign: Campaign object
+            business: Business dictionary
+            api_key: User's Gemini API key
+            limiter: Optional shared GeminiRateLimiter
+
+        Returns:
+            Tuple of (subject, body)
+        """
+        if campaign.outreach_type == OutreachType.GENERAL_HELP:
+            generate = generate_general_email
+        else:  # SPECIFIC_AUTOMATION
+            generate = generate_specific_email
+
+        return generate(
+            business_name=business.get("name", ""),
+            business_type=campaign.business_type,
+            website_content=business.get("website_context", ""),
+            automation_focus=campaign.automation_focus or None,
+            limiter=limiter,
+            api_key=api_key
+        )
+
     def generate_email_for_business(
         self,
         campaign: Campaign,
@@ -36,41 +88,7 @@ class EmailGenerationService:
         Returns:
             Tuple of (subject, body)
         """
-        # Decrypt and set Gemini API key temporarily
-        if not user_settings.gemini_api_key:
-            raise ValueError("Gemini API key not configured for user")
-
-        gemini_key = decrypt_value(user_settings.gemini_api_key)
-        original_key = os.environ.get("GEMINI_API_KEY")
-        os.environ["GEMINI_API_KEY"] = gemini_key
-
-        try:
-            if campaign.outreach_type == OutreachType.GENERAL_HELP:
-                subject, body = generate_general_email(
-                    business_name=business.get("name", ""),
-                    business_type=campaign.business_type,
-                    location=business.get("location", ""),
-                    website=business.get("website", ""),
-                    website_context=business.get("website_context", "")
-                )
-            else:  # SPECIFIC_AUTOMATION
-                subject, body = generate_specific_email(
-                    business_name=business.get("name", ""),
-                    business_type=campaign.business_type,
-                    automation_focus=campaign.automation_focus or "",
-                    location=business.get("location", ""),
-                    website=business.get("website", ""),
-                    website_context=business.get("website_context", "")
-                )
-
-            return subject, body
-
-        finally:
-            # Restore original env var
-            if original_key:
-                os.environ["GEMINI_API_KEY"] = original_key
-            else:
-                os.environ.pop("GEMINI_API_KEY", None)
+        return self._generate(campaign, business, gemini_api_key(user_settings))
 
     def generate_emails_for_drafts(
         self,
@@ -127,26 +145,52 @@ class EmailGenerationService:
         progress_callback=None
     ) -> List[Dict[str, Any]]:
         """
-        Asynchronously generate emails with progress updates.
+        Generate emails concurrently with progress updates.
+
+        Gemini calls run on a worker pool that shares the rate limiter for
+        the user's API key, so concurrent campaigns stay within its quota.
 
         Args:
             campaign: Campaign object
             user_settings: User settings
             draft_businesses: List of draft businesses
-            progress_callback: Callback for WebSocket updates
+            progress_callback: Callback(progress, message) for WebSocket
+                updates; may be a coroutine function
 
         Returns:
-            List of email dictionaries
-
-        Note:
-            This is a placeholder for async implementation.
-            Would use asyncio for concurrent generation.
+            List of email dictionaries sorted by row
         """
-        # TODO: Implement async email generation
-        # For now, use sync version
-        return self.generate_emails_for_drafts(
-            campaign=campaign,
-            user_settings=user_settings,
-            draft_businesses=draft_businesses,
-            progress_callback=progress_callback
-        )
+        loop = asyncio.get_running_loop()
+        api_key = gemini_api_key(user_settings)
+        limiter = get_gemini_limiter(api_key)
+        total = len(draft_businesses)
+        rows = {
+            id(business): business.get("row", idx + 2)  # +2 for header row
+            for idx, business in enumerate(draft_businesses)
+        }
+
+        def report(completed, total, business, error):
+            if not progress_callback:
+                return
+            progress = completed / total * 100
+            message = f"Generated {completed}/{total} emails"
+            if asyncio.iscoroutinefunction(progress_callback):
+                asyncio.run_coroutine_threadsafe(progress_callback(progress, message), loop)
+            else:
+                progress_callback(progress, message)
+
+        def run():
+            jobs = ((business, business.get("website_context", "")) for business in draft_businesses)
+            return [
+                {"row": rows[id(business)], "subject": subject, "body": body}
+                for business, subject, body in generate_emails_parallel(
+                    jobs,
+                    lambda business, _: self._generate(campaign, business, api_key, limiter),
+                    total=total,
+                    progress_callback=report
+                )
+            ]
+
+        emails = await asyncio.to_thread(run)
+
+        return sorted(emails, key=lambda email: email["row"])
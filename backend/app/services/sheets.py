@@ -9,7 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "../../../"))
 
 from tools.upload_to_sheets import upload_businesses
 from tools.get_draft_businesses import get_draft_businesses as get_draft
-from tools.update_sheet_emails import update_email
+from tools.update_sheet_emails import update_emails
 from app.models import Campaign, UserSettings
 from app.core.security import decrypt_value
 
@@ -129,19 +129,12 @@ class SheetsService:
         if not campaign.google_sheet_id:
             raise ValueError("Campaign does not have a Google Sheet ID")
 
-        original_sheet_id = os.environ.get("GOOGLE_SPREADSHEET_ID")
-        os.environ["GOOGLE_SPREADSHEET_ID"] = campaign.google_sheet_id
-
-        try:
-            # Update each email individually
-            for email in emails:
-                update_email(email['row'], email['subject'], email['body'])
-            return True
-        finally:
-            if original_sheet_id:
-                os.environ["GOOGLE_SPREADSHEET_ID"] = original_sheet_id
-            else:
-                os.environ.pop("GOOGLE_SPREADSHEET_ID", None)
+        # Write all rows through batched API calls
+        written = update_emails(
+            ((email['row'], email['subject'], email['body']) for email in emails),
+            spreadsheet_id=campaign.google_sheet_id
+        )
+        return written == len(emails)
 
     def get_all_businesses(
         self,
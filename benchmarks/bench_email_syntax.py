@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk email syntax validation
+
+Compares the per-address path (strip, lowercase, re.match with a string
+pattern and a result dict for every address, as verification used to do)
+against validate_syntax_bulk, and checks both accept the same addresses and
+find the same domains.
+
+Usage:
+    python benchmarks/bench_email_syntax.py
+    python benchmarks/bench_email_syntax.py --emails 1000000 --repeat 3
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.verify_emails import validate_syntax_bulk
+
+PATTERN = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+
+
+def make_emails(count, seed=0):
+    """Import-like addresses: mostly valid, shared domains, some junk"""
+    rng = random.Random(seed)
+    domains = ["gmail.com", "Outlook.com", "yahoo.com"] + [f"clinic{i}.example" for i in range(count // 20 + 1)]
+    junk = ["", "   ", "not-an-email", "owner@", "@example.com", "two@@example.com", "a b@example.com"]
+
+    emails = []
+    for i in range(count):
+        if rng.random() < 0.05:
+            emails.append(rng.choice(junk))
+        else:
+            emails.append(f" Contact{i}@{rng.choice(domains)} ")
+    return emails
+
+
+def per_address(emails):
+    """
+    The old path: normalize, string-pattern match and a result dict per
+    address, plus a set of domains to resolve
+    """
+    results = []
+    domains = set()
+    for email in emails:
+        email = (email or '').strip().lower()
+        result = {'email': email, 'valid': bool(re.match(PATTERN, email))}
+        if result['valid']:
+            domains.add(email.split('@')[-1])
+        results.append(result)
+    return [result['valid'] for result in results], domains
+
+
+def bulk(emails):
+    result = validate_syntax_bulk(emails)
+    return list(map(bool, result.valid)), set(result.domains)
+
+
+def best_of(repeat, func, emails):
+    """Best-of-N seconds for one call of func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(emails)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--emails', type=int, default=200000, help="Addresses to validate")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    emails = make_emails(args.emails)
+    same = "✅" if per_address(emails) == bulk(emails) else "❌"
+
+    old = best_of(args.repeat, per_address, emails)
+    new = best_of(args.repeat, bulk, emails)
+    result = validate_syntax_bulk(emails)
+
+    print(f"{len(emails)} addresses, {sum(result.valid)} valid, {len(result.domains)} distinct domains")
+    print(f"{'path':<14}{'total ms':>12}{'ns/address':>14}")
+    print("-" * 40)
+    print(f"{'per-address':<14}{old * 1e3:>12.1f}{old / len(emails) * 1e9:>14.0f}")
+    print(f"{'bulk':<14}{new * 1e3:>12.1f}{new / len(emails) * 1e9:>14.0f}")
+    print(f"\nspeedup {old / new:.1f}x  same results {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark HTML text extraction engines
+
+Compares the streaming early-exit parser against the full BeautifulSoup
+tree on a corpus of saved pages, and checks both return the same text.
+
+Usage:
+    python benchmarks/bench_html_extract.py                 # synthetic pages
+    python benchmarks/bench_html_extract.py --corpus pages/ # saved *.html files
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.html_extract import ENGINES
+
+
+def synthetic_page(paragraphs):
+    """Build a homepage-like document with nav, scripts and body text"""
+    nav = "<nav>" + "".join(f'<a href="/p{i}">Page {i}</a>' for i in range(40)) + "</nav>"
+    script = "<script>" + "var x = 1;" * 2000 + "</script>"
+    body = "".join(
+        f"<section><h2>Service {i}</h2><p>We offer friendly, professional care "
+        f"for the whole family. Call us today to book an appointment.</p></section>"
+        for i in range(paragraphs)
+    )
+    footer = "<footer>" + "Copyright " * 200 + "</footer>"
+    return f"<html><head><title>Smile Dental</title>{script}</head><body>{nav}{body}{footer}</body></html>"
+
+
+def load_corpus(corpus_dir):
+    """Load saved pages, or generate synthetic ones"""
+    if corpus_dir:
+        return {path.name: path.read_bytes() for path in sorted(Path(corpus_dir).glob("*.html"))}
+
+    return {
+        f"synthetic-{paragraphs}": synthetic_page(paragraphs).encode()
+        for paragraphs in (50, 500, 5000)
+    }
+
+
+def time_engine(extract, html, repeat):
+    """Best-of-N seconds for one extraction"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(html)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--corpus', help="Directory of saved .html pages")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per page (best is reported)")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus)
+    if not corpus:
+        print(f"❌ No .html files found in {args.corpus}")
+        return
+
+    print(f"{'page':<28}{'size':>10}{'stream ms':>12}{'soup ms':>12}{'speedup':>10}  same")
+    print("-" * 80)
+
+    for name, html in corpus.items():
+        results = {engine: ENGINES[engine](html) for engine in ('stream', 'soup')}
+        timings = {
+            engine: time_engine(ENGINES[engine], html, args.repeat) * 1000
+            for engine in ('stream', 'soup')
+        }
+        same = "✅" if results['stream'] == results['soup'] else "❌"
+        speedup = timings['soup'] / timings['stream'] if timings['stream'] else float('inf')
+        print(f"{name[:27]:<28}{len(html) // 1024:>8}KB{timings['stream']:>12.2f}"
+              f"{timings['soup']:>12.2f}{speedup:>9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark building and serializing outgoing emails
+
+Compares, per message, the old path (MIMEMultipart + MIMEText flattened by
+the bytes generator, as send_message did) with an EmailMessage built per
+message and MessageFactory.render, which reuses precomputed headers and
+encodes straight to bytes. Checks all three carry the same subject and body.
+
+Usage:
+    python benchmarks/bench_message_build.py
+    python benchmarks/bench_message_build.py --messages 20000 --repeat 3
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+from email import message_from_bytes, policy
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.message_factory import MessageFactory
+
+SENDER = "owner@gmail.com"
+
+
+def make_messages(count, seed=0):
+    """Generated-email-like (to, subject, body) tuples, a few non-ASCII"""
+    rng = random.Random(seed)
+    paragraph = (
+        "I came across your practice while looking at clinics in the area and "
+        "noticed you offer same-day appointments. "
+    )
+    messages = []
+    for i in range(count):
+        name = "Zoë" if rng.random() < 0.1 else "Sam"
+        body = f"Hi {name},\n\n" + paragraph * rng.randint(2, 5) + "\n\nBest,\nAlex"
+        messages.append((f"contact{i}@clinic{i % 500}.example", f"Quick question for clinic {i}", body))
+    return messages
+
+
+def old_path(messages):
+    """MIMEMultipart per message, serialized by the generator"""
+    out = []
+    for to_email, subject, body in messages:
+        msg = MIMEMultipart()
+        msg['From'] = SENDER
+        msg['To'] = to_email
+        msg['Subject'] = subject
+        msg.attach(MIMEText(body, 'plain'))
+        out.append(msg.as_bytes(policy=policy.SMTP))
+    return out
+
+
+def email_message(messages):
+    factory = MessageFactory(SENDER)
+    return [factory.build(*message).as_bytes() for message in messages]
+
+
+def factory_render(messages):
+    factory = MessageFactory(SENDER)
+    return [factory.render(*message) for message in messages]
+
+
+def contents(data):
+    """(subject, body) of serialized messages, line endings normalized"""
+    result = []
+    for item in data:
+        msg = message_from_bytes(item, policy=policy.default)
+        part = msg.get_payload()[0] if msg.is_multipart() else msg
+        body = part.get_content().replace('\r\n', '\n').rstrip('\n')
+        result.append((msg['Subject'], body))
+    return result
+
+
+def best_of(repeat, func, messages):
+    """Best-of-N seconds for one call of func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(messages)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--messages', type=int, default=5000, help="Messages to build")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per path (best is reported)")
+    args = parser.parse_args()
+
+    messages = make_messages(args.messages)
+    sample = messages[:200]
+    same = "✅" if contents(old_path(sample)) == contents(email_message(sample)) == contents(factory_render(sample)) else "❌"
+
+    paths = [
+        ('MIMEMultipart', old_path),
+        ('EmailMessage', email_message),
+        ('factory', factory_render),
+    ]
+    timings = [(name, best_of(args.repeat, func, messages)) for name, func in paths]
+    sizes = {name: sum(map(len, func(sample))) / len(sample) for name, func in paths}
+
+    print(f"{len(messages)} messages")
+    print(f"{'path':<16}{'total ms':>12}{'us/message':>14}{'avg bytes':>12}")
+    print("-" * 54)
+    for name, seconds in timings:
+        print(f"{name:<16}{seconds * 1e3:>12.1f}{seconds / len(messages) * 1e6:>14.1f}{sizes[name]:>12.0f}")
+
+    old = timings[0][1]
+    new = timings[-1][1]
+    print(f"\nspeedup {old / new:.1f}x  same results {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-email prompt build cost
+
+Compares rendering the full f-string prompt for every business against the
+precompiled campaign template, and checks both produce the same prompt.
+
+Usage:
+    python benchmarks/bench_prompt_build.py
+    python benchmarks/bench_prompt_build.py --businesses 5000 --repeat 7
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import AUTOMATION_REVIEW_REQUESTS
+from tools.generate_general_email import build_general_prompt
+from tools.generate_specific_email import build_specific_prompt
+from tools.prompt_templates import get_prompt_template, clear_prompt_templates
+
+
+def make_businesses(count):
+    """Business names with website text on two thirds of them"""
+    website = "Family dentistry serving the community for 20 years. " * 20
+    return [(f"Business {i}", website if i % 3 else "") for i in range(count)]
+
+
+def best_of(repeat, func):
+    """Best-of-N seconds for one call of func"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--businesses', type=int, default=1000, help="Emails per campaign")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per strategy (best is reported)")
+    args = parser.parse_args()
+
+    businesses = make_businesses(args.businesses)
+    strategies = {
+        'general': (build_general_prompt, ("Dentist",)),
+        'specific': (build_specific_prompt, ("Dentist", AUTOMATION_REVIEW_REQUESTS)),
+    }
+
+    print(f"{'strategy':<12}{'f-string µs':>14}{'template µs':>14}{'speedup':>10}  same")
+    print("-" * 58)
+
+    for name, (build, campaign) in strategies.items():
+        business_type, extra = campaign[0], campaign[1:]
+
+        def rebuild():
+            return [build(business, business_type, website, *extra) for business, website in businesses]
+
+        def precompiled():
+            # Compile once per campaign, as the generators do
+            clear_prompt_templates()
+            template = get_prompt_template(build, *campaign)
+            return [template.render(business, website) for business, website in businesses]
+
+        same = "✅" if rebuild() == precompiled() else "❌"
+        old = best_of(args.repeat, rebuild) / len(businesses) * 1e6
+        new = best_of(args.repeat, precompiled) / len(businesses) * 1e6
+        print(f"{name:<12}{old:>14.2f}{new:>14.2f}{old / new:>9.1f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
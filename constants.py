@@ -21,18 +21,80 @@ DATA_SOURCE_MANUAL = "manual"
 
 # Email Configuration
 MAX_WEBSITE_CONTEXT_LENGTH = 500  # characters
-RATE_LIMIT_DELAY = 5  # seconds between emails
-EMAIL_RETRY_ATTEMPTS = 3
-EMAIL_RETRY_DELAY = 2  # seconds
+EMAIL_RETRY_ATTEMPTS = 3  # reconnect-and-retry attempts for a send whose connection dropped
+EMAIL_RETRY_DELAY = 2  # seconds before the first retry (doubles each attempt)
+EMAIL_RETRY_MAX_DELAY = 30  # longest wait between retries
+SMTP_TIMEOUT = 30  # seconds per SMTP command
+SMTP_HEALTH_CHECK_IDLE = 60  # seconds idle before a connection is checked with NOOP
+SEND_STATUS_BATCH_SIZE = 25  # status updates per sheet write during sending
+SEND_STATUS_FLUSH_INTERVAL = 60  # seconds before status updates are flushed
+SMTP_POOL_SIZE = 3  # authenticated SMTP connections sending in parallel
+SEND_PER_MINUTE = 20  # emails sent per minute across all connections
+SEND_BURST = 3  # emails that may go out back-to-back before pacing starts
+SEND_PER_DAY = 500  # emails sent per rolling 24 hours (Gmail's consumer quota)
+SEND_JITTER = 2.0  # seconds of random delay added before each send
+
+# Send Scheduling
+SEND_WINDOW_START_HOUR = 9  # recipient's local hour scheduled sends may start
+SEND_WINDOW_END_HOUR = 17  # recipient's local hour scheduled sends stop
+SEND_WEEKDAYS_ONLY = True  # don't schedule sends on Saturdays and Sundays
+SEND_DEFAULT_TIMEZONE = None  # IANA zone for unrecognized locations (None = this machine's)
+SCHEDULER_POLL_INTERVAL = 60  # seconds between checks for due sends
+SCHEDULER_SYNC_INTERVAL = 300  # seconds between re-reading approvals from the sheet
+SCHEDULER_BATCH_SIZE = 100  # due sends taken per pass (window ends are rechecked between passes)
+
+# Website Scraping
+SCRAPE_TIMEOUT = 10  # seconds per connect/read
+SCRAPE_MAX_WORKERS = 8  # websites fetched concurrently
+SCRAPE_PER_HOST_LIMIT = 2  # open connections per host
+WEBSITE_CACHE_TTL = 7 * 24 * 3600  # seconds before cached pages are revalidated
+WEBSITE_TEXT_LENGTH = 1000  # characters of visible text kept per website
+HTML_EXTRACT_ENGINE = "stream"  # "stream" (early exit) or "soup" (full BeautifulSoup tree)
+SCRAPE_DEADLINE = 20  # seconds for a whole page download
+SCRAPE_MAX_BYTES = 2 * 1024 * 1024  # bytes of page body read at most
+SCRAPE_CHUNK_SIZE = 16 * 1024  # bytes read from the socket at a time
+
+# Email Verification
+DNS_MAX_WORKERS = 16  # domains resolved concurrently
+DNS_TIMEOUT = 5  # seconds per MX lookup
+MX_CACHE_MIN_TTL = 300  # seconds a found MX record is cached at least
+MX_CACHE_MAX_TTL = 24 * 3600  # seconds a found MX record is cached at most
+MX_NEGATIVE_TTL = 3600  # seconds a missing domain or MX record is cached
+DOMAIN_BOUNCE_LIMIT = 3  # domain-level refusals before a domain that never accepted mail is rejected
+DOMAIN_BOUNCE_TTL = 30 * 24 * 3600  # seconds after the last refusal before a domain's count restarts
+SMTP_PROBE_PORT = 25  # port mailbox probes connect to on the MX host
+SMTP_PROBE_TIMEOUT = 10  # seconds per SMTP command during a probe
+SMTP_PROBE_MAX_HOSTS = 8  # MX hosts probed concurrently (one connection each)
+SMTP_PROBE_RCPTS_PER_CONNECTION = 20  # RCPT checks before reconnecting to a host
+SMTP_PROBE_RCPT_DELAY = 0.5  # seconds between RCPT checks on one host
 
 # API Configuration
 GEMINI_MODEL = "gemini-2.5-flash"
 MAX_TOKENS = 1000
 API_TIMEOUT = 30  # seconds
+GEMINI_MAX_WORKERS = 8  # emails generated concurrently
+PIPELINE_QUEUE_SIZE = 32  # items buffered between generation pipeline stages
+GEMINI_RPM_LIMIT = 60  # requests per minute
+GEMINI_TPM_LIMIT = 250000  # tokens per minute
+GEMINI_BACKOFF_INITIAL = 5  # seconds all workers pause after a 429
+GEMINI_BACKOFF_MAX = 120  # seconds, upper bound for repeated 429s
+GEMINI_CLIENT_POOL_SIZE = 32  # API keys with a cached Gemini client
+EMAIL_CACHE_MAX_ENTRIES = 20000  # generated emails kept on disk (least recently used evicted)
+GEMINI_BATCH_MIN_BUSINESSES = 100  # offer batch mode from this many drafts
+GEMINI_BATCH_SIZE = 500  # prompts per batch job
+GEMINI_BATCH_POLL_INTERVAL = 60  # seconds between batch job status checks
+GEMINI_BATCH_TIMEOUT = 24 * 3600  # seconds before giving up on batch jobs
+GOOGLE_TOKEN_REFRESH_MARGIN = 300  # seconds before expiry to refresh OAuth tokens
 
 # Google Sheets Configuration
 SHEET_RANGE = "A2:N"  # Data range (excluding header)
 HEADER_RANGE = "A1:N1"  # Header row
+SHEET_FIRST_DATA_ROW = 2  # First row number after the header
+SHEET_COLUMN_COUNT = 14  # Columns A through N
+SNAPSHOT_MAX_AGE = 60  # seconds a cached sheet snapshot is reused
+SHEET_WRITE_BATCH_SIZE = 100  # ranges per values().batchUpdate call
+SHEET_WRITE_FLUSH_INTERVAL = 15  # seconds before buffered writes are flushed
+CHECKPOINT_FSYNC_BATCH = 20  # generation journal records written before each fsync
 
 # Column Indices (0-based)
 COL_BUSINESS_NAME = 0
@@ -66,3 +128,10 @@ AUTOMATION_INVENTORY_ALERTS = "Inventory Alerts"
 # File Paths
 CONFIG_FILENAME = "campaign_config.json"
 LOG_FILENAME = "outreach.log"
+WEBSITE_CACHE_FILENAME = "website_cache.sqlite3"
+EMAIL_CACHE_FILENAME = "email_cache.sqlite3"
+CHECKPOINT_FILENAME = "generation_checkpoint.jsonl"
+DOMAIN_STORE_FILENAME = "domain_store.sqlite3"
+SEND_QUEUE_FILENAME = "send_queue.sqlite3"
+SEND_LEDGER_FILENAME = "send_ledger.sqlite3"
+DISPOSABLE_DOMAINS_FILENAME = "disposable_domains.txt"  # in data/
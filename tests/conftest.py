@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Shared test fixtures
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.gemini_client import clear_gemini_clients
+from tools import email_cache, domain_store, send_ledger
+
+
+@pytest.fixture(autouse=True)
+def fresh_gemini_clients():
+    """Don't let a client (or mock) cached by one test leak into the next"""
+    clear_gemini_clients()
+    yield
+    clear_gemini_clients()
+
+
+@pytest.fixture(autouse=True)
+def isolated_email_cache(tmp_path, monkeypatch):
+    """Keep generated test emails out of the real .tmp/ cache"""
+    cache = email_cache.EmailCache(tmp_path / "email_cache.sqlite3")
+    monkeypatch.setattr(email_cache, '_cache', cache)
+    yield cache
+    cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_domain_store(tmp_path, monkeypatch):
+    """Keep test domains and bounces out of the real .tmp/ store"""
+    store = domain_store.DomainStore(tmp_path / "domain_store.sqlite3")
+    monkeypatch.setattr(domain_store, '_store', store)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_send_ledger(tmp_path, monkeypatch):
+    """Keep test sends out of the real .tmp/ ledger"""
+    ledger = send_ledger.SendLedger(tmp_path / "send_ledger.sqlite3")
+    monkeypatch.setattr(send_ledger, '_ledger', ledger)
+    yield ledger
+    ledger.close()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Tests for Gemini batch mode email generation
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock
+from google.genai import types
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import GEMINI_MODEL
+from tools.batch_generate import generate_emails_batch, GeminiBatchBackend, LocalBatchBackend
+from tools.email_cache import get_email_cache, prompt_key
+
+
+def build_prompt(business, website_content):
+    return f"Write to {business['name']} ({website_content})"
+
+
+def respond(prompt):
+    name = prompt.split("Write to ")[1].split(" (")[0]
+    return f"SUBJECT: Hi {name}\n\nBODY:\nHello {name}"
+
+
+def make_jobs(count):
+    return [({'name': f"Business {i}", 'row_number': i + 2}, f"site {i}") for i in range(count)]
+
+
+class TestBatchGeneration:
+    """Test the batch flow against the local backend"""
+
+    def test_results_mapped_back_to_businesses(self):
+        """Every business gets its own email across several jobs"""
+        backend = LocalBatchBackend(respond=respond, polls_until_done=2)
+
+        results = list(generate_emails_batch(make_jobs(5), build_prompt, backend=backend,
+                                             batch_size=2, poll_interval=0))
+
+        assert len(backend.jobs) == 3
+        assert len(results) == 5
+        for business, subject, body in results:
+            assert subject == f"Hi {business['name']}"
+            assert body == f"Hello {business['name']}"
+
+    def test_cached_emails_not_resubmitted(self):
+        """A second run only submits prompts that aren't cached yet"""
+        backend = LocalBatchBackend(respond=respond, polls_until_done=0)
+        list(generate_emails_batch(make_jobs(3), build_prompt, backend=backend, poll_interval=0))
+
+        results = list(generate_emails_batch(make_jobs(4), build_prompt, backend=backend, poll_interval=0))
+
+        assert len(results) == 4
+        assert len(backend.jobs) == 2
+        assert len(backend.jobs["local/batches/2"]['prompts']) == 1
+
+    def test_local_results_not_cached_for_gemini(self):
+        """Emails from the local backend never stand in for the real model's"""
+        backend = LocalBatchBackend(respond=respond, polls_until_done=0)
+        list(generate_emails_batch(make_jobs(2), build_prompt, backend=backend, poll_interval=0))
+
+        cache = get_email_cache()
+        for business, website_content in make_jobs(2):
+            prompt = build_prompt(business, website_content)
+            assert cache.get(prompt_key(prompt, GEMINI_MODEL)) is None
+            assert cache.get(prompt_key(prompt, 'local')) is not None
+
+    def test_failed_requests_reported_and_skipped(self):
+        """Per-request errors don't stop the rest of the job"""
+        def flaky(prompt):
+            if "Business 1" in prompt:
+                raise RuntimeError("safety block")
+            return respond(prompt)
+
+        progress = []
+        results = list(generate_emails_batch(
+            make_jobs(3), build_prompt, backend=LocalBatchBackend(respond=flaky), poll_interval=0,
+            progress_callback=lambda done, total, business, error: progress.append((done, total, error))
+        ))
+
+        assert [b['name'] for b, _, _ in results] == ["Business 0", "Business 2"]
+        assert [done for done, _, _ in progress] == [1, 2, 3]
+        assert isinstance(progress[1][2], RuntimeError)
+
+    def test_failed_job(self):
+        """A job that ends in a failed state yields nothing"""
+        backend = Mock()
+        backend.submit.return_value = "batches/1"
+        backend.poll.return_value = ('JOB_STATE_EXPIRED', None)
+
+        assert list(generate_emails_batch(make_jobs(2), build_prompt, backend=backend, poll_interval=0)) == []
+
+    def test_timeout(self):
+        """Jobs that never finish raise TimeoutError"""
+        backend = LocalBatchBackend(polls_until_done=10 ** 6)
+
+        with pytest.raises(TimeoutError):
+            list(generate_emails_batch(make_jobs(1), build_prompt, backend=backend,
+                                       poll_interval=0, timeout=0.05))
+
+
+class TestGeminiBatchBackend:
+    """Test request packaging and response mapping for the real API"""
+
+    def test_submit_and_poll(self):
+        """Inline requests carry their index; responses are put back in order"""
+        def response(text):
+            return types.GenerateContentResponse(candidates=[
+                types.Candidate(content=types.Content(role='model', parts=[types.Part(text=text)]))
+            ])
+
+        client = Mock()
+        client.batches.create.return_value = types.BatchJob(name="batches/abc")
+        client.batches.get.return_value = types.BatchJob(
+            name="batches/abc",
+            state=types.JobState.JOB_STATE_SUCCEEDED,
+            dest=types.BatchJobDestination(inlined_responses=[
+                types.InlinedResponse(response=response("second"), metadata={'index': '1'}),
+                types.InlinedResponse(error=types.JobError(message="blocked"), metadata={'index': '2'}),
+                types.InlinedResponse(response=response("first"), metadata={'index': '0'}),
+            ])
+        )
+        backend = GeminiBatchBackend(client=client, model="gemini-test")
+
+        assert backend.submit(["a", "b", "c"], "test") == "batches/abc"
+        kwargs = client.batches.create.call_args.kwargs
+        assert kwargs['model'] == "gemini-test"
+        assert kwargs['src'][1]['contents'][0]['parts'][0]['text'] == "b"
+
+        state, results = backend.poll("batches/abc")
+        assert state == 'JOB_STATE_SUCCEEDED'
+        assert results == {0: ("first", None), 1: ("second", None), 2: (None, "blocked")}
+
+    def test_sparse_partial_response(self):
+        """A partly succeeded job missing some responses fails only those prompts"""
+        client = Mock()
+        client.batches.get.return_value = types.BatchJob(
+            name="batches/abc",
+            state=types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+            dest=types.BatchJobDestination(inlined_responses=[
+                types.InlinedResponse(response=types.GenerateContentResponse(candidates=[
+                    types.Candidate(content=types.Content(role='model', parts=[types.Part(text=text)]))
+                ]), metadata={'index': index})
+                for index, text in (('0', "SUBJECT: A\n\nBODY:\nFirst"),
+                                    ('2', "SUBJECT: C\n\nBODY:\nThird"),
+                                    ('7', "SUBJECT: X\n\nBODY:\nStray"))
+            ])
+        )
+        client.batches.create.return_value = types.BatchJob(name="batches/abc")
+        errors = []
+
+        results = list(generate_emails_batch(
+            make_jobs(3), build_prompt, backend=GeminiBatchBackend(client=client), poll_interval=0,
+            progress_callback=lambda done, total, business, error: error and errors.append(business['name'])
+        ))
+
+        assert [subject for _, subject, _ in results] == ["A", "C"]
+        assert errors == ["Business 1"]
+
+    def test_running_job(self):
+        """Unfinished jobs return no results"""
+        client = Mock()
+        client.batches.get.return_value = types.BatchJob(state=types.JobState.JOB_STATE_RUNNING)
+
+        assert GeminiBatchBackend(client=client).poll("batches/abc") == ('JOB_STATE_RUNNING', None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Tests for the email generation checkpoint journal
+"""
+
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.checkpoint import GenerationCheckpoint, campaign_key
+
+
+BUSINESSES = [
+    {'name': 'Smile Dental', 'website': 'https://smile.example', 'row_number': 2},
+    {'name': 'Bright Teeth', 'website': '', 'row_number': 3},
+    {'name': 'Family Dentistry', 'website': 'https://family.example', 'row_number': 4},
+]
+
+
+class TestGenerationCheckpoint:
+    """Test journalling and resuming a generation run"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return tmp_path / "checkpoint.jsonl"
+
+    def interrupted_run(self, path):
+        """Row 2 generated and written, row 3 generated only, row 4 untouched"""
+        checkpoint = GenerationCheckpoint(path, fsync_batch=1)
+        checkpoint.start("key-1", BUSINESSES)
+        checkpoint.record_generated(2, "Subject 2", "Body 2")
+        checkpoint.record_written([2])
+        checkpoint.record_generated(3, "Subject 3", "Body 3")
+        checkpoint.close()
+
+    def test_resume_skips_finished_rows(self, path):
+        """Only ungenerated businesses are left and unwritten emails are re-queued"""
+        self.interrupted_run(path)
+
+        checkpoint = GenerationCheckpoint(path)
+        assert checkpoint.resume("key-1")
+        assert checkpoint.businesses == BUSINESSES
+        assert [b['row_number'] for b in checkpoint.remaining_businesses()] == [4]
+        assert checkpoint.unwritten_emails() == [(3, "Subject 3", "Body 3")]
+
+    def test_different_campaign_not_resumed(self, path):
+        """A journal from another campaign or sheet is ignored"""
+        self.interrupted_run(path)
+
+        assert not GenerationCheckpoint(path).resume("key-2")
+
+    def test_torn_last_record_ignored(self, path):
+        """A partially written record is dropped and appending continues cleanly"""
+        self.interrupted_run(path)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('{"type": "generated", "row": 4, "sub')
+
+        checkpoint = GenerationCheckpoint(path)
+        assert checkpoint.resume("key-1")
+        checkpoint.record_generated(4, "Subject 4", "Body 4")
+        checkpoint.close()
+
+        checkpoint.load()
+        assert checkpoint.remaining_businesses() == []
+        assert len(checkpoint.unwritten_emails()) == 2
+
+    def test_fsync_batching(self, path):
+        """Records reach the file every fsync_batch appends"""
+        checkpoint = GenerationCheckpoint(path, fsync_batch=2)
+        checkpoint.start("key-1", BUSINESSES)
+        checkpoint.record_generated(2, "A", "A")
+        assert len(path.read_text().splitlines()) == 1
+
+        checkpoint.record_generated(3, "B", "B")
+        assert len(path.read_text().splitlines()) == 3
+        checkpoint.close()
+
+    def test_finished_run_not_resumed_and_complete_deletes(self, path):
+        """Nothing to resume once every row is written; complete() removes the journal"""
+        checkpoint = GenerationCheckpoint(path, fsync_batch=1)
+        checkpoint.start("key-1", BUSINESSES[:1])
+        checkpoint.record_generated(2, "A", "A")
+        checkpoint.record_written([2])
+        checkpoint.close()
+
+        assert not GenerationCheckpoint(path).resume("key-1")
+        checkpoint.complete()
+        assert not path.exists()
+
+    def test_campaign_key(self):
+        """The key changes with the campaign config and the sheet"""
+        config = {'business_type': 'dentist', 'outreach_type': 'general_help'}
+
+        assert campaign_key(config, 'sheet-1') == campaign_key(dict(reversed(config.items())), 'sheet-1')
+        assert campaign_key(config, 'sheet-1') != campaign_key(config, 'sheet-2')
+        assert campaign_key(config, 'sheet-1') != campaign_key({**config, 'business_type': 'gym'}, 'sheet-1')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -6,6 +6,7 @@ Tests for email generation tools
 import pytest
 import sys
 import os
+import itertools
 from unittest.mock import Mock, patch
 
 # Add parent directory to path
@@ -13,6 +14,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from tools.generate_general_email import generate_general_email, parse_email_response
 from tools.generate_specific_email import generate_specific_email
+from tools.gemini_client import GeminiClientPool, get_gemini_client
+from tools.email_cache import EmailCache, prompt_key
+from tools.generate_general_email import build_general_prompt
+from tools.generate_specific_email import build_specific_prompt, get_automation_details
+from tools.prompt_templates import get_prompt_template
 
 
 class TestEmailParsing:
@@ -54,7 +60,7 @@ Hi there, this is the body"""
 class TestGeneralEmailGeneration:
     """Test general help email generation"""
 
-    @patch('tools.generate_general_email.genai.Client')
+    @patch('tools.gemini_client.genai.Client')
     def test_generate_with_website_context(self, mock_client):
         """Test email generation with website context"""
         # Mock API response
@@ -83,7 +89,7 @@ Best regards"""
         assert len(subject) > 0
         assert len(body) > 0
 
-    @patch('tools.generate_general_email.genai.Client')
+    @patch('tools.gemini_client.genai.Client')
     def test_generate_without_website(self, mock_client):
         """Test email generation without website context"""
         mock_response = Mock()
@@ -108,7 +114,7 @@ Hello!"""
 class TestSpecificEmailGeneration:
     """Test specific automation email generation"""
 
-    @patch('tools.generate_specific_email.genai.Client')
+    @patch('tools.gemini_client.genai.Client')
     def test_generate_with_automation_focus(self, mock_client):
         """Test email generation with specific automation"""
         mock_response = Mock()
@@ -138,6 +144,143 @@ Interested in learning more?"""
         assert any(word in combined for word in ['reduce', 'appointment', 'reminder', 'no-show'])
 
 
+class TestGeminiClientPool:
+    """Test Gemini client reuse"""
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_client_reused_per_key(self, mock_client):
+        """One client per API key, shared across calls"""
+        mock_client.side_effect = lambda api_key: Mock(api_key=api_key)
+
+        first = get_gemini_client("key-a")
+        assert get_gemini_client("key-a") is first
+        assert get_gemini_client("key-b") is not first
+        assert mock_client.call_count == 2
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_generation_uses_explicit_key(self, mock_client):
+        """Passing api_key avoids the environment and reuses the client"""
+        mock_client.return_value.models.generate_content.return_value = Mock(
+            text="SUBJECT: Hi\n\nBODY:\nHello"
+        )
+
+        with patch.dict(os.environ, {}, clear=True):
+            for _ in range(3):
+                generate_general_email("Test", "Dentist", api_key="user-key")
+
+        mock_client.assert_called_once_with(api_key="user-key")
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_least_recently_used_evicted(self, mock_client):
+        """The pool keeps at most max_size clients"""
+        pool = GeminiClientPool(max_size=2)
+        pool.get("a")
+        pool.get("b")
+        pool.get("a")
+        pool.get("c")
+
+        assert len(pool) == 2
+        pool.get("a")
+        assert mock_client.call_count == 3
+
+
+class TestEmailCache:
+    """Test the generated email cache"""
+
+    REPLY = "SUBJECT: Hello\n\nBODY:\nHi there"
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_identical_prompt_reused(self, mock_client, isolated_email_cache):
+        """The second identical request doesn't call Gemini"""
+        mock_client.return_value.models.generate_content.return_value = Mock(text=self.REPLY)
+
+        first = generate_general_email("Smile Dental", "Dentist", "Family dentistry", api_key="k")
+        second = generate_general_email("Smile Dental", "Dentist", "Family dentistry", api_key="k")
+
+        assert first == second == ("Hello", "Hi there")
+        assert mock_client.return_value.models.generate_content.call_count == 1
+        assert isolated_email_cache.stats()['hits'] == 1
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_opt_out_and_changed_input(self, mock_client):
+        """use_cache=False and any prompt change regenerate"""
+        generate_content = mock_client.return_value.models.generate_content
+        generate_content.return_value = Mock(text=self.REPLY)
+
+        generate_specific_email("Smile Dental", "Dentist", automation_focus="Review Request Automation", api_key="k")
+        generate_specific_email("Smile Dental", "Dentist", automation_focus="Review Request Automation", api_key="k",
+                                use_cache=False)
+        generate_specific_email("Smile Dental", "Dentist", automation_focus="Lead Follow-up System", api_key="k")
+
+        assert generate_content.call_count == 3
+
+    @patch('tools.gemini_client.genai.Client')
+    def test_fallback_not_cached(self, mock_client, isolated_email_cache):
+        """Fallback emails after an API failure are not stored"""
+        mock_client.return_value.models.generate_content.side_effect = Exception("API Error")
+
+        with patch('tools.generate_general_email.call_gemini_api.retry.sleep'):
+            generate_general_email("Test Business", "Dentist", api_key="k")
+
+        assert isolated_email_cache.stats()['entries'] == 0
+
+    def test_key_includes_model(self):
+        """Switching models never reuses an entry"""
+        assert prompt_key("prompt", "model-a") != prompt_key("prompt", "model-b")
+        assert prompt_key("prompt", "model-a") == prompt_key("prompt", "model-a")
+
+    def test_least_recently_used_evicted(self, tmp_path):
+        """The cache keeps the most recently used entries"""
+        # Every store and hit gets a later timestamp, however coarse the clock
+        ticks = itertools.count(1)
+        cache = EmailCache(tmp_path / "emails.sqlite3", max_entries=2, clock=lambda: next(ticks))
+        cache.store("a", "A", "a")
+        cache.store("b", "B", "b")
+        cache.get("a")
+        cache.store("c", "C", "c")
+
+        assert cache.get("a") == ("A", "a")
+        assert cache.get("b") is None
+        assert cache.stats()['entries'] == 2
+        cache.close()
+
+
+class TestPromptTemplates:
+    """Test precompiled prompts"""
+
+    BUSINESSES = [
+        ("Smile Dental", ""),
+        ("Joe's {Pizza} & Grill", "Family owned since 1990. {Open} late!"),
+        ("Long Site Co", "x" * 2000),
+    ]
+
+    @pytest.mark.parametrize("name,website", BUSINESSES)
+    def test_general_matches_builder(self, name, website):
+        """Compiled prompts are identical to the builder's output"""
+        template = get_prompt_template(build_general_prompt, "Dentist")
+        assert template.render(name, website) == build_general_prompt(name, "Dentist", website)
+
+    @pytest.mark.parametrize("name,website", BUSINESSES)
+    @pytest.mark.parametrize("focus", [None, "Review Request Automation", "Custom Chatbot"])
+    def test_specific_matches_builder(self, name, website, focus):
+        """Compiled prompts are identical for every automation focus"""
+        template = get_prompt_template(build_specific_prompt, "Restaurant", focus)
+        assert template.render(name, website) == build_specific_prompt(name, "Restaurant", website, focus)
+
+    def test_compiled_once_per_campaign(self):
+        """The same campaign reuses the compiled template"""
+        first = get_prompt_template(build_specific_prompt, "Dentist", "Review Request Automation")
+        assert get_prompt_template(build_specific_prompt, "Dentist", "Review Request Automation") is first
+        assert get_prompt_template(build_specific_prompt, "Dentist", "Lead Follow-up System") is not first
+
+    def test_automation_details(self):
+        """Only the chosen automation is formatted"""
+        details = get_automation_details("Review Request Automation", "Dentist")
+        assert "Dentists struggle to get consistent 5-star reviews" in details
+        assert "Dentist went from 12 reviews to 80+" in details
+        assert get_automation_details("Chatbot", "Dentist") == "Focus on Chatbot benefits for Dentists"
+
+
 class TestErrorHandling:
     """Test error handling in email generation"""
 
@@ -147,7 +290,7 @@ class TestErrorHandling:
             with pytest.raises(ValueError, match="GEMINI_API_KEY"):
                 generate_general_email("Test", "Dentist")
 
-    @patch('tools.generate_general_email.genai.Client')
+    @patch('tools.gemini_client.genai.Client')
     def test_api_error_fallback(self, mock_client):
         """Test fallback email on API error"""
         # Mock API to raise error
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming generation pipeline
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.pipeline import generate_emails_pipeline
+
+
+def make_businesses(count):
+    return [
+        {'name': f"Business {i}", 'website': f"https://b{i}.example" if i % 2 else "", 'row_number': i + 2}
+        for i in range(count)
+    ]
+
+
+def fetch(business):
+    return f"site of {business['name']}"
+
+
+def generate(business, website_content):
+    return f"Hi {business['name']}", website_content
+
+
+class TestGenerationPipeline:
+    """Test the staged reader -> fetch -> generate pipeline"""
+
+    def test_every_business_generated(self):
+        """Each business comes out once, with its own website text"""
+        results = list(generate_emails_pipeline(make_businesses(25), generate, fetch=fetch,
+                                                fetch_workers=3, generate_workers=4, queue_size=2))
+
+        assert sorted(b['row_number'] for b, _, _ in results) == list(range(2, 27))
+        for business, subject, body in results:
+            assert subject == f"Hi {business['name']}"
+            assert body == (fetch(business) if business['website'] else "")
+
+    def test_failures_reported_and_skipped(self):
+        """A failed generation is passed to progress_callback and not yielded"""
+        def flaky(business, website_content):
+            if business['row_number'] == 3:
+                raise RuntimeError("quota")
+            return generate(business, website_content)
+
+        progress = []
+        results = list(generate_emails_pipeline(
+            make_businesses(4), flaky, fetch=fetch, total=4,
+            progress_callback=lambda done, total, business, error: progress.append((done, total, error))
+        ))
+
+        assert len(results) == 3
+        assert [done for done, _, _ in progress] == [1, 2, 3, 4]
+        assert sum(1 for _, _, error in progress if isinstance(error, RuntimeError)) == 1
+
+    def test_backpressure_bounds_reading(self):
+        """A stalled consumer stops the reader once the queues are full"""
+        read = []
+
+        def businesses():
+            for business in make_businesses(1000):
+                read.append(business)
+                yield business
+
+        pipeline = generate_emails_pipeline(businesses(), generate, fetch=fetch,
+                                            fetch_workers=2, generate_workers=2, queue_size=3)
+        next(pipeline)
+        time.sleep(0.3)
+        try:
+            # 3 queues plus one item held by each worker and the reader
+            assert len(read) <= 3 * 3 + 2 + 2 + 1 + 1
+        finally:
+            pipeline.close()
+
+    def test_early_stop_shuts_down_workers(self):
+        """Closing the generator stops every stage thread"""
+        before = threading.active_count()
+        pipeline = generate_emails_pipeline(make_businesses(500), generate, fetch=fetch,
+                                            fetch_workers=3, generate_workers=3, queue_size=2)
+        next(pipeline)
+        pipeline.close()
+
+        deadline = time.monotonic() + 2
+        while threading.active_count() > before and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert threading.active_count() <= before
+
+    def test_reader_error_raised(self):
+        """An error reading businesses surfaces on the calling thread"""
+        def businesses():
+            yield make_businesses(1)[0]
+            raise ConnectionError("sheet unavailable")
+
+        with pytest.raises(ConnectionError):
+            list(generate_emails_pipeline(businesses(), generate, fetch=fetch))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Tests for Gemini rate limiting and parallel email generation
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.rate_limiter import (
+    TokenBucket, GeminiRateLimiter, rate_limited, is_rate_limit_error, retry_after_seconds
+)
+from tools.parallel_generate import generate_emails_parallel
+from tools.generate_general_email import call_gemini_api
+
+
+class TestTokenBucket:
+    """Test the token bucket"""
+
+    def test_burst_then_wait(self):
+        """A full bucket serves a burst, then callers wait for refill"""
+        bucket = TokenBucket(per_minute=600, capacity=2)  # 10 per second
+
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == 0
+        assert bucket.acquire() == pytest.approx(0.1, abs=0.05)
+
+    def test_oversized_request_does_not_block_forever(self):
+        """Requests above capacity wait for a full bucket"""
+        bucket = TokenBucket(per_minute=6000, capacity=10)
+        assert bucket.acquire(1000) == 0
+
+    def test_adjust_returns_tokens(self):
+        """Over-estimates are refunded"""
+        bucket = TokenBucket(per_minute=60, capacity=10)
+        bucket.acquire(10)
+        bucket.adjust(-5)
+        assert bucket.acquire(5) == 0
+
+
+class TestGeminiRateLimiter:
+    """Test 429 handling"""
+
+    def test_rate_limit_pauses_and_slows_down(self):
+        """A 429 pauses workers and halves the request rate"""
+        limiter = GeminiRateLimiter(rpm=60, tpm=100000, backoff_initial=0.2, backoff_max=1)
+
+        with pytest.raises(Exception):
+            with rate_limited(limiter, "prompt"):
+                raise Exception("429 RESOURCE_EXHAUSTED")
+
+        assert limiter.rate_limited == 1
+        assert limiter.current_rpm == 30
+
+        start = time.monotonic()
+        limiter.acquire(10)
+        assert time.monotonic() - start >= 0.15
+
+    def test_success_recovers_rate(self):
+        """Successful calls raise the rate back toward the limit"""
+        limiter = GeminiRateLimiter(rpm=60, tpm=100000, backoff_initial=0, backoff_max=0)
+        limiter.on_rate_limited()
+
+        for _ in range(20):
+            limiter.on_success()
+
+        assert limiter.current_rpm == 60
+
+    def test_error_detection(self):
+        """429s are recognised by code or message"""
+        error = Exception("quota exceeded")
+        error.code = 429
+        assert is_rate_limit_error(error)
+        assert is_rate_limit_error(Exception("429 Too Many Requests"))
+        assert not is_rate_limit_error(Exception("500 Internal error"))
+        assert retry_after_seconds(Exception("Please retry in 17.5s.")) == 17.5
+
+    def test_call_records_usage(self):
+        """call_gemini_api reconciles the token estimate"""
+        limiter = GeminiRateLimiter(rpm=60, tpm=100000)
+        response = Mock()
+        response.usage_metadata.total_token_count = 50
+        client = Mock()
+        client.models.generate_content.return_value = response
+
+        assert call_gemini_api(client, "x" * 400, limiter) is response
+        assert limiter.tokens._tokens == pytest.approx(100000 - 50, abs=10)
+
+
+class TestParallelGeneration:
+    """Test the parallel email generator"""
+
+    def test_runs_concurrently(self):
+        """Slow calls overlap instead of running one at a time"""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def generate(business, website_content):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+            return f"Subject {business['name']}", website_content
+
+        jobs = [({'name': str(i)}, f"site {i}") for i in range(16)]
+        start = time.monotonic()
+        results = list(generate_emails_parallel(jobs, generate, max_workers=8))
+
+        assert time.monotonic() - start < 0.5
+        assert 1 < max(peak) <= 8
+        assert sorted(b['name'] for b, _, _ in results) == sorted(str(i) for i in range(16))
+        assert all(subject == f"Subject {b['name']}" for b, subject, _ in results)
+
+    def test_progress_and_failures(self):
+        """Every business gets a progress callback; failures are skipped"""
+        def generate(business, website_content):
+            if business['name'] == 'bad':
+                raise ValueError("boom")
+            return "s", "b"
+
+        progress = []
+        jobs = [({'name': 'good'}, ""), ({'name': 'bad'}, "")]
+        results = list(generate_emails_parallel(
+            jobs, generate, max_workers=2, total=2,
+            progress_callback=lambda done, total, business, error: progress.append((business['name'], error))
+        ))
+
+        assert [b['name'] for b, _, _ in results] == ['good']
+        assert len(progress) == 2
+        assert isinstance(dict(progress)['bad'], ValueError)
+        assert dict(progress)['good'] is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+Tests for website scraping
+"""
+
+import pytest
+import sys
+import os
+import time
+import threading
+import io
+import importlib
+import requests
+import urllib3
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import Mock, MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.scrape_website import prefetch_websites, scrape_website
+from tools.website_cache import WebsiteCache, normalize_url
+from tools.html_extract import extract_text, detect_encoding
+
+# tools re-exports the scrape_website function under the module's name
+scraper = importlib.import_module('tools.scrape_website')
+
+
+class TestPrefetchWebsites:
+    """Test concurrent website prefetching"""
+
+    def test_results_yielded_as_completed(self):
+        """Fast sites are not held back by slow ones"""
+        delays = {'slow.com': 0.3, 'fast.com': 0.0}
+
+        def fake_scrape(url, session=None):
+            time.sleep(delays[url])
+            return f"content of {url}"
+
+        businesses = [
+            {'name': 'Slow', 'website': 'slow.com'},
+            {'name': 'Fast', 'website': 'fast.com'},
+            {'name': 'No Site', 'website': ''},
+        ]
+
+        with patch.object(scraper, 'scrape_website', side_effect=fake_scrape):
+            results = list(prefetch_websites(businesses, max_workers=2))
+
+        assert [b['name'] for b, _ in results] == ['No Site', 'Fast', 'Slow']
+        assert results[0][1] == ""
+        assert results[1][1] == "content of fast.com"
+
+    def test_every_business_yielded_once(self):
+        """Each business appears exactly once"""
+        businesses = [{'name': str(i), 'website': f'site{i}.com'} for i in range(20)]
+
+        with patch.object(scraper, 'scrape_website', return_value="text"):
+            results = list(prefetch_websites(businesses, max_workers=4))
+
+        assert sorted(b['name'] for b, _ in results) == sorted(b['name'] for b in businesses)
+
+
+class TrickleHandler(BaseHTTPRequestHandler):
+    """Serves a page one byte every 50 ms, as a stalling server would"""
+
+    def do_GET(self):
+        body = b"<p>" + b"x" * 200 + b"</p>"
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            for i in range(len(body)):
+                self.wfile.write(body[i:i + 1])
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def trickle_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), TrickleHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def make_response(status_code=200, content=b"", headers=None, chunks=None):
+    """Minimal stand-in for a streamed requests.Response"""
+    response = MagicMock()
+    response.__enter__.return_value = response
+    response.status_code = status_code
+    response.headers = headers or {}
+
+    def iter_content(chunk_size=1):
+        if chunks is not None:
+            yield from chunks
+            return
+        for i in range(0, len(content), chunk_size):
+            yield content[i:i + chunk_size]
+
+    response.iter_content.side_effect = iter_content
+    return response
+
+
+class TestWebsiteCache:
+    """Test the persistent website cache"""
+
+    PAGE = b"<html><body><p>Family dentistry for 20 years</p></body></html>"
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        cache = WebsiteCache(tmp_path / "cache.sqlite3", ttl=3600)
+        yield cache
+        cache.close()
+
+    def test_normalize_url(self):
+        """Equivalent spellings share one key"""
+        assert normalize_url("Example.com/") == "https://example.com"
+        assert normalize_url("HTTPS://EXAMPLE.COM:443/#top") == "https://example.com"
+        assert normalize_url("http://example.com:8080/about") == "http://example.com:8080/about"
+
+    def test_fresh_entry_served_without_request(self, cache):
+        """Second scrape is answered from the cache"""
+        session = Mock()
+        session.get.return_value = make_response(content=self.PAGE, headers={'ETag': '"v1"'})
+
+        first = scrape_website("example.com", session=session, cache=cache)
+        second = scrape_website("https://example.com/", session=session, cache=cache)
+
+        assert first == second == "Family dentistry for 20 years"
+        assert session.get.call_count == 1
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_stale_entry_revalidated(self, cache):
+        """Stale entries send validators and reuse text on 304"""
+        cache.store("https://example.com", "cached text", etag='"v1"',
+                    last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+        cache.ttl = 0
+
+        session = Mock()
+        session.get.return_value = make_response(status_code=304)
+
+        assert scrape_website("example.com", session=session, cache=cache) == "cached text"
+        headers = session.get.call_args.kwargs['headers']
+        assert headers['If-None-Match'] == '"v1"'
+        assert headers['If-Modified-Since'] == "Mon, 01 Jan 2024 00:00:00 GMT"
+        assert cache.stats()['revalidated'] == 1
+
+    def test_changed_page_replaces_entry(self, cache):
+        """A 200 on revalidation stores the new text"""
+        cache.store("https://example.com", "old text", etag='"v1"')
+        cache.ttl = 0
+
+        session = Mock()
+        session.get.return_value = make_response(content=self.PAGE, headers={'ETag': '"v2"'})
+
+        assert scrape_website("example.com", session=session, cache=cache) == "Family dentistry for 20 years"
+        cache.ttl = 3600
+        assert cache.get("https://example.com").etag == '"v2"'
+
+    def test_failed_revalidation_serves_stale(self, cache):
+        """A site that is down keeps its last known text"""
+        cache.store("https://example.com", "cached text")
+        cache.ttl = 0
+
+        session = Mock()
+        session.get.side_effect = requests.ConnectionError("down")
+
+        assert scrape_website("example.com", session=session, cache=cache) == "cached text"
+
+    def test_truncated_page_not_cached(self, cache):
+        """Text cut short by the deadline isn't kept for the whole TTL"""
+        def slow():
+            yield b"<p>Family dentistry</p>"
+            time.sleep(0.2)
+            yield b"<p>for 20 years</p>"
+
+        session = Mock()
+        session.get.return_value = make_response(chunks=slow())
+
+        with patch.object(scraper, 'SCRAPE_DEADLINE', 0.1):
+            assert scrape_website("example.com", session=session, cache=cache).startswith("Family dentistry")
+        assert cache.get("https://example.com") is None
+
+    def test_cache_opt_out(self, cache):
+        """use_cache=False always fetches"""
+        session = Mock()
+        session.get.return_value = make_response(content=self.PAGE)
+
+        scrape_website("example.com", session=session, cache=cache, use_cache=False)
+        scrape_website("example.com", session=session, cache=cache, use_cache=False)
+
+        assert session.get.call_count == 2
+        assert cache.stats()['entries'] == 0
+
+
+class TestBoundedFetch:
+    """Test the size- and time-bounded streamed fetch"""
+
+    def scrape(self, response):
+        session = Mock()
+        session.get.return_value = response
+        return scrape_website("example.com", session=session, use_cache=False)
+
+    def test_streams_and_closes(self):
+        """Body is requested as a stream and the connection released"""
+        response = make_response(content=b"<p>Hello</p>")
+        session = Mock()
+        session.get.return_value = response
+
+        assert scrape_website("example.com", session=session, use_cache=False) == "Hello"
+        assert session.get.call_args.kwargs['stream'] is True
+        response.__exit__.assert_called_once()
+
+    def test_non_html_skipped_before_body(self):
+        """PDFs, images etc. are rejected on the Content-Type alone"""
+        response = make_response(content=b"%PDF-1.4", headers={'Content-Type': 'application/pdf'})
+
+        assert self.scrape(response) == ""
+        response.iter_content.assert_not_called()
+
+    def test_byte_cap(self):
+        """Reading stops after the byte limit"""
+        def endless():
+            yield b"<p>"
+            while True:
+                yield b" " * 1024
+
+        response = make_response(chunks=endless())
+        html = "".join(scraper.iter_html(response, max_bytes=64 * 1024))
+
+        assert len(html) == 64 * 1024
+
+    def test_deadline(self):
+        """Reading stops once the deadline has passed"""
+        def slow():
+            while True:
+                time.sleep(0.01)
+                yield b"<p>x</p>"
+
+        response = make_response(chunks=slow())
+        start = time.monotonic()
+        list(scraper.iter_html(response, deadline=time.monotonic() + 0.1))
+
+        assert time.monotonic() - start < 1
+
+    def test_deadline_bounds_trickling_server(self, trickle_server):
+        """A server sending a byte at a time can't stretch the fetch past the deadline"""
+        start = time.monotonic()
+        with patch.object(scraper, 'SCRAPE_DEADLINE', 0.5):
+            text = scrape_website(trickle_server, use_cache=False)
+
+        assert time.monotonic() - start < 1.5
+        assert text.startswith("x")
+
+    def test_reads_without_read1(self, monkeypatch):
+        """urllib3 1.x responses, which lack read1(), are read with read()"""
+        for cls in urllib3.response.HTTPResponse.__mro__:
+            if 'read1' in vars(cls):
+                monkeypatch.delattr(cls, 'read1')
+        body = b"<p>" + b"x" * (3 * 16 * 1024) + b"</p>"
+        response = make_response(headers={'Content-Type': 'text/html'})
+        response.raw = urllib3.response.HTTPResponse(body=io.BytesIO(body), preload_content=False)
+
+        html = "".join(scraper.iter_html(response, deadline=time.monotonic() + 5))
+
+        assert html == body.decode()
+        response.iter_content.assert_not_called()
+
+    def test_timeout_covers_headers(self):
+        """Connect and header reads are capped too"""
+        response = make_response(content=b"<p>Hello</p>")
+        session = Mock()
+        session.get.return_value = response
+
+        with patch.object(scraper, 'SCRAPE_DEADLINE', 3):
+            scrape_website("example.com", session=session, use_cache=False)
+
+        connect, read = session.get.call_args.kwargs['timeout']
+        assert read <= 3
+
+    def test_incremental_decode(self):
+        """Multi-byte characters split across chunks are decoded intact"""
+        body = "<p>Café Olé</p>".encode('utf-8')
+        split = body.index("é".encode('utf-8')) + 1
+        response = make_response(
+            chunks=[body[:split], body[split:]],
+            headers={'Content-Type': 'text/html; charset=utf-8'}
+        )
+
+        assert self.scrape(response) == "Café Olé"
+
+
+class TestHtmlExtract:
+    """Test the streaming HTML text extractor"""
+
+    PAGES = [
+        "<html><head><title>Smile Dental</title><style>p {color: red}</style></head>"
+        "<body><nav><a href='/'>Home</a></nav><p>Family   dentistry</p>"
+        "<p>Open &amp; friendly\n\n  since 1990</p><footer>Copyright</footer></body></html>",
+        "<p>Unclosed <b>tags <i>everywhere<p>and more<script>var x = '<p>no</p>';</script>",
+        "<div>" + "Teeth whitening and implants. " * 200 + "</div>",
+        "",
+    ]
+
+    @pytest.mark.parametrize("html", PAGES)
+    @pytest.mark.parametrize("max_chars", [10, 50, 1000])
+    def test_stream_matches_soup(self, html, max_chars):
+        """Both engines return the same text"""
+        assert extract_text(html, max_chars, engine='stream') == extract_text(html, max_chars, engine='soup')
+
+    def test_skips_hidden_content(self):
+        """Script, style, nav and footer text is dropped"""
+        assert extract_text(self.PAGES[0]) == "Smile DentalFamily dentistryOpen & friendly since 1990"
+
+    def test_stops_early(self):
+        """Parsing stops once enough text is collected"""
+        chunks = iter(["<p>" + "word " * 50 + "</p>", "<p>never read</p>"])
+
+        assert len(extract_text(chunks, max_chars=20)) == 20
+        assert next(chunks) == "<p>never read</p>"
+
+    def test_detect_encoding(self):
+        """Charset comes from the header, then the document"""
+        assert detect_encoding("text/html; charset=ISO-8859-1") == 'iso8859-1'
+        assert detect_encoding(None, b'<meta charset="windows-1252">') == 'cp1252'
+        assert detect_encoding("text/html", b'<html>') == 'utf-8'
+
+    def test_decodes_bytes(self):
+        """Bytes input is decoded with the given encoding"""
+        html = "<p>Café Olé</p>".encode('cp1252')
+        assert extract_text(html, encoding='cp1252') == "Café Olé"
+
+    def test_unknown_engine(self):
+        """Unknown engines are rejected"""
+        with pytest.raises(ValueError):
+            extract_text("<p>x</p>", engine='regex')
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Tests for building outgoing messages and SMTP connection recovery when
+sending (smtplib.SMTP mocked)
+"""
+
+import pytest
+import sys
+import os
+import smtplib
+from email import message_from_bytes, policy
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.send_emails import SMTPConnectionManager, SendInDoubt, is_connection_error
+from tools.message_factory import MessageFactory
+
+
+@pytest.fixture
+def smtp_servers():
+    """Each smtplib.SMTP() call returns the next mock server"""
+    servers = []
+
+    def connect(*args, **kwargs):
+        server = Mock()
+        server.noop.return_value = (250, b'OK')
+        server.mail.return_value = (250, b'OK')
+        server.rcpt.return_value = (250, b'OK')
+        server.docmd.return_value = (354, b'Go ahead')
+        server.getreply.return_value = (250, b'OK')
+        servers.append(server)
+        return server
+
+    with patch('tools.send_emails.smtplib.SMTP', side_effect=connect), \
+            patch('tools.send_emails.time.sleep') as sleep:
+        yield servers, sleep
+
+
+def manager(**options):
+    options.setdefault('retry_delay', 1)
+    return SMTPConnectionManager('me@gmail.com', 'secret', **options)
+
+
+def parse(data):
+    return message_from_bytes(data, policy=policy.default)
+
+
+class TestMessageFactory:
+    """Test pre-rendered plain-text messages"""
+
+    def test_ascii_message(self):
+        """Plain ASCII goes out as 7bit text with CRLF line endings"""
+        data = MessageFactory('me@gmail.com').render('a@clinic.example', 'Quick question', "Hi,\n\nThanks")
+        msg = parse(data)
+
+        assert msg['From'] == 'me@gmail.com'
+        assert msg['To'] == 'a@clinic.example'
+        assert msg['Subject'] == 'Quick question'
+        assert msg['Message-ID'].endswith('@gmail.com>')
+        assert not msg.is_multipart()
+        assert msg['Content-Transfer-Encoding'] == '7bit'
+        assert msg.get_content() == "Hi,\r\n\r\nThanks\r\n"
+        assert b'\n' not in data.replace(b'\r\n', b'')
+
+    def test_unicode_message(self):
+        """Non-ASCII subjects and bodies are encoded and round-trip"""
+        subject = "Café für Sie — " + "a long subject " * 6
+        data = MessageFactory('me@gmail.com').render('a@clinic.example', subject, "Grüße\nBob")
+        msg = parse(data)
+
+        data.decode('ascii')
+        assert msg['Subject'] == subject.strip()
+        assert msg['Content-Transfer-Encoding'] == 'quoted-printable'
+        assert msg.get_content() == "Grüße\r\nBob\r\n"
+
+    def test_newlines_in_headers_flattened(self):
+        """A generated subject can't inject headers"""
+        msg = parse(MessageFactory('me@gmail.com').render('a@clinic.example', "Hi\nBcc: x@evil.example", "Body"))
+
+        assert msg['Bcc'] is None
+        assert msg['Subject'] == 'Hi Bcc: x@evil.example'
+
+    def test_matches_email_message(self):
+        """render() and build() describe the same message"""
+        factory = MessageFactory('me@gmail.com')
+        fast = parse(factory.render('a@clinic.example', 'Hello', "Line one\nLine two"))
+        slow = factory.build('a@clinic.example', 'Hello', "Line one\nLine two")
+
+        for header in ('From', 'To', 'Subject'):
+            assert fast[header] == slow[header]
+        assert fast.get_content().replace('\r\n', '\n') == slow.get_content()
+
+
+class TestConnectionErrors:
+    """Test which send failures count as a lost connection"""
+
+    def test_classification(self):
+        assert is_connection_error(smtplib.SMTPServerDisconnected("gone"))
+        assert is_connection_error(ConnectionResetError())
+        assert is_connection_error(smtplib.SMTPDataError(421, b'Service closing'))
+        assert not is_connection_error(smtplib.SMTPDataError(554, b'Rejected'))
+        assert not is_connection_error(smtplib.SMTPRecipientsRefused({}))
+
+
+class TestReconnect:
+    """Test SMTPConnectionManager reconnecting and retrying"""
+
+    def test_disconnect_retries_on_new_connection(self, smtp_servers):
+        """The in-flight message is resent after re-authenticating"""
+        servers, sleep = smtp_servers
+        with manager() as smtp:
+            servers[0].mail.side_effect = smtplib.SMTPServerDisconnected("idle")
+            assert smtp.send_email('a@clinic.example', 'Hi', 'Body') is True
+
+        assert len(servers) == 2
+        servers[1].login.assert_called_once_with('me@gmail.com', 'secret')
+        servers[1].rcpt.assert_called_once_with('a@clinic.example')
+        servers[1].send.assert_called_once()
+        assert smtp.reconnects == 1
+        sleep.assert_called_once_with(1)
+
+    def test_idle_connection_checked_with_noop(self, smtp_servers):
+        """A connection idle past the threshold that fails NOOP is replaced"""
+        servers, _ = smtp_servers
+        with manager(health_check_idle=0) as smtp:
+            servers[0].noop.side_effect = smtplib.SMTPServerDisconnected("idle")
+            assert smtp.send_email('a@clinic.example', 'Hi', 'Body') is True
+
+        servers[0].mail.assert_not_called()
+        servers[1].send.assert_called_once()
+
+    def test_recent_connection_skips_noop(self, smtp_servers):
+        servers, _ = smtp_servers
+        with manager(health_check_idle=60) as smtp:
+            smtp.send_email('a@clinic.example', 'Hi', 'Body')
+
+        servers[0].noop.assert_not_called()
+
+    def test_gives_up_with_exponential_backoff(self, smtp_servers):
+        """After retry_attempts the send raises ConnectionError"""
+        servers, sleep = smtp_servers
+        with manager(retry_attempts=3, max_retry_delay=3) as smtp:
+            for server in servers:
+                server.mail.side_effect = smtplib.SMTPServerDisconnected("down")
+            # New connections drop too
+            with patch.object(SMTPConnectionManager, 'connect', side_effect=ConnectionError("refused")):
+                with pytest.raises(ConnectionError):
+                    smtp.send_email('a@clinic.example', 'Hi', 'Body')
+
+        assert [call.args[0] for call in sleep.call_args_list] == [1, 2, 3]
+
+    def test_message_errors_not_retried(self, smtp_servers):
+        """A refused recipient is a message failure, not a connection failure"""
+        servers, sleep = smtp_servers
+        with manager() as smtp:
+            servers[0].rcpt.return_value = (550, b'5.1.1 No such user')
+            assert smtp.send_email('gone@clinic.example', 'Hi', 'Body') is False
+
+        assert len(servers) == 1
+        servers[0].rset.assert_called_once()
+        servers[0].send.assert_not_called()
+        sleep.assert_not_called()
+
+    def test_disconnect_before_end_of_data_retries(self, smtp_servers):
+        """A message cut off mid-transfer was never accepted, so it is resent"""
+        servers, _ = smtp_servers
+        with manager() as smtp:
+            servers[0].send.side_effect = smtplib.SMTPServerDisconnected("reset")
+            assert smtp.send_email('a@clinic.example', 'Hi', 'Body') is True
+
+        assert servers[1].send.call_args == servers[0].send.call_args
+
+    def test_disconnect_after_message_in_doubt(self, smtp_servers):
+        """Losing the reply to a complete message raises SendInDoubt without resending"""
+        servers, sleep = smtp_servers
+        with manager() as smtp:
+            servers[0].getreply.side_effect = smtplib.SMTPServerDisconnected("gone")
+            with pytest.raises(SendInDoubt):
+                smtp.send_email('a@clinic.example', 'Hi', 'Body')
+
+        assert len(servers) == 1
+        servers[0].send.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_message_dot_stuffed(self, smtp_servers):
+        """Body lines starting with '.' are escaped and the message is terminated"""
+        servers, _ = smtp_servers
+        with manager() as smtp:
+            smtp.send_email('a@clinic.example', 'Hi', 'Line\n.hidden')
+
+        data = servers[0].send.call_args.args[0]
+        assert b'\r\n..hidden\r\n' in data
+        assert data.endswith(b'\r\n.\r\n')
+
+    def test_auth_failure_on_reconnect_raises(self, smtp_servers):
+        servers, _ = smtp_servers
+        with manager() as smtp:
+            servers[0].mail.side_effect = smtplib.SMTPServerDisconnected("idle")
+            with patch.object(SMTPConnectionManager, 'connect',
+                              side_effect=ValueError("Authentication failed")):
+                with pytest.raises(ValueError):
+                    smtp.send_email('a@clinic.example', 'Hi', 'Body')
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for the pooled SMTP send engine and its rate governor
+"""
+
+import pytest
+import sys
+import os
+import time
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.send_engine import SendEngine, SendGovernor, DailyLimitReached
+from tools.send_emails import recent_send_times
+from tools.sheet_snapshot import SheetSnapshot
+
+
+class FakeConnection:
+    """Stands in for SMTPConnectionManager"""
+
+    opened = []
+
+    def __init__(self, fail_for=()):
+        self.fail_for = set(fail_for)
+        self.sent = []
+
+    def __enter__(self):
+        FakeConnection.opened.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def send_email(self, to_email, subject, body):
+        time.sleep(0.01)
+        self.sent.append(to_email)
+        return to_email not in self.fail_for
+
+
+def make_businesses(count):
+    return [
+        {'name': f"Business {i}", 'email': f"owner{i}@smile.example",
+         'subject': 'Hi', 'body': 'Hello', 'row_number': i + 2}
+        for i in range(count)
+    ]
+
+
+def unlimited(**overrides):
+    options = dict(per_minute=60000, per_day=10000, burst=1000, jitter=0)
+    options.update(overrides)
+    return SendGovernor(**options)
+
+
+@pytest.fixture(autouse=True)
+def reset_connections():
+    FakeConnection.opened = []
+
+
+class TestSendGovernor:
+    """Test per-minute pacing and the daily cap"""
+
+    def test_daily_cap(self):
+        """Sends beyond per_day in 24 hours are refused"""
+        governor = unlimited(per_day=2)
+        governor.acquire()
+        governor.acquire()
+
+        with pytest.raises(DailyLimitReached):
+            governor.acquire()
+
+    def test_earlier_sends_count(self):
+        """Sends from the last day count; older ones don't"""
+        now = time.time()
+        governor = unlimited(per_day=3, sent_times=[now - 60, now - 3600, now - 2 * 24 * 3600])
+
+        assert governor.sent_today() == 2
+        governor.acquire()
+        with pytest.raises(DailyLimitReached):
+            governor.acquire()
+
+    def test_per_minute_pacing(self):
+        """After the burst, sends are spaced by the per-minute rate"""
+        governor = unlimited(per_minute=600, burst=2)
+
+        start = time.monotonic()
+        for _ in range(4):
+            governor.acquire()
+
+        # Two from the burst, then two more at 10 per second
+        assert time.monotonic() - start >= 0.15
+
+
+class TestSendEngine:
+    """Test sending over a connection pool"""
+
+    def test_all_sent_over_pool(self):
+        """Every business is sent once, spread across the connections"""
+        engine = SendEngine(FakeConnection, connections=3, governor=unlimited())
+
+        results = list(engine.run(make_businesses(12)))
+
+        assert len(results) == 12 and all(success for _, success in results)
+        assert len(FakeConnection.opened) == 3
+        assert sorted(e for c in FakeConnection.opened for e in c.sent) == \
+            sorted(b['email'] for b in make_businesses(12))
+        assert sum(1 for c in FakeConnection.opened if c.sent) > 1
+
+    def test_failures_reported(self):
+        """A refused send is yielded as a failure and the rest continue"""
+        engine = SendEngine(lambda: FakeConnection(fail_for={'owner1@smile.example'}),
+                            connections=2, governor=unlimited())
+
+        results = {b['row_number']: success for b, success in engine.run(make_businesses(3))}
+
+        assert results == {2: True, 3: False, 4: True}
+
+    def test_daily_limit_skips_rest(self):
+        """Once the day's quota is used, remaining businesses are skipped, not failed"""
+        engine = SendEngine(FakeConnection, connections=2, governor=unlimited(per_day=3))
+
+        results = list(engine.run(make_businesses(8)))
+
+        assert len(results) == 3
+        assert len(engine.skipped) == 5
+
+    def test_connection_error_before_sending(self):
+        """Authentication failures surface before any email goes out"""
+        class BadLogin(FakeConnection):
+            def __enter__(self):
+                raise ValueError("Authentication failed")
+
+        engine = SendEngine(BadLogin, governor=unlimited())
+
+        with pytest.raises(ValueError):
+            list(engine.run(make_businesses(2)))
+
+    def test_worker_error_raised(self):
+        """An unexpected error on a connection thread is raised on the caller"""
+        class Broken(FakeConnection):
+            def send_email(self, to_email, subject, body):
+                raise RuntimeError("socket closed")
+
+        engine = SendEngine(Broken, connections=1, governor=unlimited())
+
+        with pytest.raises(RuntimeError):
+            list(engine.run(make_businesses(2)))
+
+
+class TestRecentSendTimes:
+    """Test reading earlier sends from the sheet"""
+
+    def test_parses_date_sent_column(self):
+        """Valid Date Sent values are returned; blanks and junk are skipped"""
+        sent = datetime(2026, 5, 1, 9, 30, 0)
+        rows = [
+            ['A'] + [''] * 10 + [sent.strftime("%Y-%m-%d %H:%M:%S")],
+            ['B'] + [''] * 10 + ['yesterday'],
+            ['C'],
+        ]
+
+        assert recent_send_times(SheetSnapshot(rows)) == [sent.timestamp()]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
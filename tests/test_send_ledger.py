@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Tests for the write-ahead send ledger and crash recovery when sending
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.send_ledger import SendLedger, SENT, SENDING
+from tools.send_engine import SendEngine, SendGovernor, SendInDoubt
+from tools.send_emails import reconcile_send_ledger
+from tools.sheet_snapshot import SheetSnapshot
+
+
+def business(row_number, subject="Quick question"):
+    return {
+        'row_number': row_number,
+        'name': f"Clinic {row_number}",
+        'email': f"Owner@clinic{row_number}.example",
+        'subject': subject,
+        'body': "Hi",
+    }
+
+
+def snapshot(*rows):
+    """Sheet with one data row per (business, status), starting at row 2"""
+    return SheetSnapshot([
+        [item['name'], '', item['email'], '', '', '', item['subject'], item['body'], '', status]
+        for item, status in rows
+    ])
+
+
+def unlimited():
+    return SendGovernor(per_minute=10000, per_day=10000, burst=10000, jitter=0)
+
+
+class FakeConnection:
+    """Stands in for SMTPConnectionManager"""
+
+    def __init__(self, sent, error=None):
+        self.sent = sent
+        self.error = error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def send_email(self, to_email, subject, body):
+        if self.error:
+            raise self.error
+        self.sent.append(to_email)
+        return True
+
+
+@pytest.fixture
+def ledger(tmp_path):
+    ledger = SendLedger(tmp_path / "send_ledger.sqlite3")
+    yield ledger
+    ledger.close()
+
+
+class TestSendLedger:
+    """Test claiming and recording sends"""
+
+    def test_claim_once(self, ledger):
+        """A message can only be claimed once; the second claim sees its state"""
+        assert ledger.begin(business(2)) is None
+        assert ledger.begin(business(2)) == SENDING
+
+        ledger.finish(business(2), sent=True)
+        assert ledger.begin(business(2)) == SENT
+
+    def test_failed_send_releases_claim(self, ledger):
+        ledger.begin(business(2))
+        ledger.finish(business(2), sent=False)
+
+        assert ledger.begin(business(2)) is None
+
+    def test_edited_message_is_a_new_send(self, ledger):
+        ledger.begin(business(2))
+
+        assert ledger.begin(business(2, subject="Edited")) is None
+
+    def test_survives_reopen(self, ledger, tmp_path):
+        ledger.begin(business(2))
+        ledger.finish(business(2), sent=True)
+
+        reopened = SendLedger(tmp_path / "send_ledger.sqlite3")
+        assert reopened.begin(business(2)) == SENT
+        reopened.close()
+
+    def test_reconcile(self, ledger):
+        """Sends the sheet already shows are settled; the rest are returned"""
+        for row in (2, 3):
+            ledger.begin(business(row))
+            ledger.finish(business(row), sent=True)
+
+        outstanding = ledger.reconcile(snapshot((business(2), 'Sent'), (business(3), 'Approved')))
+
+        assert [entry.row_number for entry in outstanding] == [3]
+        assert ledger.stats()['unrecorded'] == 1
+
+        ledger.mark_recorded([3])
+        assert ledger.unrecorded() == []
+
+
+class TestEngineWithLedger:
+    """Test SendEngine consulting the ledger"""
+
+    def test_duplicates_not_sent(self, ledger):
+        ledger.begin(business(2))
+        ledger.finish(business(2), sent=True)
+        sent = []
+        engine = SendEngine(lambda: FakeConnection(sent), connections=1, governor=unlimited(), ledger=ledger)
+
+        results = list(engine.run([business(2), business(3)]))
+
+        assert sent == [business(3)['email']]
+        assert [item['row_number'] for item, _ in results] == [3]
+        assert [item['row_number'] for item in engine.duplicates] == [2]
+        assert ledger.begin(business(3)) == SENT
+
+    def test_duplicates_use_no_send_slot(self, ledger):
+        """The ledger is checked before the governor, so duplicates don't count"""
+        ledger.begin(business(2))
+        ledger.finish(business(2), sent=True)
+        sent = []
+        governor = SendGovernor(per_minute=10000, per_day=1, burst=10000, jitter=0)
+        engine = SendEngine(lambda: FakeConnection(sent), connections=1, governor=governor, ledger=ledger)
+
+        list(engine.run([business(2), business(3)]))
+
+        assert sent == [business(3)['email']]
+        assert engine.skipped == []
+
+    def test_daily_limit_releases_claim(self, ledger):
+        """A business claimed but stopped by the daily limit can go out later"""
+        sent = []
+        governor = SendGovernor(per_minute=10000, per_day=1, burst=10000, jitter=0)
+        engine = SendEngine(lambda: FakeConnection(sent), connections=1, governor=governor, ledger=ledger)
+
+        list(engine.run([business(2), business(3)]))
+
+        assert [item['row_number'] for item in engine.skipped] == [3]
+        assert ledger.in_doubt() == []
+        assert ledger.begin(business(3)) is None
+
+    def test_connection_error_releases_claim(self, ledger):
+        engine = SendEngine(
+            lambda: FakeConnection([], error=ConnectionError("down")),
+            connections=1, governor=unlimited(), ledger=ledger
+        )
+
+        with pytest.raises(ConnectionError):
+            list(engine.run([business(2)]))
+        assert ledger.begin(business(2)) is None
+
+    def test_send_in_doubt_keeps_claim(self, ledger):
+        """A message that may have been delivered is neither released nor resent"""
+        engine = SendEngine(
+            lambda: FakeConnection([], error=SendInDoubt("reply lost")),
+            connections=1, governor=unlimited(), ledger=ledger
+        )
+
+        with pytest.raises(SendInDoubt):
+            list(engine.run([business(2)]))
+        assert [entry.row_number for entry in ledger.in_doubt()] == [2]
+        assert ledger.begin(business(2)) == SENDING
+
+
+class TestCrashRecovery:
+    """Test a run that stops between sending and writing the sheet"""
+
+    def test_restart_records_instead_of_resending(self, ledger):
+        sent = []
+        engine = SendEngine(lambda: FakeConnection(sent), connections=1, governor=unlimited(), ledger=ledger)
+        list(engine.run([business(2)]))
+        # ... the process dies here, before the status batch is written
+
+        sheet = snapshot((business(2), 'Approved'), (business(3), 'Approved'))
+        with patch('tools.send_emails.BatchSheetWriter', MagicMock()), \
+                patch('tools.send_emails.update_sent_status') as update:
+            unsent = reconcile_send_ledger(ledger, sheet, [business(2), business(3)])
+
+        assert [item['row_number'] for item in unsent] == [3]
+        assert update.call_args.args == (2,)
+        assert update.call_args.kwargs['success'] is True
+
+    def test_interrupted_send_held_back(self, ledger):
+        """A claim with no outcome may have been delivered, so it isn't retried"""
+        ledger.begin(business(2))
+
+        unsent = reconcile_send_ledger(ledger, snapshot((business(2), 'Approved')), [business(2)])
+
+        assert unsent == []
+        assert reconcile_send_ledger(ledger, snapshot(), [business(2, subject="Edited")]) != []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Tests for timezone delivery windows, the send queue and the send scheduler
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.timezones import timezone_for_location, delivery_window
+from tools.send_queue import SendQueue
+from tools.send_scheduler import run_scheduler
+from tools.send_engine import SendGovernor
+from tools.sheet_snapshot import SheetSnapshot
+
+# Monday 19 October 2026, 15:00 UTC: 10:00 in Austin, 16:00 in London,
+# 02:00 Tuesday in Sydney
+MONDAY = datetime(2026, 10, 19, 15, 0, tzinfo=timezone.utc).timestamp()
+
+
+def business(row_number, location):
+    return {
+        'row_number': row_number,
+        'name': f"Clinic {row_number}",
+        'location': location,
+        'email': f"owner@clinic{row_number}.example",
+        'subject': "Quick question",
+        'body': "Hi",
+    }
+
+
+def sheet_row(item, status='Approved'):
+    return [item['name'], item['location'], item['email'], '', '', '',
+            item['subject'], item['body'], '', status]
+
+
+@pytest.fixture
+def send_queue(tmp_path):
+    queue = SendQueue(tmp_path / "send_queue.sqlite3")
+    yield queue
+    queue.close()
+
+
+class TestTimezones:
+    """Test locating businesses and their delivery windows"""
+
+    @pytest.mark.parametrize("location, expected", [
+        ("123 Main St, Austin, TX 78701", "America/Chicago"),
+        ("San Francisco, California", "America/Los_Angeles"),
+        ("Toronto, ON M5V 2T6", "America/Toronto"),
+        ("Denver, CO 80202, United States", "America/Denver"),
+        ("London, UK", "Europe/London"),
+        ("London SW1A 1AA, UK", "Europe/London"),
+        ("Somewhere", ""),
+        # Six-letter place names aren't mistaken for postcodes
+        ("Newark, New Jersey", "America/New_York"),
+        ("Santa Fe, New Mexico 87501", "America/Denver"),
+        ("Providence, Rhode Island", "America/New_York"),
+        ("Sioux Falls, South Dakota", "America/Chicago"),
+        ("Halifax, Nova Scotia", "America/Halifax"),
+        ("Las Vegas, Nevada", "America/Los_Angeles"),
+        # Country codes that are also state codes
+        ("Munich, DE, Germany", "Europe/Berlin"),
+        ("Mumbai, IN, India", "Asia/Kolkata"),
+        ("Dover, DE", "America/New_York"),
+        ("DE", ""),
+    ])
+    def test_timezone_for_location(self, location, expected):
+        assert timezone_for_location(location, default=None) == expected
+
+    def test_open_window_starts_now(self):
+        start, end = delivery_window("America/Chicago", MONDAY)
+
+        assert start == MONDAY
+        assert datetime.fromtimestamp(end, ZoneInfo("America/Chicago")).hour == 17
+
+    def test_weekend_moves_to_monday(self):
+        saturday = datetime(2026, 10, 17, 12, 0, tzinfo=ZoneInfo("Europe/London")).timestamp()
+        start, _ = delivery_window("Europe/London", saturday)
+
+        opens = datetime.fromtimestamp(start, ZoneInfo("Europe/London"))
+        assert (opens.weekday(), opens.hour) == (0, 9)
+
+
+class TestSendQueue:
+    """Test the durable send queue"""
+
+    def test_only_open_windows_are_due(self, send_queue):
+        send_queue.enqueue([business(2, "Austin, TX"), business(3, "Sydney NSW 2000, Australia")], now=MONDAY)
+
+        assert [item.row_number for item in send_queue.due(MONDAY)] == [2]
+        assert send_queue.stats()['queued'] == 2
+
+    def test_enqueue_is_idempotent(self, send_queue):
+        """Re-syncing keeps the schedule but picks up edited text"""
+        assert send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY) == 1
+        edited = dict(business(2, "Austin, TX"), subject="Edited")
+
+        assert send_queue.enqueue([edited], now=MONDAY + 3600) == 0
+        item, = send_queue.due(MONDAY + 3600)
+        assert (item.subject, item.not_before) == ("Edited", MONDAY)
+
+    def test_sent_rows_are_not_requeued(self, send_queue):
+        send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY)
+        send_queue.mark_sent(2)
+
+        assert send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY) == 0
+        assert send_queue.due(MONDAY) == []
+
+    def test_failed_row_requeued_after_edit(self, send_queue):
+        """A failed send goes out again once its address is corrected"""
+        send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY)
+        send_queue.mark_failed(2, "Send failed")
+        fixed = dict(business(2, "Austin, TX"), email="owner@clinic2.example.com")
+
+        assert send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY) == 0
+        assert send_queue.enqueue([fixed], now=MONDAY + 3600) == 1
+        item, = send_queue.due(MONDAY + 3600)
+        assert (item.email, item.not_before) == (fixed['email'], MONDAY + 3600)
+        assert send_queue.stats()['failed'] == 0
+
+    def test_reapproved_row_requeued(self, send_queue):
+        """A sent row approved again after leaving the approved list is rescheduled"""
+        send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY)
+        send_queue.mark_sent(2)
+
+        assert send_queue.retain([]) == 0
+        assert send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY) == 1
+        assert [item.row_number for item in send_queue.due(MONDAY)] == [2]
+
+    def test_missed_window_rescheduled(self, send_queue):
+        send_queue.enqueue([business(2, "Austin, TX")], now=MONDAY)
+        evening = MONDAY + 8 * 3600
+
+        assert send_queue.reschedule_missed(evening) == 1
+        item, = send_queue.pending()
+        opens = datetime.fromtimestamp(item.not_before, ZoneInfo("America/Chicago"))
+        assert (opens.weekday(), opens.hour) == (1, 9)
+
+    def test_retain_drops_unapproved(self, send_queue):
+        send_queue.enqueue([business(2, "Austin, TX"), business(3, "Austin, TX")], now=MONDAY)
+
+        assert send_queue.retain([3]) == 1
+        assert [item.row_number for item in send_queue.pending()] == [3]
+
+
+class FakeConnection:
+    """Stands in for SMTPConnectionManager"""
+
+    def __init__(self, sent):
+        self.sent = sent
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def send_email(self, to_email, subject, body):
+        self.sent.append(to_email)
+        return True
+
+
+class TestScheduler:
+    """Test a scheduler pass against a stand-in sheet and SMTP server"""
+
+    def run_once(self, send_queue, rows, sent):
+        governor = SendGovernor(per_minute=10000, burst=10000, jitter=0)
+        with patch('tools.send_scheduler.get_sheet_snapshot', return_value=SheetSnapshot(rows)), \
+                patch('tools.send_scheduler.BatchSheetWriter', MagicMock()), \
+                patch('tools.send_scheduler.update_sent_status') as update:
+            count = run_scheduler(
+                send_queue=send_queue, connect=lambda: FakeConnection(sent), governor=governor,
+                once=True, clock=lambda: MONDAY
+            )
+        return count, update
+
+    def test_sends_only_due_rows(self, send_queue):
+        """Approved rows are queued and those in business hours are sent"""
+        austin, sydney = business(2, "Austin, TX"), business(3, "Sydney NSW 2000, Australia")
+        sent = []
+
+        count, update = self.run_once(send_queue, [sheet_row(austin), sheet_row(sydney)], sent)
+
+        assert count == 1
+        assert sent == [austin['email']]
+        assert update.call_args.args == (2,)
+        assert send_queue.stats() == {'queued': 1, 'sent': 1, 'failed': 0}
+
+    def test_unapproved_rows_not_sent(self, send_queue):
+        """A row approved when queued but changed in the sheet is dropped"""
+        austin = business(2, "Austin, TX")
+        send_queue.enqueue([austin], now=MONDAY)
+        sent = []
+
+        count, _ = self.run_once(send_queue, [sheet_row(austin, status='Draft')], sent)
+
+        assert (count, sent) == (0, [])
+        assert send_queue.stats()['queued'] == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
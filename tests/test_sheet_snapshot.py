@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared sheet snapshot
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock, patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools import sheet_snapshot
+from tools.sheet_snapshot import SheetSnapshot, get_sheet_snapshot, invalidate_sheet_snapshot
+
+
+SAMPLE_ROWS = [
+    ['Smile Dental', 'SF', 'hi@smile.com', '', 'smile.com', '', '', '', '', 'Draft'],
+    ['Joe Pizza', 'NY', 'joe@pizza.com', '', '', '', 'Subj', 'Body', '', 'Approved'],
+    ['Short Row'],
+    ['Fix-It', 'LA', 'fix@it.com', '', '', '', 'S', 'B', '', 'Sent', '', '2024-01-01'],
+    ['Bright Smiles', 'SF', '', '', '', '', '', '', '', 'draft'],
+]
+
+
+def make_service(rows):
+    """Mock Sheets service returning the given rows"""
+    service = Mock()
+    service.spreadsheets().values().get().execute.return_value = {'values': rows}
+    return service
+
+
+class TestSheetSnapshot:
+    """Test snapshot indexing"""
+
+    def test_rows_padded_to_full_width(self):
+        """Short rows are padded with empty strings"""
+        snapshot = SheetSnapshot(SAMPLE_ROWS)
+        assert len(snapshot.columns) == 14
+        assert all(len(column) == len(SAMPLE_ROWS) for column in snapshot.columns)
+        assert snapshot.value(2, 9) == ''
+
+    def test_status_index_is_case_insensitive(self):
+        """Draft lookups match any casing"""
+        snapshot = SheetSnapshot(SAMPLE_ROWS)
+        assert snapshot.offsets('Draft') == [0, 4]
+        assert snapshot.count('DRAFT') == 2
+        assert snapshot.count('Replied') == 0
+
+    def test_businesses_include_row_numbers(self):
+        """Business dicts use 1-indexed sheet rows"""
+        snapshot = SheetSnapshot(SAMPLE_ROWS)
+        drafts = snapshot.businesses('Draft')
+        assert [b['row_number'] for b in drafts] == [2, 6]
+        assert drafts[0]['name'] == 'Smile Dental'
+        assert drafts[0]['website'] == 'smile.com'
+
+    def test_businesses_with_custom_fields(self):
+        """Callers can pick the columns they need"""
+        snapshot = SheetSnapshot(SAMPLE_ROWS)
+        sent = snapshot.businesses('Sent', {'email': 2, 'date_sent': 11})
+        assert sent == [{'row_number': 5, 'email': 'fix@it.com', 'date_sent': '2024-01-01'}]
+
+    def test_empty_sheet(self):
+        """An empty sheet still has all columns"""
+        snapshot = SheetSnapshot([])
+        assert snapshot.row_count == 0
+        assert len(snapshot.columns) == 14
+        assert snapshot.businesses('Draft') == []
+
+
+class TestSnapshotCache:
+    """Test shared snapshot reuse"""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        invalidate_sheet_snapshot()
+        yield
+        invalidate_sheet_snapshot()
+
+    def test_snapshot_downloaded_once(self):
+        """Repeated lookups reuse one download"""
+        service = make_service(SAMPLE_ROWS)
+        with patch.object(sheet_snapshot, 'get_sheets_service', return_value=service) as factory:
+            first = get_sheet_snapshot('sheet-1')
+            second = get_sheet_snapshot('sheet-1')
+
+        assert first is second
+        assert factory.call_count == 1
+
+    def test_invalidate_forces_refetch(self):
+        """Invalidation drops the cached snapshot"""
+        service = make_service(SAMPLE_ROWS)
+        with patch.object(sheet_snapshot, 'get_sheets_service', return_value=service) as factory:
+            first = get_sheet_snapshot('sheet-1')
+            invalidate_sheet_snapshot('sheet-1')
+            second = get_sheet_snapshot('sheet-1')
+
+        assert first is not second
+        assert factory.call_count == 2
+
+    def test_missing_spreadsheet_id(self):
+        """Missing sheet ID raises ValueError"""
+        with patch.dict(os.environ, {'GOOGLE_SPREADSHEET_ID': ''}):
+            with pytest.raises(ValueError, match="GOOGLE_SPREADSHEET_ID"):
+                get_sheet_snapshot()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the buffered sheet writer
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import Mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tools.sheet_writer import BatchSheetWriter
+from tools.send_emails import update_sent_status
+
+
+def batch_calls(service):
+    """Extract the data payload of every batchUpdate call"""
+    return [
+        call.kwargs['body']['data']
+        for call in service.spreadsheets().values().batchUpdate.call_args_list
+    ]
+
+
+class TestBatchSheetWriter:
+    """Test batching behaviour"""
+
+    @pytest.fixture
+    def service(self):
+        return Mock()
+
+    def test_flushes_on_exit(self, service):
+        """Pending rows are written when the block ends"""
+        with BatchSheetWriter('sheet-1', service=service, batch_size=10) as writer:
+            writer.add_email(2, 'Subject A', 'Body A')
+            writer.add_email(3, 'Subject B', 'Body B')
+            assert batch_calls(service) == []
+
+        calls = batch_calls(service)
+        assert len(calls) == 1
+        assert calls[0] == [
+            {'range': 'G2:H2', 'values': [['Subject A', 'Body A']]},
+            {'range': 'G3:H3', 'values': [['Subject B', 'Body B']]},
+        ]
+        assert writer.written_count == 2
+
+    def test_flushes_when_batch_full(self, service):
+        """A full batch is written immediately"""
+        writer = BatchSheetWriter('sheet-1', service=service, batch_size=2)
+        writer.add_email(2, 'A', 'A')
+        writer.add_email(3, 'B', 'B')
+        writer.add_email(4, 'C', 'C')
+
+        assert [len(data) for data in batch_calls(service)] == [2]
+        assert writer.pending_count == 1
+
+    def test_flushes_when_interval_elapsed(self, service):
+        """Old pending rows are written on the next add"""
+        writer = BatchSheetWriter('sheet-1', service=service, batch_size=100, flush_interval=0)
+        writer.add_email(2, 'A', 'A')
+
+        assert len(batch_calls(service)) == 1
+
+    def test_flushes_on_interrupt(self, service):
+        """Ctrl-C inside the block still writes pending rows"""
+        with pytest.raises(KeyboardInterrupt):
+            with BatchSheetWriter('sheet-1', service=service, batch_size=10) as writer:
+                writer.add_email(2, 'A', 'A')
+                raise KeyboardInterrupt
+
+        assert len(batch_calls(service)) == 1
+
+    def test_failed_flush_keeps_rows(self, service):
+        """Rows stay queued when the API call fails"""
+        service.spreadsheets().values().batchUpdate().execute.side_effect = [
+            Exception("429 Too Many Requests"), {}
+        ]
+        writer = BatchSheetWriter('sheet-1', service=service, batch_size=10)
+        writer.add_email(2, 'A', 'A')
+
+        assert writer.flush() == 0
+        assert writer.pending_count == 1
+        assert writer.flush() == 1
+        assert writer.pending_count == 0
+
+    def test_on_flush_reports_saved_rows(self, service):
+        """on_flush gets the rows of each successful write, and only those"""
+        service.spreadsheets().values().batchUpdate().execute.side_effect = [
+            Exception("503 Service Unavailable"), {}
+        ]
+        saved = []
+        writer = BatchSheetWriter('sheet-1', service=service, batch_size=10, on_flush=saved.append)
+        writer.add_email(2, 'A', 'A')
+        writer.add_email(3, 'B', 'B')
+
+        writer.flush()
+        assert saved == []
+        writer.flush()
+        assert saved == [[2, 3]]
+
+    def test_missing_spreadsheet_id(self):
+        """Missing sheet ID raises ValueError"""
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setenv('GOOGLE_SPREADSHEET_ID', '')
+            with pytest.raises(ValueError, match="GOOGLE_SPREADSHEET_ID"):
+                BatchSheetWriter()
+
+
+class TestSentStatusJournal:
+    """Test coalesced send status write-back"""
+
+    def test_statuses_queued_until_batch_full(self):
+        """Send outcomes are written together, not per email"""
+        service = Mock()
+        writer = BatchSheetWriter('sheet-1', service=service, batch_size=3)
+
+        update_sent_status(2, success=True, writer=writer)
+        update_sent_status(3, success=False, writer=writer)
+        assert batch_calls(service) == []
+
+        update_sent_status(4, success=True, writer=writer)
+        data = batch_calls(service)[0]
+        assert [item['range'] for item in data] == ['J2:L2', 'I3', 'J4:L4']
+        assert data[0]['values'][0][0] == 'Sent'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Tests for SMTP mailbox probing against a local aiosmtpd server
+"""
+
+import pytest
+import sys
+import os
+import socket
+from unittest.mock import MagicMock, patch
+import dns.resolver
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiosmtpd")
+from aiosmtpd.controller import Controller
+
+from tools.smtp_probe import (
+    probe_mailboxes, best_mx_host, classify_reply, ProbeResult, DELIVERABLE, UNDELIVERABLE, UNKNOWN
+)
+import tools.verify_emails as verify_emails
+
+
+class MailboxHandler:
+    """Accepts RCPT TO only for known mailboxes (or everything when catch_all)"""
+
+    def __init__(self, mailboxes, catch_all=False):
+        self.mailboxes = set(mailboxes)
+        self.catch_all = catch_all
+        self.sessions = 0
+        self.rcpts = []
+
+    async def handle_MAIL(self, server, session, envelope, address, mail_options):
+        self.sessions += 1
+        envelope.mail_from = address
+        return '250 OK'
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        self.rcpts.append(address)
+        if self.catch_all or address in self.mailboxes:
+            envelope.rcpt_tos.append(address)
+            return '250 OK'
+        return '550 5.1.1 No such user'
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def smtp_server():
+    """Start a local SMTP server; yields a function taking the handler"""
+    controllers = []
+
+    def start(handler):
+        controller = Controller(handler, hostname='127.0.0.1', port=free_port())
+        controller.start()
+        controllers.append(controller)
+        return controller.port
+
+    yield start
+    for controller in controllers:
+        controller.stop()
+
+
+def probe(emails, port, **options):
+    options.setdefault('rcpt_delay', 0)
+    return probe_mailboxes(emails, mx_host=lambda domain: '127.0.0.1', port=port,
+                           mail_from='probe@outreach.example', timeout=5, **options)
+
+
+class TestMailboxProbe:
+    """Test RCPT TO probing"""
+
+    def test_existing_and_missing_mailboxes(self, smtp_server):
+        """Accepted recipients are deliverable, 550s undeliverable"""
+        port = smtp_server(MailboxHandler({'owner@smile.example'}))
+
+        results = probe(['owner@smile.example', 'gone@smile.example'], port)
+
+        assert results['owner@smile.example'].status == DELIVERABLE
+        assert results['gone@smile.example'].status == UNDELIVERABLE
+        assert results['gone@smile.example'].code == 550
+
+    def test_one_connection_per_host(self, smtp_server):
+        """Many recipients on one host share a session until the per-connection limit"""
+        handler = MailboxHandler({f"user{i}@smile.example" for i in range(5)})
+        port = smtp_server(handler)
+        emails = [f"user{i}@smile.example" for i in range(5)]
+
+        probe(emails, port, rcpts_per_connection=100)
+        assert handler.sessions == 1
+        # One canary plus one check per address
+        assert len(handler.rcpts) == 6
+
+        handler.sessions = 0
+        probe(emails, port, rcpts_per_connection=2)
+        assert handler.sessions == 3
+
+    def test_catch_all_domain_unknown(self, smtp_server):
+        """A server that accepts a made-up mailbox gives no answer about real ones"""
+        port = smtp_server(MailboxHandler(set(), catch_all=True))
+
+        results = probe(['anyone@catchall.example'], port)
+
+        assert results['anyone@catchall.example'].status == UNKNOWN
+
+    def test_unreachable_host_unknown(self):
+        """Connection failures leave addresses unknown, not invalid"""
+        results = probe(['owner@smile.example'], free_port())
+
+        assert results['owner@smile.example'].status == UNKNOWN
+
+    def test_domain_without_mail_server(self):
+        """Domains with no MX host are undeliverable without connecting"""
+        results = probe_mailboxes(['owner@gone.example'], mx_host=lambda domain: None)
+
+        assert results['owner@gone.example'].status == UNDELIVERABLE
+
+    def test_verify_businesses_moves_dead_mailboxes(self):
+        """verify_businesses marks undeliverable mailboxes invalid, keeps unknown ones"""
+        businesses = [
+            {'name': 'A', 'email': 'owner@gmail.com'},
+            {'name': 'B', 'email': 'gone@gmail.com'},
+        ]
+        probes = {
+            'owner@gmail.com': ProbeResult(UNKNOWN, 450, 'greylisted'),
+            'gone@gmail.com': ProbeResult(UNDELIVERABLE, 550, 'No such user'),
+        }
+
+        with patch.object(verify_emails, 'resolve_mx_records', return_value={'gmail.com': True}), \
+             patch.object(verify_emails, 'probe_mailboxes', return_value=probes):
+            verified = verify_emails.verify_businesses(businesses, check_dns=True, probe_smtp=True)
+
+        status = {b['name']: (b['email_verified'], b['email_status']) for b in verified}
+        assert status == {'A': (True, 'valid'), 'B': (False, 'Mailbox does not exist')}
+
+
+class TestProbeAnswers:
+    """Test telling dead mailboxes apart from lookups and probes that failed"""
+
+    def test_transient_dns_failure_unknown(self):
+        """Timeouts and SERVFAIL don't make a domain undeliverable"""
+        def mx_host(domain):
+            raise dns.resolver.NoNameservers()
+
+        results = probe_mailboxes(['owner@smile.example'], mx_host=mx_host)
+
+        assert results['owner@smile.example'].status == UNKNOWN
+
+    @pytest.mark.parametrize("mx_error, a_error, expected", [
+        (dns.resolver.NXDOMAIN(), None, None),
+        (dns.resolver.NoAnswer(), None, 'smile.example'),
+        (dns.resolver.NoAnswer(), dns.resolver.NoAnswer(), None),
+    ])
+    def test_best_mx_host_fallbacks(self, mx_error, a_error, expected):
+        def resolve(domain, record_type, lifetime=None):
+            error = mx_error if record_type == 'MX' else a_error
+            if error:
+                raise error
+            return MagicMock()
+
+        with patch('tools.smtp_probe.dns.resolver.resolve', side_effect=resolve):
+            assert best_mx_host('smile.example') == expected
+
+    def test_best_mx_host_timeout_raises(self):
+        with patch('tools.smtp_probe.dns.resolver.resolve', side_effect=dns.resolver.LifetimeTimeout()):
+            with pytest.raises(dns.exception.DNSException):
+                best_mx_host('smile.example')
+
+    @pytest.mark.parametrize("message, expected", [
+        (b"5.1.1 <gone@smile.example>: Recipient address rejected", UNDELIVERABLE),
+        (b"5.7.1 Service unavailable; client host blocked using Spamhaus", UNKNOWN),
+        (b"Rejected by policy", UNKNOWN),
+    ])
+    def test_policy_rejections_unknown(self, message, expected):
+        """Blocklisted probers learn nothing about the mailbox"""
+        assert classify_reply(550, message).status == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
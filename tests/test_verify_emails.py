@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Tests for email verification
+"""
+
+import pytest
+import sys
+import os
+from unittest.mock import patch, Mock
+import dns.resolver
+import dns.exception
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tools.verify_emails as verify_emails
+from tools.domain_store import get_domain_store
+from tools.send_emails import SMTPConnectionManager
+from tools.disposable_domains import DomainIndex, get_disposable_index, reset_disposable_index
+from tools.smtp_probe import ProbeResult, DELIVERABLE
+
+
+def fake_resolve(known):
+    """resolve() stand-in answering MX queries for the given domains"""
+    def resolve(domain, rdtype, lifetime=None):
+        if domain in known:
+            answer = Mock()
+            answer.rrset.ttl = 3600
+            return answer
+        raise dns.resolver.NXDOMAIN()
+    return Mock(side_effect=resolve)
+
+
+def sending_smtp():
+    """SMTPConnectionManager on a mock server that accepts every stage"""
+    smtp = SMTPConnectionManager('me@gmail.com', 'secret')
+    smtp.server = Mock()
+    smtp.server.mail.return_value = (250, b'OK')
+    smtp.server.rcpt.return_value = (250, b'OK')
+    smtp.server.docmd.return_value = (354, b'Go ahead')
+    smtp.server.getreply.return_value = (250, b'OK')
+    return smtp
+
+
+@pytest.fixture(autouse=True)
+def fresh_mx_cache():
+    verify_emails.get_mx_cache().clear()
+    yield
+    verify_emails.get_mx_cache().clear()
+
+
+class TestConcurrentMXVerification:
+    """Test domain deduplication, caching and result mapping"""
+
+    def test_each_domain_resolved_once(self):
+        """Shared domains are queried once and mapped back to every address"""
+        resolve = fake_resolve({'gmail.com', 'smile.example'})
+        businesses = [
+            {'name': 'A', 'email': 'a@gmail.com'},
+            {'name': 'B', 'email': 'b@Gmail.com'},
+            {'name': 'C', 'email': 'c@smile.example'},
+            {'name': 'D', 'email': 'd@gone.example'},
+            {'name': 'E', 'email': 'e@gone.example'},
+        ]
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            verified = verify_emails.verify_businesses(businesses, check_dns=True)
+
+        assert sorted(call.args[0] for call in resolve.call_args_list) == [
+            'gmail.com', 'gone.example', 'smile.example'
+        ]
+        status = {b['name']: b['email_verified'] for b in verified}
+        assert status == {'A': True, 'B': True, 'C': True, 'D': False, 'E': False}
+
+    def test_positive_and_negative_results_cached(self):
+        """A second run answers from the cache without DNS queries"""
+        resolve = fake_resolve({'gmail.com'})
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            verify_emails.resolve_mx_records(['gmail.com', 'gone.example'])
+            results = verify_emails.resolve_mx_records(['gmail.com', 'gone.example'])
+
+        assert results == {'gmail.com': True, 'gone.example': False}
+        assert resolve.call_count == 2
+
+    def test_timeouts_not_cached(self):
+        """Temporary failures are retried on the next lookup"""
+        resolve = Mock(side_effect=dns.exception.Timeout())
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            assert verify_emails.has_mx_record('slow.example') is None
+            assert verify_emails.has_mx_record('slow.example') is None
+
+        assert resolve.call_count == 2
+
+    def test_dns_failure_keeps_lead(self):
+        """SERVFAIL or unreachable nameservers leave the address unverified, not invalid"""
+        resolve = Mock(side_effect=dns.resolver.NoNameservers())
+        businesses = [{'name': 'A', 'email': 'owner@flaky.example'}]
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            result = verify_emails.verify_email('owner@flaky.example')
+            verified = verify_emails.verify_businesses(businesses, check_dns=True)
+
+        assert result['valid'] and not result['checks']['dns']
+        assert verified[0]['email_verified'] is True
+        assert verified[0]['email_status'] == 'unverified (MX lookup failed)'
+
+    def test_entries_expire(self):
+        """Cached results are dropped after their TTL"""
+        cache = verify_emails.MXCache(min_ttl=10, max_ttl=100)
+
+        with patch.object(verify_emails.time, 'monotonic', return_value=1000):
+            cache.store('gmail.com', True, 5)
+        with patch.object(verify_emails.time, 'monotonic', return_value=1009):
+            assert cache.get('gmail.com') is True
+        with patch.object(verify_emails.time, 'monotonic', return_value=1011):
+            assert cache.get('gmail.com') is None
+
+    def test_invalid_addresses_skip_dns(self):
+        """Malformed and disposable addresses never reach the resolver"""
+        resolve = fake_resolve(set())
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            results = verify_emails.verify_email_list(
+                ['not-an-email', 'x@mailinator.com'], check_dns=True, show_progress=False
+            )
+
+        assert results['invalid_count'] == 2
+        resolve.assert_not_called()
+
+
+class TestBulkSyntax:
+    """Test one-pass syntax validation of large lists"""
+
+    EMAILS = [' Owner@Smile.Example ', 'bad-email', None, '   ', 'front@smile.example',
+              'x@@y.com', 'team@gmail.com']
+
+    def test_matches_per_address_check(self):
+        """Bulk results agree with is_valid_syntax on the normalized address"""
+        result = verify_emails.validate_syntax_bulk(self.EMAILS)
+
+        assert result.emails[0] == 'owner@smile.example'
+        assert list(result.valid) == [
+            int(verify_emails.is_valid_syntax((e or '').strip().lower())) for e in self.EMAILS
+        ]
+
+    def test_domains_deduplicated(self):
+        """Each valid address points at its distinct domain; invalid ones at -1"""
+        result = verify_emails.validate_syntax_bulk(self.EMAILS)
+
+        assert result.domains == ['smile.example', 'gmail.com']
+        assert list(result.domain_ids) == [0, -1, -1, -1, 0, -1, 1]
+
+    def test_list_reasons_unchanged(self):
+        """verify_email_list still reports why each address failed"""
+        results = verify_emails.verify_email_list(['', 'bad-email', 'a@gmail.com'],
+                                                  check_dns=False, show_progress=False)
+
+        assert results['valid'] == ['a@gmail.com']
+        assert [item['reason'] for item in results['invalid']] == [
+            'Empty email address', 'Invalid email syntax'
+        ]
+
+
+class TestDomainStore:
+    """Test verification from the persistent domain store"""
+
+    def test_repeat_run_verified_from_store(self):
+        """A new session answers known domains from disk without DNS"""
+        resolve = fake_resolve({'gmail.com'})
+        emails = ['a@gmail.com', 'b@gone.example']
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            verify_emails.verify_email_list(emails, show_progress=False)
+            verify_emails.get_mx_cache().clear()
+            results = verify_emails.verify_email_list(emails, show_progress=False)
+
+        assert resolve.call_count == 2
+        assert results['valid'] == ['a@gmail.com']
+        assert get_domain_store().stats()['mx_hits'] == 2
+
+    def test_stale_entries_requeried(self):
+        """Expired MX results go back to DNS"""
+        get_domain_store().store_mx_many([('smile.example', False, -1)])
+        resolve = fake_resolve({'smile.example'})
+
+        with patch.object(verify_emails.dns.resolver, 'resolve', resolve):
+            assert verify_emails.resolve_mx_records(['smile.example']) == {'smile.example': True}
+
+        resolve.assert_called_once()
+        assert get_domain_store().get('smile.example').has_mx is True
+
+    def test_remembered_disposable_domain(self):
+        """A domain recorded as disposable is rejected without DNS"""
+        get_domain_store().mark_disposable(['burner.example'])
+
+        result = verify_emails.verify_email('x@burner.example', check_dns=False)
+
+        assert result['reason'] == 'Disposable email address'
+
+    def test_bounced_domain_rejected(self):
+        """Domains that refused every send are rejected; one delivery clears them"""
+        store = get_domain_store()
+        for _ in range(verify_emails.DOMAIN_BOUNCE_LIMIT):
+            store.record_delivery('closed.example', delivered=False)
+
+        assert verify_emails.verify_email('a@closed.example', check_dns=False)['reason'] == \
+            'Previous emails to this domain bounced'
+
+        store.record_delivery('closed.example', delivered=True)
+        assert verify_emails.verify_email('a@closed.example', check_dns=False)['valid']
+
+    def test_send_outcomes_recorded(self):
+        """A refused mailbox is remembered by address; Gmail accepting a send isn't a delivery"""
+        smtp = sending_smtp()
+        smtp.send_email('ok@smile.example', 'Hi', 'Body')
+        smtp.server.rcpt.return_value = (550, b'5.1.1 No such user')
+        smtp.send_email('gone@smile.example', 'Hi', 'Body')
+
+        store = get_domain_store()
+        assert store.has_bounced('gone@smile.example')
+        assert not store.has_bounced('ok@smile.example')
+        assert store.get('smile.example') is None
+
+    def test_refused_mailbox_spares_domain(self):
+        """Dead mailboxes at a shared host don't rule out its other addresses"""
+        smtp = sending_smtp()
+        smtp.server.rcpt.return_value = (550, b'5.1.1 The email account does not exist')
+        for _ in range(verify_emails.DOMAIN_BOUNCE_LIMIT + 1):
+            smtp.send_email('a@gmail.com', 'Hi', 'Body')
+
+        assert verify_emails.verify_email('a@gmail.com', check_dns=False)['reason'] == \
+            'Previous email to this address bounced'
+        assert verify_emails.verify_email('b@gmail.com', check_dns=False)['valid']
+
+    def test_domain_refusals_expire(self):
+        """Domain-level refusals count, but stop counting after DOMAIN_BOUNCE_TTL"""
+        smtp = sending_smtp()
+        for i in range(verify_emails.DOMAIN_BOUNCE_LIMIT):
+            smtp.server.rcpt.return_value = (550, b'5.1.2 Domain not found')
+            smtp.send_email(f'{i}@closed.example', 'Hi', 'Body')
+
+        assert not verify_emails.verify_email('new@closed.example', check_dns=False)['valid']
+        later = verify_emails.time.time() + verify_emails.DOMAIN_BOUNCE_TTL + 1
+        with patch.object(verify_emails.time, 'time', return_value=later):
+            assert verify_emails.verify_email('new@closed.example', check_dns=False)['valid']
+
+    def test_relay_acceptance_does_not_clear_bounces(self):
+        """A bouncing domain stays rejected however many sends Gmail accepts"""
+        smtp = sending_smtp()
+        for _ in range(verify_emails.DOMAIN_BOUNCE_LIMIT):
+            get_domain_store().record_delivery('closed.example', delivered=False)
+        smtp.send_email('owner@closed.example', 'Hi', 'Body')
+
+        assert not verify_emails.verify_email('a@closed.example', check_dns=False)['valid']
+
+    def test_probe_acceptance_recorded(self):
+        """A mailbox accepted by the domain's own server counts as a delivery"""
+        probes = {'owner@smile.example': ProbeResult(DELIVERABLE, 250, 'OK')}
+
+        with patch.object(verify_emails, 'resolve_mx_records', return_value={'smile.example': True}), \
+             patch.object(verify_emails, 'probe_mailboxes', return_value=probes):
+            verify_emails.verify_businesses(
+                [{'name': 'A', 'email': 'owner@smile.example'}], check_dns=True, probe_smtp=True
+            )
+
+        assert get_domain_store().get('smile.example').delivered == 1
+
+
+class TestDisposableDomains:
+    """Test the disposable domain index"""
+
+    @pytest.fixture(autouse=True)
+    def fresh_index(self):
+        reset_disposable_index()
+        yield
+        reset_disposable_index()
+
+    def test_exact_and_wildcard_entries(self):
+        """Plain entries match exactly; *. entries match any subdomain"""
+        index = DomainIndex(['# comment', '', 'Burner.example.', '*.alias.example'])
+
+        assert 'burner.example' in index
+        assert 'mx.burner.example' not in index
+        assert 'shop.alias.example' in index
+        assert 'a.b.alias.example' in index
+        assert 'alias.example' not in index
+        assert 'notalias.example' not in index
+        assert len(index) == 2
+
+    def test_bundled_list(self):
+        """The data file is loaded lazily and used by is_disposable"""
+        index = get_disposable_index()
+
+        assert len(index) > 100
+        assert verify_emails.is_disposable('someone@YOPMAIL.com')
+        assert verify_emails.is_disposable('someone@shop.33mail.com')
+        assert not verify_emails.is_disposable('owner@smiledental.example')
+
+    def test_missing_file_uses_builtin_list(self, tmp_path):
+        """Without the data file the built-in domains still apply"""
+        index = get_disposable_index(path=tmp_path / "missing.txt", extra={'tempmail.com'})
+
+        assert 'tempmail.com' in index
+        assert 'yopmail.com' not in index
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
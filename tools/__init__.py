@@ -9,10 +9,20 @@ __version__ = "1.0.0"
 # Email Generation
 from .generate_general_email import generate_general_email
 from .generate_specific_email import generate_specific_email
+from .parallel_generate import generate_emails_parallel
+from .pipeline import generate_emails_pipeline
+from .rate_limiter import GeminiRateLimiter, get_gemini_limiter
+from .gemini_client import get_gemini_client, clear_gemini_clients
+from .email_cache import EmailCache, get_email_cache
+from .batch_generate import generate_emails_batch, GeminiBatchBackend, LocalBatchBackend
+from .prompt_templates import get_prompt_template
+from .checkpoint import GenerationCheckpoint
 
 # Data Collection
 from .scrape_google_maps import scrape_google_maps
-from .scrape_website import scrape_website
+from .scrape_website import scrape_website, prefetch_websites
+from .website_cache import WebsiteCache, get_website_cache
+from .html_extract import extract_text
 from .load_json import load_businesses_from_json
 from .scrape_social_media import (
     scrape_instagram_profiles,
@@ -21,15 +31,27 @@ from .scrape_social_media import (
     scrape_multi_platform
 )
 from .enrich_contacts import enrich_business_contacts
-from .verify_emails import verify_email, verify_email_list, verify_businesses
+from .verify_emails import verify_email, verify_email_list, verify_businesses, resolve_mx_records
+from .verify_emails import validate_syntax_bulk
+from .domain_store import DomainStore, get_domain_store
+from .disposable_domains import DomainIndex, get_disposable_index
+from .smtp_probe import probe_mailboxes
 
 # Google Sheets Operations
+from .google_services import get_google_service, clear_google_services
 from .upload_to_sheets import upload_businesses
 from .get_draft_businesses import get_draft_businesses
-from .update_sheet_emails import update_email
+from .sheet_snapshot import SheetSnapshot, get_sheet_snapshot, invalidate_sheet_snapshot
+from .update_sheet_emails import update_email, update_emails
+from .sheet_writer import BatchSheetWriter
 
 # Email Operations
 from .send_emails import send_approved_emails
+from .send_engine import SendEngine, SendGovernor
+from .message_factory import MessageFactory
+from .send_queue import SendQueue
+from .send_ledger import SendLedger
+from .send_scheduler import schedule_approved_emails, run_scheduler
 
 # Response Tracking
 from .track_responses import track_email_responses
@@ -47,10 +69,27 @@ __all__ = [
     # Email Generation
     'generate_general_email',
     'generate_specific_email',
+    'generate_emails_parallel',
+    'generate_emails_pipeline',
+    'GeminiRateLimiter',
+    'get_gemini_limiter',
+    'get_gemini_client',
+    'clear_gemini_clients',
+    'EmailCache',
+    'get_email_cache',
+    'generate_emails_batch',
+    'GeminiBatchBackend',
+    'LocalBatchBackend',
+    'get_prompt_template',
+    'GenerationCheckpoint',
 
     # Data Collection
     'scrape_google_maps',
     'scrape_website',
+    'prefetch_websites',
+    'WebsiteCache',
+    'get_website_cache',
+    'extract_text',
     'load_businesses_from_json',
     'scrape_instagram_profiles',
     'scrape_facebook_pages',
@@ -60,14 +99,35 @@ __all__ = [
     'verify_email',
     'verify_email_list',
     'verify_businesses',
+    'resolve_mx_records',
+    'validate_syntax_bulk',
+    'DomainStore',
+    'get_domain_store',
+    'DomainIndex',
+    'get_disposable_index',
+    'probe_mailboxes',
 
     # Sheets Operations
+    'get_google_service',
+    'clear_google_services',
     'upload_businesses',
     'get_draft_businesses',
+    'SheetSnapshot',
+    'get_sheet_snapshot',
+    'invalidate_sheet_snapshot',
     'update_email',
+    'update_emails',
+    'BatchSheetWriter',
 
     # Email Operations
     'send_approved_emails',
+    'SendEngine',
+    'SendGovernor',
+    'MessageFactory',
+    'SendQueue',
+    'SendLedger',
+    'schedule_approved_emails',
+    'run_scheduler',
 
     # Tracking
     'track_email_responses',
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Generate emails with the Gemini Batch API
+
+For large overnight runs: every prompt is packaged into batch jobs
+(GEMINI_BATCH_SIZE prompts each), the jobs are polled until they finish, and
+the parsed emails are mapped back to their businesses. Batch jobs are
+billed at a discount but can take hours, so this is opt-in.
+
+LocalBatchBackend answers jobs in-process so the flow can be tested (or
+dry-run) without network access.
+"""
+
+import os
+import sys
+import time
+import itertools
+from dotenv import load_dotenv
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    GEMINI_MODEL, GEMINI_BATCH_SIZE, GEMINI_BATCH_POLL_INTERVAL, GEMINI_BATCH_TIMEOUT
+)
+from tools.gemini_client import get_gemini_client
+from tools.email_cache import get_email_cache, prompt_key
+from tools.generate_general_email import parse_email_response, validate_api_key
+
+load_dotenv()
+
+SUCCEEDED_STATES = ('JOB_STATE_SUCCEEDED', 'JOB_STATE_PARTIALLY_SUCCEEDED')
+FAILED_STATES = ('JOB_STATE_FAILED', 'JOB_STATE_CANCELLED', 'JOB_STATE_EXPIRED')
+
+
+class GeminiBatchBackend:
+    """Submits inline batch jobs to the Gemini API"""
+
+    def __init__(self, client=None, model=GEMINI_MODEL):
+        """
+        Initialize backend
+
+        Args:
+            client: genai.Client (default: shared client for GEMINI_API_KEY)
+            model: Model used for every request in the job
+        """
+        self.client = client or get_gemini_client(validate_api_key())
+        self.model = model
+
+    def submit(self, prompts, display_name):
+        """
+        Create a batch job
+
+        Args:
+            prompts: List of prompt strings
+            display_name: Job name shown in AI Studio
+
+        Returns:
+            str: Job name to poll
+        """
+        requests = [
+            {
+                'contents': [{'role': 'user', 'parts': [{'text': prompt}]}],
+                'metadata': {'index': str(i)},
+            }
+            for i, prompt in enumerate(prompts)
+        ]
+        job = self.client.batches.create(
+            model=self.model,
+            src=requests,
+            config={'display_name': display_name}
+        )
+        return job.name
+
+    def poll(self, name):
+        """
+        Check a batch job
+
+        Args:
+            name: Job name returned by submit()
+
+        Returns:
+            tuple: (state, results) where results is None until the job has
+                finished, then a dict of prompt index -> (text, error); a
+                partly succeeded job may leave some prompts out
+        """
+        job = self.client.batches.get(name=name)
+        state = job.state.name if job.state else 'JOB_STATE_UNSPECIFIED'
+        if state not in SUCCEEDED_STATES:
+            return state, None
+
+        responses = (job.dest.inlined_responses if job.dest else None) or []
+        results = {}
+
+        for position, item in enumerate(responses):
+            try:
+                index = int((item.metadata or {}).get('index', position))
+            except (TypeError, ValueError):
+                continue
+            if item.error:
+                results[index] = (None, item.error.message or str(item.error))
+            else:
+                results[index] = (item.response.text if item.response else None, None)
+
+        return state, results
+
+
+class LocalBatchBackend:
+    """In-process stand-in for the Batch API"""
+
+    def __init__(self, respond=None, polls_until_done=1, model='local'):
+        """
+        Initialize backend
+
+        Args:
+            respond: Callable(prompt) -> response text (default: a
+                placeholder email); exceptions become per-request errors
+            polls_until_done: Polls that report JOB_STATE_RUNNING first
+            model: Name its emails are cached under, kept apart from real
+                Gemini models
+        """
+        self.respond = respond or (lambda prompt: "SUBJECT: Batch test\n\nBODY:\nGenerated locally")
+        self.polls_until_done = polls_until_done
+        self.model = model
+        self.jobs = {}
+        self._ids = itertools.count(1)
+
+    def submit(self, prompts, display_name):
+        name = f"local/batches/{next(self._ids)}"
+        self.jobs[name] = {'prompts': list(prompts), 'polls': 0, 'display_name': display_name}
+        return name
+
+    def poll(self, name):
+        job = self.jobs[name]
+        job['polls'] += 1
+        if job['polls'] <= self.polls_until_done:
+            return 'JOB_STATE_RUNNING', None
+
+        results = {}
+        for index, prompt in enumerate(job['prompts']):
+            try:
+                results[index] = (self.respond(prompt), None)
+            except Exception as e:
+                results[index] = (None, str(e))
+        return 'JOB_STATE_SUCCEEDED', results
+
+
+def generate_emails_batch(jobs, build_prompt, backend=None, use_cache=True,
+                          batch_size=GEMINI_BATCH_SIZE, poll_interval=GEMINI_BATCH_POLL_INTERVAL,
+                          timeout=GEMINI_BATCH_TIMEOUT, progress_callback=None):
+    """
+    Generate emails for many businesses through batch jobs
+
+    Emails already in the email cache are yielded straight away; everything
+    else is submitted in jobs of batch_size prompts. Requests that fail
+    inside a job are reported and skipped, so they are retried on the next
+    run.
+
+    Args:
+        jobs: Iterable of (business, website_content) tuples
+        build_prompt: Callable(business, website_content) -> prompt text
+        backend: GeminiBatchBackend or LocalBatchBackend (default: Gemini)
+        use_cache: Reuse and store emails in the email cache
+        batch_size: Prompts per batch job
+        poll_interval: Seconds between status checks
+        timeout: Seconds to wait for all jobs before raising TimeoutError
+        progress_callback: Optional callable(completed, total, business, error)
+
+    Yields:
+        tuple: (business, subject, body)
+    """
+    cache = get_email_cache() if use_cache else None
+    pending = []
+    completed = 0
+
+    jobs = list(jobs)
+    total = len(jobs)
+
+    # Cache keys name the model that wrote the email
+    model = backend.model if backend is not None else GEMINI_MODEL
+
+    for business, website_content in jobs:
+        prompt = build_prompt(business, website_content)
+        key = prompt_key(prompt, model)
+
+        cached = cache.get(key) if use_cache else None
+        if cached:
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total, business, None)
+            yield business, cached[0], cached[1]
+        else:
+            pending.append((business, prompt, key))
+
+    if not pending:
+        return
+
+    backend = backend or GeminiBatchBackend()
+
+    # Submit every job up front so they run in parallel on Google's side
+    submitted = {}
+    for start in range(0, len(pending), batch_size):
+        chunk = pending[start:start + batch_size]
+        display_name = f"outreach-emails-{int(time.time())}-{start // batch_size + 1}"
+        name = backend.submit([prompt for _, prompt, _ in chunk], display_name)
+        submitted[name] = chunk
+        print(f"   📦 Submitted batch job {name} ({len(chunk)} emails)")
+
+    deadline = time.monotonic() + timeout
+    while submitted:
+        for name in list(submitted):
+            state, results = backend.poll(name)
+
+            if state in FAILED_STATES:
+                chunk = submitted.pop(name)
+                print(f"   ❌ Batch job {name} ended with {state}")
+                for business, _, _ in chunk:
+                    completed += 1
+                    if progress_callback:
+                        progress_callback(completed, total, business, RuntimeError(state))
+                continue
+
+            if results is None:
+                continue
+
+            chunk = submitted.pop(name)
+            print(f"   ✅ Batch job {name} finished ({state})")
+            # Prompts the job returned nothing for are reported as failed;
+            # indices outside the job are ignored
+            for index, (business, _, key) in enumerate(chunk):
+                text, error = results.get(index, (None, "No response returned"))
+                completed += 1
+                if error or not text:
+                    print(f"   ❌ No email for {business.get('name')}: {error or 'empty response'}")
+                    if progress_callback:
+                        progress_callback(completed, total, business, RuntimeError(error or "empty response"))
+                    continue
+
+                subject, body = parse_email_response(text)
+                if use_cache:
+                    cache.store(key, subject, body)
+                if progress_callback:
+                    progress_callback(completed, total, business, None)
+                yield business, subject, body
+
+        if not submitted:
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Batch jobs still running after {timeout}s: {', '.join(submitted)}")
+
+        print(f"   ⏳ Waiting for {len(submitted)} batch job(s)...")
+        time.sleep(poll_interval)
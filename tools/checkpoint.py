@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Checkpoint journal for email generation
+
+An append-only JSON Lines file under .tmp/ that records what a generation
+run has done: the campaign and its draft businesses, each generated email,
+and the rows that have been written back to the sheet. If a run dies
+part-way, the next run replays the journal to skip finished rows without
+re-querying Sheets, re-queue emails that were generated but not yet
+written, and generate only what is left.
+
+Records are fsync'd every CHECKPOINT_FSYNC_BATCH appends (and on close), so
+a crash loses at most one batch of progress; a torn last line is ignored.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import CHECKPOINT_FILENAME, CHECKPOINT_FSYNC_BATCH
+
+DEFAULT_CHECKPOINT_PATH = Path(__file__).parent.parent / ".tmp" / CHECKPOINT_FILENAME
+
+
+def campaign_key(config, spreadsheet_id=None):
+    """
+    Identify a generation run by its campaign settings and sheet
+
+    Args:
+        config: Campaign config dict
+        spreadsheet_id: Sheet ID (default: GOOGLE_SPREADSHEET_ID)
+
+    Returns:
+        str: Hex digest that changes when the campaign or sheet changes
+    """
+    spreadsheet_id = spreadsheet_id or os.getenv('GOOGLE_SPREADSHEET_ID', '')
+    payload = json.dumps(config, sort_keys=True) + "\0" + spreadsheet_id
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class GenerationCheckpoint:
+    """Append-only journal of a generation run"""
+
+    def __init__(self, path=DEFAULT_CHECKPOINT_PATH, fsync_batch=CHECKPOINT_FSYNC_BATCH):
+        """
+        Initialize checkpoint
+
+        Args:
+            path: Journal file
+            fsync_batch: Records appended between fsyncs
+        """
+        self.path = Path(path)
+        self.fsync_batch = fsync_batch
+
+        self.key = None
+        self.businesses = []
+        self.generated = {}
+        self.written = set()
+
+        self._file = None
+        self._unsynced = 0
+        self._valid_size = 0
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Replay the journal from disk
+
+        Returns:
+            bool: True if a run was found
+        """
+        self.key = None
+        self.businesses = []
+        self.generated = {}
+        self.written = set()
+        self._valid_size = 0
+
+        if not self.path.exists():
+            return False
+
+        with open(self.path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash - everything before it is intact
+                    break
+                self._valid_size += len(line)
+
+                kind = record.get('type')
+                if kind == 'campaign':
+                    self.key = record['key']
+                    self.businesses = record['businesses']
+                elif kind == 'generated':
+                    self.generated[record['row']] = (record['subject'], record['body'])
+                elif kind == 'written':
+                    self.written.update(record['rows'])
+
+        return self.key is not None
+
+    def resume(self, key):
+        """
+        Continue the journalled run if it belongs to this campaign
+
+        Args:
+            key: campaign_key() of the current run
+
+        Returns:
+            bool: True if there is unfinished work to resume
+        """
+        if not self.load() or self.key != key:
+            return False
+        if not self.remaining_businesses() and not self.unwritten_emails():
+            return False
+
+        # Drop a torn last record so new ones start on a clean line
+        with open(self.path, 'r+b') as f:
+            f.truncate(self._valid_size)
+        self._open('a')
+        return True
+
+    def start(self, key, businesses):
+        """
+        Begin a new run, replacing any previous journal
+
+        Args:
+            key: campaign_key() of the run
+            businesses: Draft businesses to generate emails for
+        """
+        self.close()
+        self.key = key
+        self.businesses = list(businesses)
+        self.generated = {}
+        self.written = set()
+
+        self._open('w')
+        self._append({'type': 'campaign', 'key': key, 'businesses': self.businesses})
+        self.flush()
+
+    def remaining_businesses(self):
+        """
+        Returns:
+            list: Businesses with no generated email yet
+        """
+        return [b for b in self.businesses if b['row_number'] not in self.generated]
+
+    def unwritten_emails(self):
+        """
+        Returns:
+            list: (row_number, subject, body) generated but not written to the sheet
+        """
+        return [
+            (row, subject, body)
+            for row, (subject, body) in self.generated.items()
+            if row not in self.written
+        ]
+
+    def record_generated(self, row_number, subject, body):
+        """
+        Journal a generated email
+
+        Args:
+            row_number: Sheet row of the business
+            subject: Email subject line
+            body: Email body text
+        """
+        with self._lock:
+            self.generated[row_number] = (subject, body)
+            self._append({'type': 'generated', 'row': row_number, 'subject': subject, 'body': body})
+
+    def record_written(self, rows):
+        """
+        Journal rows saved to the sheet (BatchSheetWriter on_flush callback)
+
+        Args:
+            rows: Row numbers just written
+        """
+        with self._lock:
+            rows = list(rows)
+            self.written.update(rows)
+            self._append({'type': 'written', 'rows': rows})
+
+    def flush(self):
+        """Write buffered records through to disk"""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+
+    def close(self):
+        """Sync and close the journal, keeping it for the next run"""
+        if self._file:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def complete(self):
+        """Finish the run and delete the journal"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    def _open(self, mode):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, mode, encoding='utf-8')
+
+    def _append(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_batch:
+            self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Disposable email domain index
+
+Loads the bundled blocklist (data/disposable_domains.txt) on first use into
+two hash sets: exact domains, and suffixes from "*." wildcard entries. A
+lookup is one set probe for the domain plus one per parent domain, so it
+costs the same with ten entries or a hundred thousand.
+"""
+
+import os
+import sys
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import DISPOSABLE_DOMAINS_FILENAME
+
+DEFAULT_DOMAINS_PATH = Path(__file__).parent.parent / "data" / DISPOSABLE_DOMAINS_FILENAME
+
+
+def normalize_domain(domain):
+    """
+    Lowercase a domain and drop surrounding whitespace and a trailing dot
+
+    Args:
+        domain: Domain name
+
+    Returns:
+        str: Normalized domain
+    """
+    return domain.strip().lower().rstrip('.')
+
+
+class DomainIndex:
+    """Membership index of exact domains and wildcard subdomain suffixes"""
+
+    def __init__(self, domains=()):
+        """
+        Build the index
+
+        Args:
+            domains: Iterable of entries; "*.example.com" matches every
+                subdomain of example.com, anything else matches exactly
+        """
+        exact = set()
+        suffixes = set()
+        for entry in domains:
+            entry = normalize_domain(entry)
+            if not entry or entry.startswith('#'):
+                continue
+            if entry.startswith('*.'):
+                suffixes.add(entry[2:])
+            else:
+                exact.add(entry)
+
+        self._exact = frozenset(exact)
+        self._suffixes = frozenset(suffixes)
+
+    @classmethod
+    def from_file(cls, path, extra=()):
+        """
+        Load an index from a blocklist file
+
+        Args:
+            path: Text file with one entry per line (# starts a comment line)
+            extra: Additional entries to include
+
+        Returns:
+            DomainIndex
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(list(f) + list(extra))
+
+    def __len__(self):
+        return len(self._exact) + len(self._suffixes)
+
+    def __contains__(self, domain):
+        """
+        Check a domain against the index
+
+        Args:
+            domain: Normalized domain name
+
+        Returns:
+            bool: True if listed exactly or under a wildcard parent
+        """
+        if domain in self._exact:
+            return True
+        if not self._suffixes:
+            return False
+
+        dot = domain.find('.')
+        while dot != -1:
+            if domain[dot + 1:] in self._suffixes:
+                return True
+            dot = domain.find('.', dot + 1)
+        return False
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_disposable_index(path=DEFAULT_DOMAINS_PATH, extra=()):
+    """
+    Get the shared disposable domain index, loading it on first use
+
+    Args:
+        path: Blocklist file (only used on first call)
+        extra: Entries always included, e.g. a built-in fallback list
+
+    Returns:
+        DomainIndex
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                try:
+                    _index = DomainIndex.from_file(path, extra)
+                except OSError as e:
+                    print(f"⚠️  Could not load disposable domain list ({e}), using built-in list")
+                    _index = DomainIndex(extra)
+    return _index
+
+
+def reset_disposable_index():
+    """Drop the loaded index so the next lookup reloads the file"""
+    global _index
+    with _index_lock:
+        _index = None
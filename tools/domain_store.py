@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Persistent per-domain reputation for email verification
+
+Remembers, for every recipient domain seen, whether it has MX records (until
+the lookup expires), whether it is a disposable mail service, and how many
+recipients its mail server accepted or refused as a domain (refusals
+restart after DOMAIN_BOUNCE_TTL). Addresses refused one by one are kept
+separately, so a dead mailbox only rules out itself. Kept in SQLite under
+.tmp/, so repeat campaigns in the same vertical verify mostly from disk and
+only stale domains go back to DNS.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import DOMAIN_STORE_FILENAME, DOMAIN_BOUNCE_TTL
+
+DEFAULT_STORE_PATH = Path(__file__).parent.parent / ".tmp" / DOMAIN_STORE_FILENAME
+
+# SQLite's default limit on ? parameters per statement is 999
+QUERY_CHUNK_SIZE = 500
+
+DomainRecord = namedtuple(
+    'DomainRecord', ['domain', 'has_mx', 'mx_expires_at', 'disposable', 'delivered', 'bounced', 'bounced_at']
+)
+
+
+class DomainStore:
+    """SQLite-backed record of what is known about each email domain"""
+
+    def __init__(self, path=DEFAULT_STORE_PATH, bounce_ttl=DOMAIN_BOUNCE_TTL):
+        """
+        Open (or create) the store
+
+        Args:
+            path: SQLite database file
+            bounce_ttl: Seconds after a domain's last refusal before its
+                refusal count starts again
+        """
+        self.path = Path(path)
+        self.bounce_ttl = bounce_ttl
+        self.mx_hits = 0
+        self.mx_misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS domains (
+                domain TEXT PRIMARY KEY,
+                has_mx INTEGER,
+                mx_expires_at REAL,
+                disposable INTEGER,
+                delivered INTEGER NOT NULL DEFAULT 0,
+                bounced INTEGER NOT NULL DEFAULT 0,
+                bounced_at REAL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(domains)")}
+        if 'bounced_at' not in columns:
+            self._conn.execute("ALTER TABLE domains ADD COLUMN bounced_at REAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS bounced_addresses (
+                email TEXT PRIMARY KEY,
+                bounces INTEGER NOT NULL DEFAULT 1,
+                bounced_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, domain):
+        """
+        Look up everything known about a domain
+
+        Args:
+            domain: Lowercase domain name
+
+        Returns:
+            DomainRecord or None
+        """
+        return self.get_many([domain]).get(domain)
+
+    def get_many(self, domains):
+        """
+        Look up many domains at once
+
+        Args:
+            domains: Iterable of lowercase domain names
+
+        Returns:
+            dict: domain -> DomainRecord for the domains in the store
+        """
+        domains = list(dict.fromkeys(domains))
+        records = {}
+        with self._lock:
+            for start in range(0, len(domains), QUERY_CHUNK_SIZE):
+                chunk = domains[start:start + QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    "SELECT domain, has_mx, mx_expires_at, disposable, delivered, bounced, bounced_at "
+                    f"FROM domains WHERE domain IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                for row in rows:
+                    has_mx = None if row[1] is None else bool(row[1])
+                    disposable = None if row[3] is None else bool(row[3])
+                    records[row[0]] = DomainRecord(row[0], has_mx, row[2], disposable, *row[4:])
+        return records
+
+    def get_mx_many(self, domains):
+        """
+        Unexpired MX results for many domains
+
+        Counts a hit for each domain answered and a miss for the rest.
+
+        Args:
+            domains: Iterable of lowercase domain names
+
+        Returns:
+            dict: domain -> (has_mx, seconds until the result expires)
+        """
+        domains = list(dict.fromkeys(domains))
+        now = time.time()
+        results = {
+            domain: (record.has_mx, record.mx_expires_at - now)
+            for domain, record in self.get_many(domains).items()
+            if record.has_mx is not None and record.mx_expires_at > now
+        }
+        self.mx_hits += len(results)
+        self.mx_misses += len(domains) - len(results)
+        return results
+
+    def store_mx_many(self, results):
+        """
+        Save MX lookups
+
+        Args:
+            results: Iterable of (domain, has_mx, ttl) tuples; entries with
+                ttl None (temporary failures) are skipped
+        """
+        now = time.time()
+        rows = [(domain, int(has_mx), now + ttl, now) for domain, has_mx, ttl in results if ttl is not None]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO domains (domain, has_mx, mx_expires_at, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET has_mx = excluded.has_mx, "
+                "mx_expires_at = excluded.mx_expires_at, updated_at = excluded.updated_at",
+                rows
+            )
+            self._conn.commit()
+
+    def mark_disposable(self, domains, disposable=True):
+        """
+        Remember the disposable status of domains
+
+        Args:
+            domains: Iterable of lowercase domain names
+            disposable: Status to record
+        """
+        now = time.time()
+        rows = [(domain, int(disposable), now) for domain in dict.fromkeys(domains)]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO domains (domain, disposable, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(domain) DO UPDATE SET disposable = excluded.disposable, "
+                "updated_at = excluded.updated_at",
+                rows
+            )
+            self._conn.commit()
+
+    def record_delivery(self, domain, delivered):
+        """
+        Count the outcome of a send to a domain
+
+        Args:
+            domain: Lowercase domain name
+            delivered: True if the domain's mail server accepted the
+                recipient, False if it refused the domain as a whole (a
+                refusal more than bounce_ttl after the last one restarts
+                the count)
+        """
+        now = time.time()
+        with self._lock:
+            if delivered:
+                self._conn.execute(
+                    "INSERT INTO domains (domain, delivered, updated_at) VALUES (?, 1, ?) "
+                    "ON CONFLICT(domain) DO UPDATE SET delivered = delivered + 1, "
+                    "updated_at = excluded.updated_at",
+                    (domain, now)
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO domains (domain, bounced, bounced_at, updated_at) VALUES (?, 1, ?, ?) "
+                    "ON CONFLICT(domain) DO UPDATE SET "
+                    "bounced = CASE WHEN bounced_at > ? THEN bounced + 1 ELSE 1 END, "
+                    "bounced_at = excluded.bounced_at, updated_at = excluded.updated_at",
+                    (domain, now, now, now - self.bounce_ttl)
+                )
+            self._conn.commit()
+
+    def record_bounce(self, email):
+        """
+        Remember an address whose mailbox was refused
+
+        Args:
+            email: Lowercase email address
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO bounced_addresses (email, bounced_at) VALUES (?, ?) "
+                "ON CONFLICT(email) DO UPDATE SET bounces = bounces + 1, "
+                "bounced_at = excluded.bounced_at",
+                (email, time.time())
+            )
+            self._conn.commit()
+
+    def has_bounced(self, email):
+        """
+        Check whether a send to this exact address was refused
+
+        Args:
+            email: Lowercase email address
+
+        Returns:
+            bool
+        """
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM bounced_addresses WHERE email = ?", (email,)
+            ).fetchone() is not None
+
+    def stats(self):
+        """
+        Store counters for this session
+
+        Returns:
+            dict: mx_hits, mx_misses and stored domain count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM domains").fetchone()[0]
+        return {
+            'mx_hits': self.mx_hits,
+            'mx_misses': self.mx_misses,
+            'entries': entries,
+        }
+
+    def clear(self):
+        """Forget every domain and bounced address"""
+        with self._lock:
+            self._conn.execute("DELETE FROM domains")
+            self._conn.execute("DELETE FROM bounced_addresses")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_domain_store():
+    """
+    Get the shared domain store, opening it on first use
+
+    Returns:
+        DomainStore
+    """
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = DomainStore()
+        return _store
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Content-addressed cache of generated emails
+
+Entries are keyed by a hash of the model name and the fully rendered prompt,
+so an email is only reused when everything Gemini would see is identical.
+Parsed (subject, body) pairs are kept in SQLite under .tmp/ and the least
+recently used entries are evicted once the cache is full.
+"""
+
+import os
+import sys
+import time
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import GEMINI_MODEL, EMAIL_CACHE_FILENAME, EMAIL_CACHE_MAX_ENTRIES
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / ".tmp" / EMAIL_CACHE_FILENAME
+
+
+def prompt_key(prompt, model=GEMINI_MODEL):
+    """
+    Cache key for a rendered prompt
+
+    Args:
+        prompt: Prompt text sent to Gemini
+        model: Model name (a different model never reuses an entry)
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    return hashlib.sha256(f"{model}\0{prompt}".encode('utf-8')).hexdigest()
+
+
+class EmailCache:
+    """SQLite-backed LRU cache of generated (subject, body) pairs"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=EMAIL_CACHE_MAX_ENTRIES, clock=time.time):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept before the least recently used are evicted
+            clock: Time source for the use timestamps
+        """
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS emails (
+                key TEXT PRIMARY KEY,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                used_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS emails_used_at ON emails (used_at)")
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Look up a generated email and mark it recently used
+
+        Args:
+            key: prompt_key() of the prompt
+
+        Returns:
+            tuple: (subject, body), or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT subject, body FROM emails WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE emails SET used_at = ? WHERE key = ?", (self.clock(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0], row[1]
+
+    def store(self, key, subject, body):
+        """
+        Save a generated email, evicting the oldest entries if full
+
+        Args:
+            key: prompt_key() of the prompt
+            subject: Parsed subject line
+            body: Parsed email body
+        """
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO emails (key, subject, body, created_at, used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, subject, body, now, now)
+            )
+            self._conn.execute(
+                "DELETE FROM emails WHERE key IN ("
+                "SELECT key FROM emails ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            self._conn.commit()
+
+    def stats(self):
+        """
+        Cache counters for this session
+
+        Returns:
+            dict: hits, misses and stored entry count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM emails").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+    def clear(self):
+        """Remove all cached emails"""
+        with self._lock:
+            self._conn.execute("DELETE FROM emails")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_email_cache():
+    """
+    Get the shared email cache, opening it on first use
+
+    Returns:
+        EmailCache
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = EmailCache()
+        return _cache
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Shared Gemini clients
+
+A genai.Client is created once per API key and reused by every call and
+thread, instead of building a new client for each email. Keys are passed
+explicitly, so several users can generate at the same time without touching
+GEMINI_API_KEY in the environment.
+"""
+
+import os
+import sys
+import threading
+from collections import OrderedDict
+from google import genai
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import GEMINI_CLIENT_POOL_SIZE
+
+
+class GeminiClientPool:
+    """Least-recently-used pool of Gemini clients keyed by API key"""
+
+    def __init__(self, max_size=GEMINI_CLIENT_POOL_SIZE):
+        """
+        Initialize pool
+
+        Args:
+            max_size: Number of API keys to keep a client for
+        """
+        self.max_size = max_size
+        self._clients = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, api_key):
+        """
+        Get the client for an API key, creating it on first use
+
+        Args:
+            api_key: Gemini API key
+
+        Returns:
+            genai.Client
+        """
+        with self._lock:
+            client = self._clients.get(api_key)
+            if client is None:
+                client = genai.Client(api_key=api_key)
+                self._clients[api_key] = client
+                # Evicted clients are only dropped, not closed: another
+                # thread may still be using them
+                while len(self._clients) > self.max_size:
+                    self._clients.popitem(last=False)
+            else:
+                self._clients.move_to_end(api_key)
+            return client
+
+    def clear(self):
+        """Forget all clients"""
+        with self._lock:
+            self._clients.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+
+_pool = GeminiClientPool()
+
+
+def get_gemini_client(api_key):
+    """
+    Get the shared Gemini client for an API key
+
+    Args:
+        api_key: Gemini API key
+
+    Returns:
+        genai.Client
+    """
+    return _pool.get(api_key)
+
+
+def clear_gemini_clients():
+    """Drop all cached Gemini clients"""
+    _pool.clear()
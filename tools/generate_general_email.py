@@ -6,7 +6,6 @@ Strategy: Discovery-focused, ask about problems, offer broad help
 
 import os
 import sys
-import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -14,6 +13,10 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from constants import GEMINI_MODEL, MAX_WEBSITE_CONTEXT_LENGTH
+from tools.rate_limiter import rate_limited
+from tools.gemini_client import get_gemini_client
+from tools.email_cache import get_email_cache, prompt_key
+from tools.prompt_templates import get_prompt_template
 
 load_dotenv()
 
@@ -34,13 +37,14 @@ def validate_api_key():
     wait=wait_exponential(multiplier=1, min=2, max=10),
     retry=retry_if_exception_type((google_exceptions.GoogleAPIError, Exception))
 )
-def call_gemini_api(client, prompt):
+def call_gemini_api(client, prompt, limiter=None):
     """
     Call Gemini API with retry logic
 
     Args:
         client: Gemini client instance
         prompt: The prompt to send
+        limiter: Optional GeminiRateLimiter shared between workers
 
     Returns:
         API response object
@@ -49,10 +53,12 @@ def call_gemini_api(client, prompt):
         errors.ClientError: If API request fails after retries
     """
     try:
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt
-        )
+        with rate_limited(limiter, prompt) as usage:
+            response = client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt
+            )
+            usage.record(response)
         return response
     except google_exceptions.GoogleAPIError as e:
         print(f"⚠️  Gemini API Error (retrying...): {e}")
@@ -114,40 +120,26 @@ def parse_email_response(response_text):
     return subject, body
 
 
-def generate_general_email(business_name, business_type, website_content="", automation_focus=None):
+def build_general_prompt(business_name, business_type, website_content=""):
     """
-    Generate a discovery-focused email that asks about problems
+    Render the general help prompt
 
     Args:
         business_name: Name of the business
         business_type: Type of business (e.g., "Dentist", "Restaurant")
         website_content: Scraped website content (optional)
-        automation_focus: Not used in general strategy, but kept for consistency
 
     Returns:
-        tuple: (subject, body)
-
-    Raises:
-        ValueError: If API key is missing
-        errors.ClientError: If API call fails after retries
+        str: Prompt text sent to Gemini
     """
 
-    # Validate API key exists
-    api_key = validate_api_key()
-
-    # Configure Gemini
-    try:
-        client = genai.Client(api_key=api_key)
-    except Exception as e:
-        raise ValueError(f"Failed to initialize Gemini client: {e}")
-
     # Build context from website if available
     website_context = ""
     if website_content:
         website_context = f"\n\nWebsite info:\n{website_content[:MAX_WEBSITE_CONTEXT_LENGTH]}"
 
     # GENERAL HELP PROMPT - Discovery-focused
-    prompt = f"""
+    return f"""
 You are writing a cold outreach email to a {business_type} business called "{business_name}".
 
 STRATEGY: General Help (Discovery Approach)
@@ -190,9 +182,51 @@ BODY:
 Start now:
 """
 
+
+def generate_general_email(business_name, business_type, website_content="", automation_focus=None, limiter=None, api_key=None, use_cache=True):
+    """
+    Generate a discovery-focused email that asks about problems
+
+    Args:
+        business_name: Name of the business
+        business_type: Type of business (e.g., "Dentist", "Restaurant")
+        website_content: Scraped website content (optional)
+        automation_focus: Not used in general strategy, but kept for consistency
+        limiter: Optional GeminiRateLimiter (for parallel generation)
+        api_key: Gemini API key (default: GEMINI_API_KEY from the environment)
+        use_cache: Reuse a cached email for an identical prompt (False regenerates)
+
+    Returns:
+        tuple: (subject, body)
+
+    Raises:
+        ValueError: If API key is missing
+        errors.ClientError: If API call fails after retries
+    """
+
+    # Validate API key exists
+    api_key = api_key or validate_api_key()
+
+    # Reuse the shared client for this key
+    try:
+        client = get_gemini_client(api_key)
+    except Exception as e:
+        raise ValueError(f"Failed to initialize Gemini client: {e}")
+
+    # Campaign-wide parts of the prompt are compiled once and reused
+    prompt = get_prompt_template(build_general_prompt, business_type).render(business_name, website_content)
+
+    # Reuse the email generated for an identical prompt (same model)
+    cache = get_email_cache() if use_cache else None
+    key = prompt_key(prompt)
+    if use_cache:
+        cached = cache.get(key)
+        if cached:
+            return cached
+
     # Call API with error handling and retry logic
     try:
-        response = call_gemini_api(client, prompt)
+        response = call_gemini_api(client, prompt, limiter)
         response_text = response.text
     except Exception as e:
         print(f"❌ Failed to generate email after retries: {e}")
@@ -206,6 +240,9 @@ Start now:
     # Parse response with error handling
     subject, body = parse_email_response(response_text)
 
+    if use_cache:
+        cache.store(key, subject, body)
+
     return subject, body
 
 
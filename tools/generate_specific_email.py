@@ -6,7 +6,6 @@ Strategy: Benefit-driven, lead with value, focus on one solution
 
 import os
 import sys
-import google.generativeai as genai
 from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
@@ -19,6 +18,10 @@ from constants import (
     AUTOMATION_LEAD_FOLLOWUP, AUTOMATION_FEEDBACK_COLLECTION,
     AUTOMATION_INVENTORY_ALERTS
 )
+from tools.rate_limiter import rate_limited
+from tools.gemini_client import get_gemini_client
+from tools.email_cache import get_email_cache, prompt_key
+from tools.prompt_templates import get_prompt_template
 
 load_dotenv()
 
@@ -39,13 +42,14 @@ def validate_api_key():
     wait=wait_exponential(multiplier=1, min=2, max=10),
     retry=retry_if_exception_type((google_exceptions.GoogleAPIError, Exception))
 )
-def call_gemini_api(client, prompt):
+def call_gemini_api(client, prompt, limiter=None):
     """
     Call Gemini API with retry logic
 
     Args:
         client: Gemini client instance
         prompt: The prompt to send
+        limiter: Optional GeminiRateLimiter shared between workers
 
     Returns:
         API response object
@@ -54,10 +58,12 @@ def call_gemini_api(client, prompt):
         errors.ClientError: If API request fails after retries
     """
     try:
-        response = client.models.generate_content(
-            model=GEMINI_MODEL,
-            contents=prompt
-        )
+        with rate_limited(limiter, prompt) as usage:
+            response = client.models.generate_content(
+                model=GEMINI_MODEL,
+                contents=prompt
+            )
+            usage.record(response)
         return response
     except google_exceptions.GoogleAPIError as e:
         print(f"⚠️  Gemini API Error (retrying...): {e}")
@@ -119,80 +125,72 @@ def parse_email_response(response_text):
     return subject, body
 
 
-def get_automation_details(automation_focus, business_type):
-    """
-    Get specific details about each automation type
-    This helps Gemini generate more targeted emails
-    """
-
-    automations = {
-        AUTOMATION_APPOINTMENT_REMINDERS: f"""
+# Details for each automation; only the one a campaign uses is formatted
+AUTOMATION_DETAILS = {
+    AUTOMATION_APPOINTMENT_REMINDERS: lambda business_type: f"""
         PAIN POINT: {business_type}s lose revenue from no-shows and late cancellations
         BENEFIT: Reduce no-shows by 30-40% with automated SMS/email reminders
         STATS: Average {business_type} loses $150-300 per no-show
         PROOF: "Dr. Smith reduced no-shows from 15% to 6% in 60 days"
         """,
 
-        AUTOMATION_REVIEW_REQUESTS: f"""
+    AUTOMATION_REVIEW_REQUESTS: lambda business_type: f"""
         PAIN POINT: {business_type}s struggle to get consistent 5-star reviews
         BENEFIT: Increase Google reviews by 300% with automated follow-ups
         STATS: 88% of customers will leave a review if asked at the right time
         PROOF: "{business_type} went from 12 reviews to 80+ in 6 months"
         """,
 
-        AUTOMATION_LEAD_FOLLOWUP: f"""
+    AUTOMATION_LEAD_FOLLOWUP: lambda business_type: f"""
         PAIN POINT: {business_type}s miss potential customers who inquire online
         BENEFIT: Never miss a lead with instant automated follow-up
         STATS: 78% of customers choose the business that responds first
         PROOF: "{business_type} increased conversions by 45% with instant follow-up"
         """,
 
-        AUTOMATION_FEEDBACK_COLLECTION: f"""
+    AUTOMATION_FEEDBACK_COLLECTION: lambda business_type: f"""
         PAIN POINT: {business_type}s don't know what customers really think
         BENEFIT: Get actionable feedback automatically after every appointment
         STATS: Businesses that collect feedback see 25% higher retention
         PROOF: "{business_type} improved service quality score from 3.8 to 4.7"
         """,
 
-        AUTOMATION_INVENTORY_ALERTS: f"""
+    AUTOMATION_INVENTORY_ALERTS: lambda business_type: f"""
         PAIN POINT: {business_type}s run out of stock or over-order supplies
         BENEFIT: Never run out of critical supplies with smart alerts
         STATS: Reduces supply costs by 15-20% through better forecasting
         PROOF: "{business_type} cut supply waste by $800/month"
         """
-    }
+}
 
-    return automations.get(automation_focus, f"Focus on {automation_focus} benefits for {business_type}s")
 
+def get_automation_details(automation_focus, business_type):
+    """
+    Get specific details about each automation type
+    This helps Gemini generate more targeted emails
+    """
 
-def generate_specific_email(business_name, business_type, website_content="", automation_focus=None):
+    details = AUTOMATION_DETAILS.get(automation_focus)
+    if details is None:
+        return f"Focus on {automation_focus} benefits for {business_type}s"
+    return details(business_type)
+
+
+def build_specific_prompt(business_name, business_type, website_content="", automation_focus=None):
     """
-    Generate a benefit-driven email focused on a specific automation
+    Render the specific automation prompt
 
     Args:
         business_name: Name of the business
         business_type: Type of business (e.g., "Dentist", "Restaurant")
         website_content: Scraped website content (optional)
         automation_focus: The specific automation to highlight
+            (default: appointment reminders)
 
     Returns:
-        tuple: (subject, body)
-
-    Raises:
-        ValueError: If API key is missing
-        errors.ClientError: If API call fails after retries
+        str: Prompt text sent to Gemini
     """
 
-    # Validate API key exists
-    api_key = validate_api_key()
-
-    # Configure Gemini
-    try:
-        client = genai.Client(api_key=api_key)
-    except Exception as e:
-        raise ValueError(f"Failed to initialize Gemini client: {e}")
-
-    # Default to appointment reminders if not specified
     if not automation_focus:
         automation_focus = AUTOMATION_APPOINTMENT_REMINDERS
 
@@ -205,7 +203,7 @@ def generate_specific_email(business_name, business_type, website_content="", au
     automation_details = get_automation_details(automation_focus, business_type)
 
     # SPECIFIC AUTOMATION PROMPT - Benefit-driven
-    prompt = f"""
+    return f"""
 You are writing a warm outreach email to a {business_type} business called "{business_name}".
 
 STRATEGY: Specific Automation (Focused Approach)
@@ -251,9 +249,56 @@ BODY:
 Start now:
 """
 
+
+def generate_specific_email(business_name, business_type, website_content="", automation_focus=None, limiter=None, api_key=None, use_cache=True):
+    """
+    Generate a benefit-driven email focused on a specific automation
+
+    Args:
+        business_name: Name of the business
+        business_type: Type of business (e.g., "Dentist", "Restaurant")
+        website_content: Scraped website content (optional)
+        automation_focus: The specific automation to highlight
+        limiter: Optional GeminiRateLimiter (for parallel generation)
+        api_key: Gemini API key (default: GEMINI_API_KEY from the environment)
+        use_cache: Reuse a cached email for an identical prompt (False regenerates)
+
+    Returns:
+        tuple: (subject, body)
+
+    Raises:
+        ValueError: If API key is missing
+        errors.ClientError: If API call fails after retries
+    """
+
+    # Default to appointment reminders if not specified
+    if not automation_focus:
+        automation_focus = AUTOMATION_APPOINTMENT_REMINDERS
+
+    # Validate API key exists
+    api_key = api_key or validate_api_key()
+
+    # Reuse the shared client for this key
+    try:
+        client = get_gemini_client(api_key)
+    except Exception as e:
+        raise ValueError(f"Failed to initialize Gemini client: {e}")
+
+    # Campaign-wide parts of the prompt are compiled once and reused
+    template = get_prompt_template(build_specific_prompt, business_type, automation_focus)
+    prompt = template.render(business_name, website_content)
+
+    # Reuse the email generated for an identical prompt (same model)
+    cache = get_email_cache() if use_cache else None
+    key = prompt_key(prompt)
+    if use_cache:
+        cached = cache.get(key)
+        if cached:
+            return cached
+
     # Call API with error handling and retry logic
     try:
-        response = call_gemini_api(client, prompt)
+        response = call_gemini_api(client, prompt, limiter)
         response_text = response.text
     except Exception as e:
         print(f"❌ Failed to generate email after retries: {e}")
@@ -267,6 +312,9 @@ Start now:
     # Parse response with error handling
     subject, body = parse_email_response(response_text)
 
+    if use_cache:
+        cache.store(key, subject, body)
+
     return subject, body
 
 
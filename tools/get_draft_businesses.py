@@ -4,66 +4,40 @@ Get businesses with "Draft" status from Google Sheets
 """
 
 import os
+import sys
 from dotenv import load_dotenv
-from .upload_to_sheets import get_sheets_service
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import STATUS_DRAFT
+from tools.sheet_snapshot import get_sheet_snapshot, DRAFT_FIELDS
 
 load_dotenv()
 
 
-def get_draft_businesses():
+def get_draft_businesses(refresh=False):
     """
     Get all businesses with Status = "Draft" from Google Sheets
 
+    Args:
+        refresh: Force a fresh download instead of reusing the shared snapshot
+
     Returns:
         list: List of business dictionaries with row numbers
     """
 
     try:
-        service = get_sheets_service()
-        spreadsheet_id = os.getenv('GOOGLE_SPREADSHEET_ID')
-
-        if not spreadsheet_id:
+        if not os.getenv('GOOGLE_SPREADSHEET_ID'):
             print("❌ GOOGLE_SPREADSHEET_ID not set in .env")
             return []
 
-        # Get all rows
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range='A2:N'  # Skip header row
-        ).execute()
-
-        rows = result.get('values', [])
+        snapshot = get_sheet_snapshot(refresh=refresh)
 
-        if not rows:
+        if not snapshot.row_count:
             print("❌ No data found in Google Sheet")
             return []
 
-        # Filter for Draft status (column J, index 9)
-        draft_businesses = []
-        for i, row in enumerate(rows, start=2):  # Start at row 2 (skip header)
-            # Ensure row has enough columns
-            while len(row) < 14:
-                row.append('')
-
-            status = row[9] if len(row) > 9 else ''
-
-            if status.lower() == 'draft':
-                business = {
-                    'row_number': i,
-                    'name': row[0],
-                    'location': row[1],
-                    'email': row[2],
-                    'phone': row[3],
-                    'website': row[4],
-                    'contact_person': row[5],
-                    'generated_subject': row[6],
-                    'generated_body': row[7],
-                    'notes': row[8],
-                    'status': row[9]
-                }
-                draft_businesses.append(business)
-
-        return draft_businesses
+        return snapshot.businesses(STATUS_DRAFT, DRAFT_FIELDS)
 
     except Exception as error:
         print(f"❌ Error getting draft businesses: {error}")
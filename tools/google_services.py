@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Cached, thread-safe Google API service factory
+
+Credentials are loaded once per token file and refreshed shortly before they
+expire. The discovery document for each API is parsed once per process, and
+every thread gets its own service object on its own httplib2 transport, so
+services can be reused from worker threads without rebuilding them.
+"""
+
+import os
+import sys
+import json
+import pickle
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import httplib2
+import google_auth_httplib2
+from google.auth.transport.requests import Request
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from dotenv import load_dotenv
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import API_TIMEOUT, GOOGLE_TOKEN_REFRESH_MARGIN
+
+load_dotenv()
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class GoogleServiceRegistry:
+    """Builds each Google API client once per credential set and thread"""
+
+    def __init__(self, refresh_margin=GOOGLE_TOKEN_REFRESH_MARGIN):
+        """
+        Initialize registry
+
+        Args:
+            refresh_margin: Refresh tokens this many seconds before expiry
+        """
+        self.refresh_margin = timedelta(seconds=refresh_margin)
+        self._credentials = {}
+        self._documents = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._local = threading.local()
+
+    def get_credentials(self, token_path, scopes):
+        """
+        Get credentials for a token file, loading or authorizing on first use
+
+        Args:
+            token_path: Path to the pickled credentials
+            scopes: OAuth scopes to request if authorization is needed
+
+        Returns:
+            google.oauth2.credentials.Credentials
+        """
+        token_path = Path(token_path)
+
+        with self._lock:
+            creds = self._credentials.get(token_path)
+            if creds is None:
+                creds = self._load_credentials(token_path, scopes)
+                self._credentials[token_path] = creds
+
+        if self._needs_refresh(creds):
+            with self._refresh_lock:
+                # Another thread may have refreshed while we waited
+                if self._needs_refresh(creds):
+                    creds.refresh(Request())
+                    self._save_credentials(token_path, creds)
+
+        return creds
+
+    def get_service(self, api, version, token_path, scopes):
+        """
+        Get an authorized service for the calling thread
+
+        Args:
+            api: API name (e.g. 'sheets')
+            version: API version (e.g. 'v4')
+            token_path: Path to the pickled credentials
+            scopes: OAuth scopes
+
+        Returns:
+            googleapiclient Resource bound to a transport owned by this thread
+        """
+        creds = self.get_credentials(token_path, scopes)
+
+        services = getattr(self._local, 'services', None)
+        if services is None:
+            services = self._local.services = {}
+
+        key = (api, version, Path(token_path))
+        cached = services.get(key)
+        if cached is not None and cached[0] is creds:
+            return cached[1]
+
+        http = google_auth_httplib2.AuthorizedHttp(
+            creds, http=httplib2.Http(timeout=API_TIMEOUT)
+        )
+        document = self._discovery_document(api, version)
+        if document is not None:
+            service = build_from_document(document, http=http)
+        else:
+            service = build(api, version, http=http)
+
+        services[key] = (creds, service)
+        return service
+
+    def clear(self):
+        """Forget cached credentials and services (e.g. after re-authorizing)"""
+        with self._lock:
+            self._credentials.clear()
+        self._local = threading.local()
+
+    def _needs_refresh(self, creds):
+        """Whether credentials are invalid or about to expire"""
+        if not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth stores expiry as naive UTC
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return creds.expiry - now < self.refresh_margin
+
+    def _load_credentials(self, token_path, scopes):
+        """Load pickled credentials, running the OAuth flow if unusable"""
+        creds = None
+        if token_path.exists():
+            with open(token_path, 'rb') as token:
+                creds = pickle.load(token)
+
+        if creds and (creds.valid or creds.refresh_token):
+            return creds
+
+        creds_file = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
+        flow = InstalledAppFlow.from_client_secrets_file(creds_file, scopes)
+        creds = flow.run_local_server(port=0)
+        self._save_credentials(token_path, creds)
+        return creds
+
+    def _save_credentials(self, token_path, creds):
+        """Save credentials for next time"""
+        with open(token_path, 'wb') as token:
+            pickle.dump(creds, token)
+
+    def _discovery_document(self, api, version):
+        """Parsed discovery document, read once per process"""
+        key = (api, version)
+        with self._lock:
+            if key not in self._documents:
+                content = get_static_doc(api, version)
+                self._documents[key] = json.loads(content) if content else None
+            return self._documents[key]
+
+
+_registry = GoogleServiceRegistry()
+
+
+def get_google_service(api, version, token_filename, scopes):
+    """
+    Get a cached, authorized Google API service for the calling thread
+
+    Args:
+        api: API name (e.g. 'sheets')
+        version: API version (e.g. 'v4')
+        token_filename: Token pickle file name in the project root
+        scopes: OAuth scopes
+
+    Returns:
+        googleapiclient Resource
+    """
+    return _registry.get_service(api, version, PROJECT_ROOT / token_filename, scopes)
+
+
+def clear_google_services():
+    """Drop all cached credentials and services"""
+    _registry.clear()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Extract visible text from website HTML
+
+Two engines are available:
+- 'stream': event-driven html.parser that skips script/style/nav/footer
+  content and stops parsing as soon as enough text has been collected
+- 'soup':   full BeautifulSoup tree (the original implementation), also used
+  as a fallback if the streaming parser fails
+
+Both produce the same whitespace-normalized text.
+"""
+
+import os
+import re
+import sys
+import codecs
+from html.parser import HTMLParser
+from bs4 import BeautifulSoup
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import WEBSITE_TEXT_LENGTH, HTML_EXTRACT_ENGINE
+
+# Elements whose content is never part of the extracted text
+SKIP_TAGS = frozenset(("script", "style", "nav", "footer"))
+
+# Characters of HTML handed to the streaming parser at a time
+FEED_CHUNK_SIZE = 16 * 1024
+
+CHARSET_PATTERN = re.compile(rb'charset\s*=\s*["\']?\s*([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+
+
+def detect_encoding(content_type=None, head=b''):
+    """
+    Pick the encoding for an HTML document
+
+    Uses the Content-Type charset, then a <meta charset> / BOM in the first
+    bytes of the document, and falls back to UTF-8.
+
+    Args:
+        content_type: Content-Type response header, if any
+        head: First bytes of the document (about 2 KB is enough)
+
+    Returns:
+        str: Python codec name
+    """
+    candidates = []
+    if content_type:
+        match = CHARSET_PATTERN.search(content_type.encode('latin-1', errors='ignore'))
+        if match:
+            candidates.append(match.group(1))
+
+    if head.startswith(codecs.BOM_UTF8):
+        candidates.append(b'utf-8-sig')
+    match = CHARSET_PATTERN.search(head[:2048])
+    if match:
+        candidates.append(match.group(1))
+
+    for candidate in candidates:
+        try:
+            return codecs.lookup(candidate.decode('ascii')).name
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return 'utf-8'
+
+
+def clean_whitespace(text):
+    """
+    Collapse whitespace the same way for every engine
+
+    Args:
+        text: Raw concatenated text
+
+    Returns:
+        str: Text with one space between phrases
+    """
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)
+
+
+class StreamingTextExtractor(HTMLParser):
+    """
+    html.parser handler that collects visible text until it has enough
+
+    Feed HTML with feed() and check `done`; once it is True the rest of the
+    document can be skipped.
+    """
+
+    def __init__(self, max_chars=WEBSITE_TEXT_LENGTH):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.done = False
+        self._parts = []
+        self._visible_chars = 0
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data):
+        if self._skip_depth or self.done:
+            return
+        self._parts.append(data)
+
+        # Cleaned text is at least as long as its non-whitespace characters,
+        # so once we have max_chars of those the prefix can no longer change
+        self._visible_chars += len(''.join(data.split()))
+        if self._visible_chars >= self.max_chars:
+            self.done = True
+
+    def text(self):
+        """Cleaned text collected so far, truncated to max_chars"""
+        return clean_whitespace(''.join(self._parts))[:self.max_chars]
+
+
+def extract_text_streaming(html, max_chars=WEBSITE_TEXT_LENGTH, encoding=None):
+    """
+    Extract text with the early-exit streaming parser
+
+    Args:
+        html: Document as str, bytes, or an iterable of str chunks
+        max_chars: Maximum characters to return
+        encoding: Encoding for bytes input (default: detected from the document)
+
+    Returns:
+        str: Cleaned visible text
+    """
+    if isinstance(html, bytes):
+        html = html.decode(encoding or detect_encoding(head=html), errors='replace')
+
+    if isinstance(html, str):
+        chunks = (html[i:i + FEED_CHUNK_SIZE] for i in range(0, len(html), FEED_CHUNK_SIZE))
+    else:
+        chunks = html
+
+    parser = StreamingTextExtractor(max_chars)
+    for chunk in chunks:
+        parser.feed(chunk)
+        if parser.done:
+            break
+    else:
+        parser.close()
+
+    return parser.text()
+
+
+def extract_text_soup(html, max_chars=WEBSITE_TEXT_LENGTH, encoding=None):
+    """
+    Extract text by building a full BeautifulSoup tree
+
+    Args:
+        html: Document as str or bytes
+        max_chars: Maximum characters to return
+        encoding: Encoding hint for bytes input (default: auto-detect)
+
+    Returns:
+        str: Cleaned visible text
+    """
+    if not isinstance(html, (str, bytes)):
+        html = ''.join(html)
+
+    from_encoding = encoding if isinstance(html, bytes) else None
+    soup = BeautifulSoup(html, 'html.parser', from_encoding=from_encoding)
+
+    for element in soup(list(SKIP_TAGS)):
+        element.decompose()
+
+    return clean_whitespace(soup.get_text())[:max_chars]
+
+
+ENGINES = {
+    'stream': extract_text_streaming,
+    'soup': extract_text_soup,
+}
+
+
+def extract_text(html, max_chars=WEBSITE_TEXT_LENGTH, engine=HTML_EXTRACT_ENGINE, encoding=None):
+    """
+    Extract visible text from HTML
+
+    Args:
+        html: Document as str, bytes, or an iterable of str chunks
+        max_chars: Maximum characters to return
+        engine: 'stream' or 'soup'
+        encoding: Encoding for bytes input
+
+    Returns:
+        str: Cleaned visible text (at most max_chars)
+
+    Raises:
+        ValueError: If the engine is unknown
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown HTML extract engine: {engine}. Choose from: {', '.join(ENGINES)}")
+
+    if engine == 'stream':
+        try:
+            return extract_text_streaming(html, max_chars, encoding)
+        except Exception as e:
+            # Chunk iterators can't be replayed, so only retry complete documents
+            if not isinstance(html, (str, bytes)):
+                raise
+            print(f"   ⚠️  Streaming parser failed ({e}), falling back to BeautifulSoup")
+
+    return extract_text_soup(html, max_chars, encoding)
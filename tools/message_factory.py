@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Build outgoing plain-text emails as ready-to-send bytes
+
+Every email in a campaign shares its sender and content headers, so those are
+encoded once per MessageFactory. Each message then only adds its own To,
+Subject, Date and Message-ID and an encoded body, and is handed to the SMTP
+session as bytes, skipping the MIME object tree and generator pass
+that send_message needs. Plain text needs no multipart wrapper.
+"""
+
+import quopri
+from email import policy
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+
+# RFC 5322 limit on line length, excluding CRLF
+MAX_LINE_LENGTH = 998
+
+CRLF = '\r\n'
+
+
+def clean_header(value):
+    """
+    Flatten a header value to one line
+
+    Args:
+        value: Header text (generated subjects can contain newlines)
+
+    Returns:
+        str: Value with CR/LF replaced by spaces and outer whitespace removed
+    """
+    return value.replace('\r', ' ').replace('\n', ' ').strip()
+
+
+def to_crlf(text):
+    """Normalize line endings to CRLF, as SMTP requires"""
+    return text.replace('\r\n', '\n').replace('\r', '\n').replace('\n', CRLF)
+
+
+class MessageFactory:
+    """Renders plain-text emails from one sender with precomputed headers"""
+
+    def __init__(self, from_address, charset='utf-8'):
+        """
+        Initialize factory
+
+        Args:
+            from_address: Sender address for the From header
+            charset: Charset declared for bodies that aren't ASCII
+        """
+        self.from_address = from_address
+        self.charset = charset
+        self.policy = policy.SMTP
+
+        # Message-IDs use the sender's domain, so make_msgid doesn't look up
+        # this machine's hostname for every message
+        self._msgid_domain = from_address.rpartition('@')[2] or None
+        self._prefix = (
+            self._header('From', from_address) + 'MIME-Version: 1.0' + CRLF
+        ).encode('ascii')
+        self._plain = (
+            'Content-Type: text/plain; charset="us-ascii"' + CRLF +
+            'Content-Transfer-Encoding: 7bit' + CRLF + CRLF
+        ).encode('ascii')
+        self._encoded = (
+            f'Content-Type: text/plain; charset="{charset}"' + CRLF +
+            'Content-Transfer-Encoding: quoted-printable' + CRLF + CRLF
+        ).encode('ascii')
+
+    def _header(self, name, value):
+        """One folded header line ending in CRLF"""
+        value = clean_header(value)
+        line = f"{name}: {value}"
+        if value.isascii() and len(line) <= 78:
+            return line + CRLF
+        # Long or non-ASCII values need folding / RFC 2047 encoding
+        return self.policy.fold(name, value)
+
+    def _body(self, body):
+        """
+        Encode a body
+
+        Returns:
+            tuple: (content header bytes, encoded body bytes)
+        """
+        # Encode with LF endings; quopri would escape a CR as =0D
+        body = body.replace('\r\n', '\n').replace('\r', '\n')
+        if not body.endswith('\n'):
+            body += '\n'
+        if body.isascii() and all(len(line) <= MAX_LINE_LENGTH for line in body.split('\n')):
+            return self._plain, to_crlf(body).encode('ascii')
+        encoded = quopri.encodestring(body.encode(self.charset))
+        return self._encoded, to_crlf(encoded.decode('ascii')).encode('ascii')
+
+    def render(self, to_email, subject, body):
+        """
+        Build a message ready to send over SMTP
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body: Plain-text body
+
+        Returns:
+            bytes: Headers and body with CRLF line endings
+        """
+        headers = (
+            self._header('To', to_email) +
+            self._header('Subject', subject) +
+            'Date: ' + formatdate(localtime=True) + CRLF +
+            'Message-ID: ' + make_msgid(domain=self._msgid_domain) + CRLF
+        )
+        content_headers, payload = self._body(body)
+        return self._prefix + headers.encode('ascii') + content_headers + payload
+
+    def build(self, to_email, subject, body):
+        """
+        Build the same message as an EmailMessage (for previews and tests)
+
+        Args:
+            to_email: Recipient email address
+            subject: Email subject
+            body: Plain-text body
+
+        Returns:
+            EmailMessage
+        """
+        msg = EmailMessage(policy=self.policy)
+        msg['From'] = self.from_address
+        msg['To'] = clean_header(to_email)
+        msg['Subject'] = clean_header(subject)
+        msg['Date'] = formatdate(localtime=True)
+        msg['Message-ID'] = make_msgid(domain=self._msgid_domain)
+        msg.set_content(body)
+        return msg
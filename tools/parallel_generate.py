@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Generate many emails concurrently
+
+Gemini calls run on a worker pool; pacing is left to the GeminiRateLimiter
+the generate function passes to the email tools, so every worker shares the
+same requests/tokens-per-minute budget.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import GEMINI_MAX_WORKERS
+
+
+def generate_emails_parallel(jobs, generate, max_workers=GEMINI_MAX_WORKERS,
+                             total=None, progress_callback=None):
+    """
+    Run email generation for many businesses on a worker pool
+
+    Jobs are pulled lazily (e.g. straight from prefetch_websites) and at most
+    2 x max_workers are queued at once. Results are yielded in completion
+    order on the calling thread, which is also where progress_callback runs.
+    Businesses whose generation raises are reported and skipped.
+
+    Args:
+        jobs: Iterable of (business, website_content) tuples
+        generate: Callable(business, website_content) -> (subject, body)
+        max_workers: Number of emails generated at the same time
+        total: Number of jobs, passed through to progress_callback
+        progress_callback: Optional callable(completed, total, business, error)
+            called once per business; error is None on success
+
+    Yields:
+        tuple: (business, subject, body)
+    """
+    jobs = iter(jobs)
+    max_pending = max_workers * 2
+    pending = {}
+    completed = 0
+    exhausted = False
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        while True:
+            while not exhausted and len(pending) < max_pending:
+                try:
+                    business, website_content = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[executor.submit(generate, business, website_content)] = business
+
+            if not pending:
+                return
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                business = pending.pop(future)
+                completed += 1
+
+                try:
+                    subject, body = future.result()
+                except Exception as e:
+                    print(f"   ❌ Failed to generate email for {business.get('name')}: {e}")
+                    if progress_callback:
+                        progress_callback(completed, total, business, e)
+                    continue
+
+                if progress_callback:
+                    progress_callback(completed, total, business, None)
+                yield business, subject, body
+    finally:
+        # Don't wait for outstanding calls if the caller stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
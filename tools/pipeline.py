@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Streaming email generation pipeline
+
+Businesses flow through three stages, each on its own threads and connected
+by bounded queues:
+
+    reader -> website fetcher pool -> Gemini worker pool -> caller
+
+The caller consumes generated emails (e.g. into a BatchSheetWriter) on its
+own thread. When a stage falls behind, the queue in front of it fills up and
+the stages upstream block, so at most a few queues' worth of businesses and
+page text are in memory however large the campaign is.
+"""
+
+import os
+import sys
+import queue
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    SCRAPE_MAX_WORKERS, SCRAPE_PER_HOST_LIMIT, GEMINI_MAX_WORKERS, PIPELINE_QUEUE_SIZE
+)
+from tools.scrape_website import scrape_website, create_session
+
+# Seconds blocked threads wait between checks for a stopped pipeline
+POLL_INTERVAL = 0.1
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised inside stage threads once the pipeline is shut down"""
+
+
+def _put(q, item, stop):
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            q.put(item, timeout=POLL_INTERVAL)
+            return
+        except queue.Full:
+            continue
+
+
+def _get(q, stop):
+    while True:
+        if stop.is_set():
+            raise _Stopped()
+        try:
+            return q.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            continue
+
+
+class _Stage:
+    """A pool of worker threads reading one queue and writing the next"""
+
+    def __init__(self, name, work, workers, inbox, outbox, downstream_workers, stop):
+        self.name = name
+        self.work = work
+        self.inbox = inbox
+        self.outbox = outbox
+        self.downstream_workers = downstream_workers
+        self.stop = stop
+
+        self._running = workers
+        self._lock = threading.Lock()
+        self.threads = [
+            threading.Thread(target=self._run, name=f"{name}-{i + 1}", daemon=True)
+            for i in range(workers)
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                item = _get(self.inbox, self.stop)
+                if item is _DONE:
+                    break
+                _put(self.outbox, self.work(item), self.stop)
+
+            # The last worker out tells every downstream worker to finish
+            with self._lock:
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                for _ in range(self.downstream_workers):
+                    _put(self.outbox, _DONE, self.stop)
+        except _Stopped:
+            pass
+
+
+def generate_emails_pipeline(businesses, generate, fetch=None,
+                             fetch_workers=SCRAPE_MAX_WORKERS,
+                             generate_workers=GEMINI_MAX_WORKERS,
+                             queue_size=PIPELINE_QUEUE_SIZE,
+                             per_host_limit=SCRAPE_PER_HOST_LIMIT,
+                             total=None, progress_callback=None):
+    """
+    Scrape websites and generate emails for many businesses as a stream
+
+    Results are yielded in completion order on the calling thread, which is
+    also where progress_callback runs. Businesses whose generation raises are
+    reported and skipped. Stopping iteration early (or Ctrl-C) shuts the
+    pipeline down without waiting for calls already in flight.
+
+    Args:
+        businesses: Iterable of business dictionaries with optional 'website'
+        generate: Callable(business, website_content) -> (subject, body)
+        fetch: Callable(business) -> website_content (default: scrape the
+            business website over a pooled session)
+        fetch_workers: Websites fetched at the same time
+        generate_workers: Emails generated at the same time
+        queue_size: Items buffered between two stages
+        per_host_limit: Maximum open connections to any single host
+        total: Number of businesses, passed through to progress_callback
+        progress_callback: Optional callable(completed, total, business, error)
+            called once per business; error is None on success
+
+    Yields:
+        tuple: (business, subject, body)
+    """
+    stop = threading.Event()
+    to_fetch = queue.Queue(maxsize=queue_size)
+    to_generate = queue.Queue(maxsize=queue_size)
+    results = queue.Queue(maxsize=queue_size)
+
+    session = None
+    if fetch is None:
+        session = create_session(per_host_limit=per_host_limit)
+
+        def fetch(business):
+            return scrape_website(business['website'], session)
+
+    def fetch_stage(business):
+        if not business.get('website'):
+            return business, ""
+        try:
+            return business, fetch(business)
+        except Exception as e:
+            print(f"   ⚠️  Could not fetch website for {business.get('name')}: {e}")
+            return business, ""
+
+    def generate_stage(job):
+        business, website_content = job
+        try:
+            subject, body = generate(business, website_content)
+            return business, (subject, body), None
+        except Exception as e:
+            return business, None, e
+
+    def read():
+        try:
+            for business in businesses:
+                _put(to_fetch, business, stop)
+            for _ in range(fetch_workers):
+                _put(to_fetch, _DONE, stop)
+        except _Stopped:
+            pass
+        except Exception as e:
+            # Surface reader failures on the calling thread
+            try:
+                _put(results, e, stop)
+            except _Stopped:
+                pass
+
+    stages = [
+        _Stage("fetch", fetch_stage, fetch_workers, to_fetch, to_generate, generate_workers, stop),
+        _Stage("generate", generate_stage, generate_workers, to_generate, results, 1, stop),
+    ]
+    reader = threading.Thread(target=read, name="reader", daemon=True)
+
+    completed = 0
+    try:
+        reader.start()
+        for stage in stages:
+            stage.start()
+
+        while True:
+            item = results.get()
+            if item is _DONE:
+                return
+            if isinstance(item, Exception):
+                raise item
+
+            business, email, error = item
+            completed += 1
+
+            if error:
+                print(f"   ❌ Failed to generate email for {business.get('name')}: {error}")
+                if progress_callback:
+                    progress_callback(completed, total, business, error)
+                continue
+
+            if progress_callback:
+                progress_callback(completed, total, business, None)
+            yield business, email[0], email[1]
+    finally:
+        # Don't wait for outstanding fetches or calls if the caller stopped early
+        stop.set()
+        if session is not None:
+            session.close()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Precompiled email prompts
+
+business_type and automation_focus are the same for every business in a
+campaign, so each strategy's prompt is rendered once per campaign with
+placeholder markers for the per-business fields and split into literal
+pieces at those markers. Building the prompt for a business is then just
+joining the pieces with its name and website text. Compiled prompts are
+byte-for-byte identical to the build_*_prompt functions, so email cache
+keys don't change.
+"""
+
+import os
+import sys
+import threading
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import MAX_WEBSITE_CONTEXT_LENGTH
+
+# Markers that can't appear in real prompt text
+NAME_MARKER = "\x00business_name\x00"
+WEBSITE_MARKER = "\x00website_content\x00"
+
+
+def _split(text):
+    """
+    Split a rendered prompt at the business name markers
+
+    Args:
+        text: Prompt rendered with NAME_MARKER for the business name
+
+    Returns:
+        list: Literal text between the markers
+    """
+    return text.split(NAME_MARKER)
+
+
+class PromptTemplate:
+    """A strategy prompt with only the per-business fields left to fill in"""
+
+    def __init__(self, build, *campaign_args):
+        """
+        Compile a prompt builder for one campaign
+
+        Args:
+            build: Callable(business_name, business_type, website_content, ...)
+                returning the full prompt
+            campaign_args: Arguments after website_content that are fixed
+                for the campaign (e.g. automation_focus)
+        """
+        business_type = campaign_args[0]
+        extra = campaign_args[1:]
+
+        # Website context is a whole block that disappears when empty,
+        # so compile one variant with it (split around the website text)
+        # and one without
+        before, after = build(NAME_MARKER, business_type, WEBSITE_MARKER, *extra).split(WEBSITE_MARKER)
+        self._before_website = _split(before)
+        self._after_website = _split(after)
+        self._without_website = _split(build(NAME_MARKER, business_type, "", *extra))
+
+    def render(self, business_name, website_content=""):
+        """
+        Build the prompt for one business
+
+        Args:
+            business_name: Name of the business
+            website_content: Scraped website content (optional)
+
+        Returns:
+            str: Prompt text sent to Gemini
+        """
+        # The business name is the separator between the literal pieces
+        if not website_content:
+            return business_name.join(self._without_website)
+
+        return (business_name.join(self._before_website)
+                + website_content[:MAX_WEBSITE_CONTEXT_LENGTH]
+                + business_name.join(self._after_website))
+
+
+_templates = {}
+_templates_lock = threading.Lock()
+
+
+def get_prompt_template(build, *campaign_args):
+    """
+    Get the compiled prompt for a builder and campaign, compiling on first use
+
+    Args:
+        build: Prompt builder (e.g. build_specific_prompt)
+        campaign_args: business_type followed by any other campaign-wide
+            arguments of the builder
+
+    Returns:
+        PromptTemplate
+    """
+    key = (build, campaign_args)
+    template = _templates.get(key)
+    if template is None:
+        with _templates_lock:
+            template = _templates.get(key)
+            if template is None:
+                template = _templates[key] = PromptTemplate(build, *campaign_args)
+    return template
+
+
+def clear_prompt_templates():
+    """Drop all compiled prompts"""
+    with _templates_lock:
+        _templates.clear()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Rate limiting for Gemini API calls
+
+A token bucket for requests per minute and another for tokens per minute are
+shared by every worker thread. When Gemini answers 429 / RESOURCE_EXHAUSTED,
+all workers pause, the pause grows on repeated 429s, and the request rate is
+halved; successful calls slowly bring the rate back to the configured limit.
+"""
+
+import os
+import re
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    MAX_TOKENS, GEMINI_RPM_LIMIT, GEMINI_TPM_LIMIT,
+    GEMINI_BACKOFF_INITIAL, GEMINI_BACKOFF_MAX
+)
+
+RETRY_DELAY_PATTERN = re.compile(r"retry(?:Delay'?\"?:\s*['\"]?| in )([\d.]+)s", re.IGNORECASE)
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously"""
+
+    def __init__(self, per_minute, capacity=None):
+        """
+        Initialize bucket (starts full)
+
+        Args:
+            per_minute: Tokens added per minute
+            capacity: Maximum burst size (default: one minute's worth)
+        """
+        self.capacity = capacity or per_minute
+        self.rate = per_minute / 60.0
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount=1):
+        """
+        Take tokens, waiting until enough are available
+
+        Requests larger than the capacity wait for a full bucket instead of
+        blocking forever.
+
+        Args:
+            amount: Tokens to take
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        amount = min(amount, self.capacity)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                delay = (amount - self._tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def adjust(self, amount):
+        """
+        Take (positive) or return (negative) tokens without waiting
+
+        Used to correct an estimate once the real cost is known; the balance
+        may go negative, which delays later callers.
+
+        Args:
+            amount: Tokens to take
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+    def set_rate(self, per_minute):
+        """Change the refill rate"""
+        with self._lock:
+            self._refill()
+            self.rate = per_minute / 60.0
+
+
+class GeminiRateLimiter:
+    """Requests- and tokens-per-minute limiter with adaptive 429 backoff"""
+
+    def __init__(self, rpm=GEMINI_RPM_LIMIT, tpm=GEMINI_TPM_LIMIT,
+                 backoff_initial=GEMINI_BACKOFF_INITIAL, backoff_max=GEMINI_BACKOFF_MAX):
+        """
+        Initialize limiter
+
+        Args:
+            rpm: Requests per minute
+            tpm: Tokens (prompt + output) per minute
+            backoff_initial: Seconds to pause after the first 429
+            backoff_max: Longest pause after repeated 429s
+        """
+        self.rpm = rpm
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.backoff_initial = backoff_initial
+        self.backoff_max = backoff_max
+        self.current_rpm = float(rpm)
+        self.rate_limited = 0
+
+        self._backoff = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, estimated_tokens):
+        """
+        Wait for a request slot and token budget
+
+        Args:
+            estimated_tokens: Expected prompt + output tokens
+        """
+        while True:
+            with self._lock:
+                pause = self._paused_until - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+
+        self.requests.acquire(1)
+        self.tokens.acquire(estimated_tokens)
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """
+        Correct the token budget once the real usage is known
+
+        Args:
+            estimated_tokens: Tokens taken by acquire()
+            actual_tokens: Tokens reported by the API (None if unknown)
+        """
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    def on_success(self):
+        """Shrink the backoff and raise the request rate back toward the limit"""
+        with self._lock:
+            self._backoff = self._backoff / 2 if self._backoff > self.backoff_initial else 0.0
+            if self.current_rpm < self.rpm:
+                self.current_rpm = min(self.rpm, self.current_rpm + self.rpm / 20)
+                self.requests.set_rate(self.current_rpm)
+
+    def on_rate_limited(self, retry_after=None):
+        """
+        Pause every worker and halve the request rate after a 429
+
+        Args:
+            retry_after: Seconds the API asked us to wait, if given
+        """
+        with self._lock:
+            self.rate_limited += 1
+            self._backoff = min(self.backoff_max, self._backoff * 2 or self.backoff_initial)
+            pause = max(self._backoff, retry_after or 0)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+
+            self.current_rpm = max(1.0, self.current_rpm / 2)
+            self.requests.set_rate(self.current_rpm)
+
+        print(f"   ⏳ Gemini rate limit hit, pausing {pause:.0f}s "
+              f"(now {self.current_rpm:.0f} requests/min)")
+
+
+def estimate_tokens(prompt):
+    """
+    Rough token cost of a request before it is sent
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        int: Prompt tokens (about 4 characters each) plus the output budget
+    """
+    return len(prompt) // 4 + MAX_TOKENS
+
+
+def is_rate_limit_error(error):
+    """
+    Check whether an API error is a 429 / quota error
+
+    Args:
+        error: Exception raised by the Gemini client
+
+    Returns:
+        bool
+    """
+    for attr in ('code', 'status_code'):
+        if getattr(error, attr, None) == 429:
+            return True
+    message = str(error)
+    return '429' in message or 'RESOURCE_EXHAUSTED' in message or 'ResourceExhausted' in type(error).__name__
+
+
+def retry_after_seconds(error):
+    """
+    Extract the suggested retry delay from a 429 error message
+
+    Args:
+        error: Exception raised by the Gemini client
+
+    Returns:
+        float or None
+    """
+    match = RETRY_DELAY_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def response_tokens(response):
+    """Total tokens reported in a Gemini response, if available"""
+    usage = getattr(response, 'usage_metadata', None)
+    total = getattr(usage, 'total_token_count', None)
+    return total if isinstance(total, int) else None
+
+
+class _Usage:
+    """Collects the response of a rate-limited call"""
+
+    def __init__(self):
+        self.response = None
+
+    def record(self, response):
+        self.response = response
+
+
+@contextmanager
+def rate_limited(limiter, prompt):
+    """
+    Wrap one Gemini call with a limiter
+
+    Usage:
+        with rate_limited(limiter, prompt) as usage:
+            response = client.models.generate_content(...)
+            usage.record(response)
+
+    Args:
+        limiter: GeminiRateLimiter, or None to call without limiting
+        prompt: Prompt text (used to estimate the token cost)
+
+    Yields:
+        object with record(response)
+    """
+    usage = _Usage()
+    if limiter is None:
+        yield usage
+        return
+
+    estimated = estimate_tokens(prompt)
+    limiter.acquire(estimated)
+    try:
+        yield usage
+    except Exception as e:
+        if is_rate_limit_error(e):
+            limiter.on_rate_limited(retry_after_seconds(e))
+        raise
+
+    limiter.on_success()
+    limiter.record_usage(estimated, response_tokens(usage.response))
+
+
+_limiters = {}
+_limiter_lock = threading.Lock()
+
+
+def get_gemini_limiter(api_key=None):
+    """
+    Get the shared Gemini rate limiter for an API key
+
+    Quotas are per key, so each key gets its own limiter; None selects the
+    limiter for the key in the environment.
+
+    Args:
+        api_key: Gemini API key, or None
+
+    Returns:
+        GeminiRateLimiter
+    """
+    with _limiter_lock:
+        if api_key not in _limiters:
+            _limiters[api_key] = GeminiRateLimiter()
+        return _limiters[api_key]
@@ -3,58 +3,294 @@
 Scrape business website content
 """
 
+import os
+import sys
+import time
+import codecs
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from bs4 import BeautifulSoup
+import urllib3
+from requests.adapters import HTTPAdapter
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    SCRAPE_TIMEOUT, SCRAPE_MAX_WORKERS, SCRAPE_PER_HOST_LIMIT, WEBSITE_TEXT_LENGTH,
+    SCRAPE_DEADLINE, SCRAPE_MAX_BYTES, SCRAPE_CHUNK_SIZE
+)
+from tools.html_extract import extract_text, detect_encoding
+from tools.website_cache import get_website_cache, normalize_url
 
-def scrape_website(url):
+# Set user agent to avoid blocking
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+# Content types worth downloading; anything else is skipped before the body
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml', 'text/plain')
+
+
+def create_session(per_host_limit=SCRAPE_PER_HOST_LIMIT, max_hosts=SCRAPE_MAX_WORKERS * 4):
+    """
+    Create a pooled HTTP session for scraping many websites
+
+    Args:
+        per_host_limit: Maximum open connections to any single host
+        max_hosts: Number of per-host connection pools to keep alive
+
+    Returns:
+        requests.Session
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    # pool_block makes the per-host limit a hard cap instead of a hint
+    adapter = HTTPAdapter(
+        pool_connections=max_hosts,
+        pool_maxsize=per_host_limit,
+        pool_block=True
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def is_html_response(response):
+    """
+    Check the Content-Type header before downloading the body
+
+    Responses without a Content-Type are assumed to be HTML.
+
+    Args:
+        response: Streamed requests.Response
+
+    Returns:
+        bool: True if the body looks like a web page
+    """
+    content_type = response.headers.get('Content-Type')
+    if not content_type:
+        return True
+    return content_type.split(';')[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def read_chunks(response, deadline=None):
+    """
+    Yield a streamed response body as it arrives, never reading past a deadline
+
+    iter_content() only returns once a whole chunk has arrived and its read
+    timeout restarts with every packet, so a server trickling a few bytes at
+    a time could hold it open indefinitely. With a deadline, each read takes
+    whatever has arrived (at most one socket read) under a timeout of the
+    time left, and the deadline is checked in between. urllib3 1.x has no
+    read1(), so there a read waits for a full chunk and the deadline is
+    only as tight as the read timeout.
+
+    Args:
+        response: Streamed requests.Response
+        deadline: time.monotonic() value after which reading stops
+
+    Yields:
+        bytes: Decoded body chunks
+    """
+    raw = response.raw
+    if deadline is None or not isinstance(raw, urllib3.response.HTTPResponse):
+        yield from response.iter_content(chunk_size=SCRAPE_CHUNK_SIZE)
+        return
+
+    read = getattr(raw, 'read1', None) or raw.read
+
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+
+        # The socket is only exposed while the connection stays open
+        sock = getattr(getattr(raw, 'connection', None), 'sock', None)
+        if sock is not None:
+            sock.settimeout(remaining)
+
+        try:
+            chunk = read(SCRAPE_CHUNK_SIZE, decode_content=True)
+        except (urllib3.exceptions.HTTPError, OSError):
+            if time.monotonic() >= deadline:
+                return
+            raise
+        if not chunk:
+            return
+        yield chunk
+
+
+def iter_html(response, max_bytes=SCRAPE_MAX_BYTES, deadline=None):
+    """
+    Read and decode a streamed response body chunk by chunk
+
+    Stops after max_bytes of body or once the deadline has passed, so huge
+    pages and never-ending or trickling streams can't hold up a scrape.
+
+    Args:
+        response: Streamed requests.Response
+        max_bytes: Maximum body bytes to read
+        deadline: time.monotonic() value after which reading stops
+
+    Yields:
+        str: Decoded HTML chunks
+    """
+    decoder = None
+    bytes_read = 0
+
+    for chunk in read_chunks(response, deadline):
+        if not chunk:
+            continue
+
+        chunk = chunk[:max_bytes - bytes_read]
+        bytes_read += len(chunk)
+
+        # Detect the charset from the header and the first chunk of the page
+        if decoder is None:
+            encoding = detect_encoding(response.headers.get('Content-Type'), chunk)
+            decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+
+        yield decoder.decode(chunk)
+
+        if bytes_read >= max_bytes:
+            break
+        if deadline is not None and time.monotonic() > deadline:
+            break
+
+    if decoder is not None:
+        yield decoder.decode(b'', final=True)
+
+
+def scrape_website(url, session=None, use_cache=True, cache=None):
     """
     Scrape a business website and extract key information
 
+    Results are kept in the persistent website cache; fresh entries are
+    returned without a request and stale ones are revalidated with a
+    conditional GET (If-None-Match / If-Modified-Since). If revalidation
+    fails, the stale text is returned. Pages cut short by the deadline are
+    returned but not cached.
+
+    The page is streamed: non-HTML responses are skipped before the body is
+    downloaded, at most SCRAPE_MAX_BYTES are read, and reading stops after
+    SCRAPE_DEADLINE seconds in total, however slowly the server sends.
+
     Args:
         url: Website URL
+        session: Optional requests.Session to reuse pooled connections
+        use_cache: Whether to read and update the website cache
+        cache: WebsiteCache to use (default: the shared cache)
 
     Returns:
-        str: Extracted text content (max 1000 chars)
+        str: Extracted text content (max WEBSITE_TEXT_LENGTH chars)
     """
+    entry = None
 
     try:
-        # Add http:// if not present
-        if not url.startswith(('http://', 'https://')):
-            url = 'https://' + url
+        # Add https:// if not present, and canonicalize for the cache key
+        url = normalize_url(url)
 
-        # Set user agent to avoid blocking
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
+        if use_cache and cache is None:
+            cache = get_website_cache()
+
+        entry = cache.get(url) if use_cache else None
+        if entry and entry.fresh:
+            return entry.text
 
-        # Fetch the page
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
+        headers = dict(HEADERS)
+        if entry:
+            if entry.etag:
+                headers['If-None-Match'] = entry.etag
+            if entry.last_modified:
+                headers['If-Modified-Since'] = entry.last_modified
 
-        # Parse HTML (using built-in html.parser)
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Fetch the page headers; the body is read below
+        deadline = time.monotonic() + SCRAPE_DEADLINE
+        client = session or requests
+        timeout = (SCRAPE_TIMEOUT, min(SCRAPE_TIMEOUT, SCRAPE_DEADLINE))
+        response = client.get(url, headers=headers, timeout=timeout, stream=True)
 
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer"]):
-            script.decompose()
+        # Always release the connection, even if the body was only partly read
+        with response:
+            if entry and response.status_code == 304:
+                cache.touch(url)
+                return entry.text
 
-        # Get text
-        text = soup.get_text()
+            response.raise_for_status()
 
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
+            if not is_html_response(response):
+                raise ValueError(f"Not a web page ({response.headers.get('Content-Type')})")
 
-        # Limit to 1000 characters
-        return text[:1000]
+            # Extract visible text (streaming parser stops once it has enough)
+            html = iter_html(response, deadline=deadline)
+            text = extract_text(html, max_chars=WEBSITE_TEXT_LENGTH)
+            truncated = time.monotonic() >= deadline
+
+        if use_cache and not truncated:
+            cache.store(
+                url, text,
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified')
+            )
+
+        return text
 
     except Exception as e:
+        if entry:
+            print(f"   ⚠️  Could not refresh website ({str(e)}), using cached copy")
+            return entry.text
         print(f"   ⚠️  Could not scrape website: {str(e)}")
         return ""
 
 
+def prefetch_websites(businesses, max_workers=SCRAPE_MAX_WORKERS,
+                      per_host_limit=SCRAPE_PER_HOST_LIMIT, session=None):
+    """
+    Scrape the websites of many businesses concurrently
+
+    Results are yielded as soon as each site finishes, so callers can start
+    working on fast sites while slow ones are still loading. Businesses
+    without a website are yielded first with empty content.
+
+    Args:
+        businesses: List of business dictionaries with optional 'website'
+        max_workers: Number of websites fetched at the same time
+        per_host_limit: Maximum open connections to any single host
+        session: Optional pooled session (default: create_session())
+
+    Yields:
+        tuple: (business, website_content)
+    """
+
+    with_website = []
+    for business in businesses:
+        if business.get('website'):
+            with_website.append(business)
+        else:
+            yield business, ""
+
+    if not with_website:
+        return
+
+    owns_session = session is None
+    if owns_session:
+        session = create_session(per_host_limit=per_host_limit)
+
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {
+            executor.submit(scrape_website, business['website'], session): business
+            for business in with_website
+        }
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        # Don't wait for outstanding fetches if the caller stopped early
+        executor.shutdown(wait=False, cancel_futures=True)
+        if owns_session:
+            session.close()
+
+
 def test_scrape_website():
     """Test function"""
     url = "https://example.com"
@@ -1,24 +1,42 @@
 #!/usr/bin/env python3
 """
 Send approved emails via Gmail with optimized SMTP connection reuse
+
+Emails go out over a small pool of connections (send_engine.py), paced by a
+global per-minute / per-day governor instead of a fixed sleep per email.
 """
 
 import os
+import re
 import sys
-import smtplib
 import time
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+import smtplib
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from constants import RATE_LIMIT_DELAY, STATUS_APPROVED, STATUS_SENT, COL_STATUS
+from constants import (
+    STATUS_APPROVED, STATUS_SENT,
+    EMAIL_RETRY_ATTEMPTS, EMAIL_RETRY_DELAY, EMAIL_RETRY_MAX_DELAY,
+    SMTP_TIMEOUT, SMTP_HEALTH_CHECK_IDLE,
+    SEND_STATUS_BATCH_SIZE, SEND_STATUS_FLUSH_INTERVAL,
+    COL_BUSINESS_NAME, COL_LOCATION, COL_EMAIL, COL_GENERATED_SUBJECT, COL_GENERATED_BODY, COL_DATE_SENT
+)
 from tools.upload_to_sheets import get_sheets_service
+from tools.sheet_snapshot import get_sheet_snapshot, invalidate_sheet_snapshot
+from tools.sheet_writer import BatchSheetWriter
+from tools.domain_store import get_domain_store
+from tools.send_engine import SendEngine, SendGovernor, SendInDoubt
+from tools.send_ledger import get_send_ledger, send_key, SENDING
+from tools.message_factory import MessageFactory
 
 load_dotenv()
 
+# Refusal texts meaning the recipient's domain, not just the mailbox, is bad
+# (5.1.2 is "bad destination system address")
+DOMAIN_REFUSAL_MARKERS = ('5.1.2', 'domain not found', 'no such domain', 'domain does not exist')
+
 
 def validate_gmail_credentials():
     """
@@ -42,82 +60,257 @@ def validate_gmail_credentials():
     return gmail_address, gmail_password
 
 
-def get_approved_businesses():
+def approved_businesses(snapshot):
+    """
+    Approved rows of a sheet snapshot that are ready to send
+
+    Args:
+        snapshot: SheetSnapshot
+
+    Returns:
+        list: Business dicts with row_number, name, location, email, subject
+            and body
+    """
+    approved = snapshot.businesses(STATUS_APPROVED, {
+        'name': COL_BUSINESS_NAME,
+        'location': COL_LOCATION,
+        'email': COL_EMAIL,
+        'subject': COL_GENERATED_SUBJECT,
+        'body': COL_GENERATED_BODY,
+    })
+
+    # Only include if email, subject, and body exist
+    return [
+        business for business in approved
+        if business['email'] and business['subject'] and business['body']
+    ]
+
+
+def get_approved_businesses(refresh=False):
     """Get all businesses with Status = 'Approved'"""
 
     try:
-        service = get_sheets_service()
-        spreadsheet_id = os.getenv('GOOGLE_SPREADSHEET_ID')
+        return approved_businesses(get_sheet_snapshot(refresh=refresh))
 
-        if not spreadsheet_id:
-            raise ValueError("GOOGLE_SPREADSHEET_ID not set in .env")
+    except Exception as error:
+        print(f"❌ Error getting approved businesses: {error}")
+        return []
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range='A2:N'
-        ).execute()
 
-        rows = result.get('values', [])
+def recent_send_times(snapshot):
+    """
+    Times of the sends recorded in the sheet's Date Sent column
 
-        approved_businesses = []
-        for i, row in enumerate(rows, start=2):
-            while len(row) < 14:
-                row.append('')
+    Args:
+        snapshot: SheetSnapshot
 
-            status = row[COL_STATUS] if len(row) > COL_STATUS else ''
+    Returns:
+        list: time.time() values, so the daily cap counts earlier runs
+    """
+    times = []
+    for value in snapshot.columns[COL_DATE_SENT]:
+        try:
+            times.append(datetime.strptime(value.strip(), "%Y-%m-%d %H:%M:%S").timestamp())
+        except ValueError:
+            continue
+    return times
 
-            if status.lower() == STATUS_APPROVED.lower():
-                business = {
-                    'row_number': i,
-                    'name': row[0],
-                    'email': row[2],
-                    'subject': row[6],
-                    'body': row[7]
-                }
 
-                # Only include if email, subject, and body exist
-                if business['email'] and business['subject'] and business['body']:
-                    approved_businesses.append(business)
+def is_connection_error(error):
+    """
+    Check whether a send failed because the SMTP session is gone
 
-        return approved_businesses
+    Args:
+        error: Exception raised while sending
 
-    except Exception as error:
-        print(f"❌ Error getting approved businesses: {error}")
-        return []
+    Returns:
+        bool: True for disconnects, socket errors and 421 "service closing"
+            replies, which are worth a reconnect and retry
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    if isinstance(error, smtplib.SMTPResponseException):
+        return error.smtp_code == 421
+    # SMTPException subclasses OSError; plain OSErrors are socket failures
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
 
 
 class SMTPConnectionManager:
-    """Context manager for SMTP connection with connection reuse"""
+    """
+    Context manager for SMTP connection with connection reuse
+
+    Dropped connections are re-established transparently: a connection idle
+    for SMTP_HEALTH_CHECK_IDLE seconds is checked with NOOP before the next
+    send, and a send that fails because the session is gone is retried on a
+    fresh, re-authenticated connection with exponential backoff. Only sends
+    that failed before the message was handed over are retried; once the
+    whole message is out, a lost reply raises SendInDoubt instead, since the
+    server may already have queued it.
+    """
 
-    def __init__(self, gmail_address, gmail_password):
+    def __init__(self, gmail_address, gmail_password, host='smtp.gmail.com', port=587,
+                 retry_attempts=EMAIL_RETRY_ATTEMPTS, retry_delay=EMAIL_RETRY_DELAY,
+                 max_retry_delay=EMAIL_RETRY_MAX_DELAY, health_check_idle=SMTP_HEALTH_CHECK_IDLE):
+        """
+        Initialize connection manager
+
+        Args:
+            gmail_address: Gmail address to log in as
+            gmail_password: Gmail App Password
+            host: SMTP server
+            port: SMTP submission port (STARTTLS)
+            retry_attempts: Reconnect-and-retry attempts per message
+            retry_delay: Seconds before the first retry (doubles each attempt)
+            max_retry_delay: Longest wait between retries
+            health_check_idle: Idle seconds before a NOOP check
+        """
         self.gmail_address = gmail_address
         self.gmail_password = gmail_password
+        self.host = host
+        self.port = port
+        self.retry_attempts = retry_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.health_check_idle = health_check_idle
         self.server = None
+        self.reconnects = 0
+        self.messages = MessageFactory(gmail_address)
 
-    def __enter__(self):
-        """Establish SMTP connection"""
+        self._opened = False
+        self._last_used = time.monotonic()
+
+    def connect(self):
+        """
+        Open and authenticate a new connection, replacing any current one
+
+        Raises:
+            ValueError: If Gmail rejects the credentials
+            ConnectionError: If the server can't be reached
+        """
+        self.close()
         try:
-            self.server = smtplib.SMTP('smtp.gmail.com', 587)
+            self.server = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
             self.server.starttls()
             self.server.login(self.gmail_address, self.gmail_password)
-            print("✅ Connected to Gmail SMTP server")
-            return self
         except smtplib.SMTPAuthenticationError:
+            self.server = None
             raise ValueError(
                 f"Authentication failed for {self.gmail_address}. "
                 "Check your Gmail App Password in .env"
             )
-        except smtplib.SMTPException as e:
+        except (smtplib.SMTPException, OSError) as e:
+            self.server = None
             raise ConnectionError(f"Failed to connect to Gmail SMTP: {e}")
 
+        self._opened = True
+        self._last_used = time.monotonic()
+
+    def __enter__(self):
+        """Establish SMTP connection"""
+        self.connect()
+        print("✅ Connected to Gmail SMTP server")
+        return self
+
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Close SMTP connection"""
+        if self.server:
+            self.close()
+            print("✅ Disconnected from Gmail SMTP server")
+        self._opened = False
+
+    def close(self):
+        """Close the current connection, ignoring errors from a dead socket"""
         if self.server:
             try:
                 self.server.quit()
-                print("✅ Disconnected from Gmail SMTP server")
             except:
                 pass  # Already disconnected
+            self.server = None
+
+    def is_alive(self):
+        """
+        Check the connection with NOOP
+
+        Returns:
+            bool: True if the server answered 250
+        """
+        if not self.server:
+            return False
+        try:
+            return self.server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def ensure_connected(self):
+        """Reconnect if there is no connection, or an idle one has died"""
+        idle = time.monotonic() - self._last_used
+        if self.server is None or (idle >= self.health_check_idle and not self.is_alive()):
+            self.reconnects += 1
+            print("   🔄 Reconnecting to Gmail SMTP server...")
+            self.connect()
+
+    def _reset(self, code):
+        """Abandon the current transaction after an error reply"""
+        if code == 421:
+            # Server is closing the session
+            self.close()
+            return
+        try:
+            self.server.rset()
+        except (smtplib.SMTPException, OSError):
+            self.close()
+
+    def _transmit(self, to_email, message):
+        """
+        Run one SMTP transaction a stage at a time
+
+        Mirrors smtplib's sendmail(), but keeps the final reply separate so a
+        disconnect after the message was sent can be told apart from one
+        before it.
+
+        Args:
+            to_email: Recipient email address
+            message: Rendered message bytes
+
+        Raises:
+            SendInDoubt: If the connection dropped while waiting for the
+                reply to the complete message
+            smtplib.SMTPException / OSError: If the transaction failed before
+                the message was handed over
+        """
+        server = self.server
+        server.ehlo_or_helo_if_needed()
+
+        code, reply = server.mail(self.gmail_address)
+        if code != 250:
+            self._reset(code)
+            raise smtplib.SMTPSenderRefused(code, reply, self.gmail_address)
+
+        code, reply = server.rcpt(to_email)
+        if code not in (250, 251):
+            self._reset(code)
+            raise smtplib.SMTPRecipientsRefused({to_email: (code, reply)})
+
+        code, reply = server.docmd('data')
+        if code != 354:
+            self._reset(code)
+            raise smtplib.SMTPDataError(code, reply)
+
+        # Dot-stuff lines starting with '.', then end the message with <CRLF>.<CRLF>
+        data = re.sub(br'(?m)^\.', b'..', message)
+        if not data.endswith(b'\r\n'):
+            data += b'\r\n'
+        # A failure here leaves the message unterminated, so the server drops it
+        server.send(data + b'.\r\n')
+
+        try:
+            code, reply = server.getreply()
+        except (smtplib.SMTPException, OSError) as error:
+            self.close()
+            raise SendInDoubt(f"Connection lost after sending to {to_email}: {error}")
+        if code != 250:
+            self._reset(code)
+            raise smtplib.SMTPDataError(code, reply)
 
     def send_email(self, to_email, subject, body):
         """
@@ -130,53 +323,136 @@ class SMTPConnectionManager:
 
         Returns:
             bool: True if sent successfully, False otherwise
+
+        Raises:
+            ValueError: If re-authentication fails after a reconnect
+            SendInDoubt: If the connection dropped after the message was sent
+                (it may have been delivered, so it is not retried)
+            ConnectionError: If the connection can't be restored within
+                retry_attempts (the message was not sent)
         """
-        if not self.server:
+        if not self.server and not self._opened:
             raise RuntimeError("SMTP connection not established")
 
-        try:
-            # Create message
-            msg = MIMEMultipart()
-            msg['From'] = self.gmail_address
-            msg['To'] = to_email
-            msg['Subject'] = subject
-            msg.attach(MIMEText(body, 'plain'))
-
-            # Send using existing connection
-            self.server.send_message(msg)
-            return True
-
-        except smtplib.SMTPRecipientsRefused:
-            print(f"   ❌ Invalid email address: {to_email}")
-            return False
-        except smtplib.SMTPSenderRefused:
-            print(f"   ❌ Sender refused by server")
-            return False
-        except smtplib.SMTPDataError as e:
-            print(f"   ❌ SMTP data error: {e}")
-            return False
-        except Exception as error:
-            print(f"   ❌ Error sending to {to_email}: {error}")
-            return False
+        # Rendered once; a retry resends the same bytes
+        message = self.messages.render(to_email, subject, body)
+
+        attempt = 0
+        while True:
+            try:
+                # Send using existing connection
+                self.ensure_connected()
+                self._transmit(to_email, message)
+                self._last_used = time.monotonic()
+                # Gmail accepting the message for relay says nothing about
+                # the recipient's server, so it isn't counted as delivered
+                return True
+
+            except smtplib.SMTPRecipientsRefused as error:
+                print(f"   ❌ Invalid email address: {to_email}")
+                record_refusal(to_email, error.recipients.get(to_email))
+                return False
+            except smtplib.SMTPSenderRefused:
+                print(f"   ❌ Sender refused by server")
+                return False
+            except (ValueError, SendInDoubt):
+                raise
+            except Exception as error:
+                if isinstance(error, smtplib.SMTPDataError) and not is_connection_error(error):
+                    print(f"   ❌ SMTP data error: {error}")
+                    return False
+                if not is_connection_error(error):
+                    print(f"   ❌ Error sending to {to_email}: {error}")
+                    return False
+
+                if attempt >= self.retry_attempts:
+                    self.close()
+                    raise ConnectionError(
+                        f"Gmail SMTP connection lost and not restored after {attempt} retries: {error}"
+                    )
+
+                delay = min(self.retry_delay * 2 ** attempt, self.max_retry_delay)
+                attempt += 1
+                print(f"   ⚠️  Connection lost ({error}), retrying in {delay}s "
+                      f"({attempt}/{self.retry_attempts})...")
+                self.close()
+                time.sleep(delay)
+
+
+def record_refusal(to_email, reply=None):
+    """
+    Remember a refused recipient for future verification
+
+    The address itself is remembered; the refusal only counts against the
+    whole domain if the reply says the domain can't receive mail.
+
+    Args:
+        to_email: Recipient email address
+        reply: (code, message) the server refused the recipient with
+    """
+    email = to_email.strip().lower()
+    message = reply[1] if reply else b''
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', 'replace')
+
+    try:
+        store = get_domain_store()
+        store.record_bounce(email)
+        if any(marker in message.lower() for marker in DOMAIN_REFUSAL_MARKERS):
+            store.record_delivery(email.rsplit('@', 1)[-1], delivered=False)
+    except Exception as error:
+        print(f"   ⚠️  Could not record delivery outcome: {error}")
+
+
+def sent_status_update(row_number, success=True, sent_at=None):
+    """
+    Build the sheet update recording a send outcome
+
+    Args:
+        row_number: Row number in the sheet
+        success: Whether the email was sent
+        sent_at: time.time() of the send (default: now)
+
+    Returns:
+        tuple: (range_name, values)
+    """
+    if success:
+        # Update status to "Sent" and add date
+        sent = datetime.fromtimestamp(sent_at) if sent_at is not None else datetime.now()
+        now = sent.strftime("%Y-%m-%d %H:%M:%S")
+        range_name = f'J{row_number}:L{row_number}'
+        values = [[STATUS_SENT, '', now]]  # Status, Date Approved (keep blank), Date Sent
+    else:
+        # Keep as Approved if failed
+        range_name = f'I{row_number}'
+        values = [['❌ Send failed - check email address']]
+
+    return range_name, values
 
 
-def update_sent_status(row_number, success=True):
-    """Update sheet after sending email"""
+def update_sent_status(row_number, success=True, writer=None, sent_at=None):
+    """
+    Update sheet after sending email
+
+    Args:
+        row_number: Row number in the sheet
+        success: Whether the email was sent
+        writer: Optional BatchSheetWriter; when given the update is queued
+            and written with the next batch instead of immediately (tagged
+            with the row number for the writer's on_flush callback)
+        sent_at: time.time() of the send (default: now)
+    """
+
+    range_name, values = sent_status_update(row_number, success, sent_at)
+
+    if writer is not None:
+        writer.add_range(range_name, values, tag=row_number)
+        return
 
     try:
         service = get_sheets_service()
         spreadsheet_id = os.getenv('GOOGLE_SPREADSHEET_ID')
 
-        if success:
-            # Update status to "Sent" and add date
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            range_name = f'J{row_number}:L{row_number}'
-            values = [[STATUS_SENT, '', now]]  # Status, Date Approved (keep blank), Date Sent
-        else:
-            # Keep as Approved if failed
-            range_name = f'I{row_number}'
-            values = [['❌ Send failed - check email address']]
-
         service.spreadsheets().values().update(
             spreadsheetId=spreadsheet_id,
             range=range_name,
@@ -184,10 +460,60 @@ def update_sent_status(row_number, success=True):
             body={'values': values}
         ).execute()
 
+        invalidate_sheet_snapshot(spreadsheet_id)
+
     except Exception as error:
         print(f"   ⚠️  Could not update status: {error}")
 
 
+def reconcile_send_ledger(ledger, snapshot, businesses):
+    """
+    Settle earlier runs' sends before sending again
+
+    Sends the ledger saw accepted but the sheet never recorded (the run
+    stopped before its status write) are written back as Sent, and every
+    business the ledger already sent, or was interrupted sending, is left
+    out so nobody gets the same email twice.
+
+    Args:
+        ledger: SendLedger
+        snapshot: SheetSnapshot the businesses were read from
+        businesses: Approved business dicts
+
+    Returns:
+        list: Businesses that are safe to send
+    """
+    outstanding = ledger.reconcile(snapshot)
+    if outstanding:
+        print(f"\n🔁 Recording {len(outstanding)} emails sent by an earlier run that never reached the sheet")
+        with BatchSheetWriter(
+            batch_size=SEND_STATUS_BATCH_SIZE,
+            flush_interval=SEND_STATUS_FLUSH_INTERVAL,
+            on_flush=ledger.mark_recorded
+        ) as status_writer:
+            for entry in outstanding:
+                update_sent_status(entry.row_number, success=True, writer=status_writer, sent_at=entry.sent_at)
+
+    states = ledger.states(businesses)
+    unsent = []
+    in_doubt = []
+    for business in businesses:
+        state = states.get(send_key(business))
+        if state is None:
+            unsent.append(business)
+        elif state == SENDING:
+            in_doubt.append(business)
+
+    if in_doubt:
+        print(f"\n⚠️  {len(in_doubt)} emails were interrupted mid-send by an earlier run and may have arrived:")
+        for business in in_doubt:
+            print(f"  - {business['name']} ({business['email']})")
+        print("   They are held back. Check your Gmail Sent folder; to send one again,")
+        print("   edit its subject or body in the sheet.")
+
+    return unsent
+
+
 def send_approved_emails():
     """
     Main function to send all approved emails with optimized SMTP connection
@@ -204,7 +530,14 @@ def send_approved_emails():
         return 0
 
     print("\n🔍 Finding approved businesses...")
-    businesses = get_approved_businesses()
+    # Approvals are made by hand in the sheet, so never trust a cached copy here
+    businesses = get_approved_businesses(refresh=True)
+    snapshot = get_sheet_snapshot() if businesses else None
+
+    # Settle sends a crashed or interrupted run left behind
+    ledger = get_send_ledger()
+    if businesses:
+        businesses = reconcile_send_ledger(ledger, snapshot, businesses)
 
     if not businesses:
         print("❌ No approved businesses found")
@@ -223,37 +556,44 @@ def send_approved_emails():
         print("❌ Sending cancelled")
         return 0
 
-    # Send emails using connection reuse
+    # Sends already in the sheet from the last 24 hours count towards today's cap
+    governor = SendGovernor(sent_times=recent_send_times(snapshot))
+    if governor.sent_today():
+        print(f"\n📅 {governor.sent_today()}/{governor.per_day} emails already sent in the last 24 hours")
+
+    engine = SendEngine(
+        lambda: SMTPConnectionManager(gmail_address, gmail_password),
+        governor=governor,
+        ledger=ledger
+    )
+
     print(f"\n📤 Sending {len(businesses)} emails...")
     sent_count = 0
     failed_count = 0
 
     try:
-        # Establish ONE SMTP connection for all emails
-        with SMTPConnectionManager(gmail_address, gmail_password) as smtp:
-            for i, business in enumerate(businesses, 1):
-                print(f"\n[{i}/{len(businesses)}] Sending to: {business['name']}")
-
-                success = smtp.send_email(
-                    to_email=business['email'],
-                    subject=business['subject'],
-                    body=business['body']
-                )
-
+        # Send outcomes are journaled in memory and written back in batches,
+        # keeping the Sheets round trip off the per-email path; the ledger
+        # covers sends whose batch never gets written
+        with BatchSheetWriter(
+            batch_size=SEND_STATUS_BATCH_SIZE,
+            flush_interval=SEND_STATUS_FLUSH_INTERVAL,
+            on_flush=ledger.mark_recorded
+        ) as status_writer:
+            for i, (business, success) in enumerate(engine.run(businesses), 1):
                 if success:
-                    print(f"   ✅ Sent successfully")
-                    update_sent_status(business['row_number'], success=True)
+                    print(f"[{i}/{len(businesses)}] ✅ Sent to {business['name']}")
                     sent_count += 1
                 else:
-                    print(f"   ❌ Failed to send")
-                    update_sent_status(business['row_number'], success=False)
+                    print(f"[{i}/{len(businesses)}] ❌ Failed to send to {business['name']}")
                     failed_count += 1
 
-                # Rate limiting - wait between sends
-                if i < len(businesses):
-                    print(f"   ⏳ Waiting {RATE_LIMIT_DELAY} seconds...")
-                    time.sleep(RATE_LIMIT_DELAY)
+                update_sent_status(business['row_number'], success=success, writer=status_writer)
 
+    except SendInDoubt as e:
+        print(f"\n⚠️  {e}")
+        print("   It may have arrived, so it is held back and listed on the next run instead of resent")
+        return sent_count
     except (ValueError, ConnectionError) as e:
         print(f"\n❌ SMTP connection error: {e}")
         print("   Please check your Gmail credentials and try again")
@@ -265,6 +605,11 @@ def send_approved_emails():
     print("="*60)
     print(f"✅ Sent: {sent_count} emails")
     print(f"❌ Failed: {failed_count} emails")
+    if engine.skipped:
+        print(f"⏸️  Not sent (daily limit of {governor.per_day} reached): {len(engine.skipped)} emails")
+        print("   They stay Approved and go out on the next run")
+    if engine.duplicates:
+        print(f"🔁 Not sent (already sent by an earlier run): {len(engine.duplicates)} emails")
     print(f"📊 Total: {len(businesses)} emails")
 
     return sent_count
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Send many emails over a small pool of SMTP connections
+
+Each connection is driven by its own thread. Before every send, threads take
+a token from a shared SendGovernor, which spaces sends to the provider's
+per-minute quota, caps them per rolling day, and adds random jitter so
+sends don't go out in lockstep. Throughput is bounded by the quota, not by a
+fixed sleep between messages.
+"""
+
+import os
+import sys
+import time
+import queue
+import random
+import threading
+from collections import deque
+from contextlib import ExitStack
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import SMTP_POOL_SIZE, SEND_PER_MINUTE, SEND_BURST, SEND_PER_DAY, SEND_JITTER
+from tools.rate_limiter import TokenBucket
+
+DAY_SECONDS = 24 * 3600
+
+
+class DailyLimitReached(Exception):
+    """The per-day send quota is used up"""
+
+
+class SendInDoubt(ConnectionError):
+    """The connection dropped after the message was handed over, so it may have been delivered"""
+
+
+class SendGovernor:
+    """Global per-minute and per-day send limits shared by every connection"""
+
+    def __init__(self, per_minute=SEND_PER_MINUTE, per_day=SEND_PER_DAY,
+                 burst=SEND_BURST, jitter=SEND_JITTER, sent_times=()):
+        """
+        Initialize governor
+
+        Args:
+            per_minute: Sends per minute across all connections
+            per_day: Sends per rolling 24 hours
+            burst: Sends allowed back-to-back before pacing starts
+            jitter: Maximum random delay added before each send (seconds)
+            sent_times: time.time() of earlier sends in the last day, so
+                the daily cap holds across runs
+        """
+        self.per_day = per_day
+        self.jitter = jitter
+        self.minute = TokenBucket(per_minute, capacity=burst)
+
+        now = time.time()
+        self._day = deque(t for t in sorted(sent_times) if now - t < DAY_SECONDS)
+        self._day_lock = threading.Lock()
+
+    def sent_today(self):
+        """
+        Returns:
+            int: Sends counted in the last 24 hours
+        """
+        with self._day_lock:
+            self._expire(time.time())
+            return len(self._day)
+
+    def _expire(self, now):
+        while self._day and now - self._day[0] >= DAY_SECONDS:
+            self._day.popleft()
+
+    def acquire(self):
+        """
+        Wait for the next send slot
+
+        Returns:
+            float: Seconds spent waiting
+
+        Raises:
+            DailyLimitReached: If per_day sends were made in the last 24 hours
+        """
+        # Reserve a slot in the daily window first, so a full day doesn't
+        # also wait for a per-minute token
+        with self._day_lock:
+            now = time.time()
+            self._expire(now)
+            if len(self._day) >= self.per_day:
+                raise DailyLimitReached(f"{self.per_day} emails sent in the last 24 hours")
+            self._day.append(now)
+
+        waited = self.minute.acquire()
+        if self.jitter:
+            delay = random.uniform(0, self.jitter)
+            time.sleep(delay)
+            waited += delay
+        return waited
+
+
+class SendEngine:
+    """Sends emails over a pool of connections under a SendGovernor"""
+
+    def __init__(self, connect, connections=SMTP_POOL_SIZE, governor=None, ledger=None):
+        """
+        Initialize engine
+
+        Args:
+            connect: Callable returning a context manager whose value has
+                send_email(to_email, subject, body) -> bool (e.g.
+                SMTPConnectionManager)
+            connections: Number of connections to open
+            governor: SendGovernor (default: limits from constants)
+            ledger: Optional SendLedger; each send is claimed in it first
+                and skipped if an earlier run already sent (or was
+                interrupted sending) the same message. A send that raises
+                SendInDoubt keeps its claim
+        """
+        self.connect = connect
+        self.connections = connections
+        self.governor = governor or SendGovernor()
+        self.ledger = ledger
+        self.skipped = []
+        self.duplicates = []
+
+    def run(self, businesses):
+        """
+        Send an email to every business
+
+        Connections are opened before anything is sent, so authentication
+        errors surface straight away. Results are yielded in completion
+        order on the calling thread. Businesses left when the daily limit is
+        reached are not sent and are collected in self.skipped; businesses
+        the ledger refused are collected in self.duplicates.
+
+        Args:
+            businesses: List of dicts with 'email', 'subject' and 'body'
+
+        Yields:
+            tuple: (business, success)
+        """
+        self.skipped = []
+        self.duplicates = []
+        if not businesses:
+            return
+
+        todo = queue.Queue()
+        for business in businesses:
+            todo.put(business)
+        results = queue.Queue()
+        stop = threading.Event()
+
+        def work(smtp):
+            try:
+                while not stop.is_set():
+                    try:
+                        business = todo.get_nowait()
+                    except queue.Empty:
+                        break
+
+                    # Duplicates are weeded out before taking a send slot, so
+                    # they don't use up the rate or daily limit
+                    if self.ledger is not None and self.ledger.begin(business) is not None:
+                        results.put(('duplicate', business))
+                        continue
+
+                    try:
+                        self.governor.acquire()
+                    except DailyLimitReached:
+                        # Never sent, so the claim is released for a later run
+                        if self.ledger is not None:
+                            self.ledger.abort(business)
+                        stop.set()
+                        results.put(('skipped', business))
+                        break
+
+                    try:
+                        success = smtp.send_email(
+                            to_email=business['email'],
+                            subject=business['subject'],
+                            body=business['body']
+                        )
+                    except SendInDoubt:
+                        # The server may have queued it, so the claim stays
+                        # SENDING and a later run holds it back for review
+                        raise
+                    except Exception:
+                        # Failed before the message was handed over, so a
+                        # later run may retry
+                        if self.ledger is not None:
+                            self.ledger.abort(business)
+                        raise
+
+                    if self.ledger is not None:
+                        self.ledger.finish(business, success)
+                    results.put(('sent', (business, success)))
+            except Exception as e:
+                results.put(('error', e))
+            finally:
+                results.put(('done', None))
+
+        with ExitStack() as stack:
+            pool = [
+                stack.enter_context(self.connect())
+                for _ in range(min(self.connections, len(businesses)))
+            ]
+            threads = [
+                threading.Thread(target=work, args=(smtp,), name=f"smtp-{i + 1}", daemon=True)
+                for i, smtp in enumerate(pool)
+            ]
+            for thread in threads:
+                thread.start()
+
+            running = len(threads)
+            error = None
+            try:
+                while running:
+                    kind, item = results.get()
+                    if kind == 'done':
+                        running -= 1
+                    elif kind == 'sent':
+                        yield item
+                    elif kind == 'skipped':
+                        self.skipped.append(item)
+                    elif kind == 'duplicate':
+                        self.duplicates.append(item)
+                    elif error is None:
+                        error = item
+                        stop.set()
+            finally:
+                # Let in-flight sends finish before the connections close
+                stop.set()
+                for thread in threads:
+                    thread.join()
+
+            while True:
+                try:
+                    self.skipped.append(todo.get_nowait())
+                except queue.Empty:
+                    break
+
+            if error is not None:
+                raise error
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Write-ahead ledger of sends, so a crash or retry never emails anyone twice
+
+Every send is claimed in the ledger before it goes to the SMTP server and
+marked sent as soon as the server accepts it, so the ledger knows about a
+send before the sheet does. Entries are keyed by sheet row, recipient and a
+hash of the message. At startup the ledger is reconciled against the sheet
+snapshot the run already downloads (no extra Sheets reads): sends the sheet
+never heard about are written back as Sent instead of going out again, and
+sends interrupted mid-transfer are held back for the user to check.
+
+Changing the subject or body in the sheet changes the message hash, which
+releases a held-back row to be sent again.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import SEND_LEDGER_FILENAME, SHEET_FIRST_DATA_ROW, COL_EMAIL, COL_STATUS, STATUS_SENT
+
+DEFAULT_LEDGER_PATH = Path(__file__).parent.parent / ".tmp" / SEND_LEDGER_FILENAME
+
+# SQLite's default limit on ? parameters per statement is 999
+QUERY_CHUNK_SIZE = 500
+
+SENDING = 'sending'
+SENT = 'sent'
+
+LedgerEntry = namedtuple('LedgerEntry', ['row_number', 'email', 'message_hash', 'state', 'sent_at'])
+
+
+def message_hash(business):
+    """
+    Fingerprint of the email a business would receive
+
+    Args:
+        business: Dict with 'email', 'subject' and 'body'
+
+    Returns:
+        str: Hex SHA-256 of recipient, subject and body
+    """
+    message = '\0'.join((business['email'].strip().lower(), business['subject'], business['body']))
+    return hashlib.sha256(message.encode('utf-8')).hexdigest()
+
+
+def send_key(business):
+    """
+    Ledger key of a send
+
+    Args:
+        business: Dict with 'row_number', 'email', 'subject' and 'body'
+
+    Returns:
+        tuple: (row_number, email, message_hash)
+    """
+    return business['row_number'], business['email'].strip().lower(), message_hash(business)
+
+
+class SendLedger:
+    """SQLite-backed write-ahead record of every send attempt"""
+
+    def __init__(self, path=DEFAULT_LEDGER_PATH):
+        """
+        Open (or create) the ledger
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # Every claim and outcome must be on disk before the next step runs
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sends (
+                row_number INTEGER NOT NULL,
+                email TEXT NOT NULL,
+                message_hash TEXT NOT NULL,
+                state TEXT NOT NULL,
+                recorded INTEGER NOT NULL DEFAULT 0,
+                started_at REAL NOT NULL,
+                sent_at REAL,
+                PRIMARY KEY (row_number, email, message_hash)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def begin(self, business):
+        """
+        Claim a send before handing it to the SMTP server
+
+        Args:
+            business: Dict with 'row_number', 'email', 'subject' and 'body'
+
+        Returns:
+            str or None: None if the send is claimed and should go ahead, or
+                the state of an earlier attempt (SENT, or SENDING if it was
+                interrupted) if it must not be sent again
+        """
+        key = send_key(business)
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO sends (row_number, email, message_hash, state, started_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (*key, SENDING, time.time())
+            )
+            self._conn.commit()
+            if cursor.rowcount:
+                return None
+            return self._conn.execute(
+                "SELECT state FROM sends WHERE row_number = ? AND email = ? AND message_hash = ?",
+                key
+            ).fetchone()[0]
+
+    def finish(self, business, sent):
+        """
+        Record the outcome of a claimed send
+
+        Args:
+            business: The business passed to begin()
+            sent: True if the server accepted the email; False releases the
+                claim so a later run can try again
+        """
+        if not sent:
+            self.abort(business)
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sends SET state = ?, sent_at = ? "
+                "WHERE row_number = ? AND email = ? AND message_hash = ?",
+                (SENT, time.time(), *send_key(business))
+            )
+            self._conn.commit()
+
+    def abort(self, business):
+        """Release a claim whose email was never accepted by the server"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM sends WHERE row_number = ? AND email = ? AND message_hash = ? AND state = ?",
+                (*send_key(business), SENDING)
+            )
+            self._conn.commit()
+
+    def mark_recorded(self, row_numbers):
+        """
+        Note that the sheet now shows these rows' sends
+
+        Suitable as a BatchSheetWriter on_flush callback.
+
+        Args:
+            row_numbers: Rows whose Sent status was written
+        """
+        rows = [(row, SENT) for row in dict.fromkeys(row_numbers) if row is not None]
+        if not rows:
+            return
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE sends SET recorded = 1 WHERE row_number = ? AND state = ?",
+                rows
+            )
+            self._conn.commit()
+
+    def _entries(self, where, params=()):
+        with self._lock:
+            return [LedgerEntry(*row) for row in self._conn.execute(
+                "SELECT row_number, email, message_hash, state, sent_at FROM sends "
+                f"WHERE {where} ORDER BY row_number",
+                params
+            )]
+
+    def unrecorded(self):
+        """
+        Returns:
+            list: LedgerEntry for sends the sheet hasn't been told about
+        """
+        return self._entries("state = ? AND recorded = 0", (SENT,))
+
+    def in_doubt(self):
+        """
+        Returns:
+            list: LedgerEntry for sends interrupted before the server replied
+        """
+        return self._entries("state = ?", (SENDING,))
+
+    def states(self, businesses):
+        """
+        Look up many businesses at once
+
+        Args:
+            businesses: Dicts with 'row_number', 'email', 'subject' and 'body'
+
+        Returns:
+            dict: send_key -> state for the businesses in the ledger
+        """
+        keys = [send_key(business) for business in businesses]
+        rows = list(dict.fromkeys(key[0] for key in keys))
+        states = {}
+        with self._lock:
+            for start in range(0, len(rows), QUERY_CHUNK_SIZE):
+                chunk = rows[start:start + QUERY_CHUNK_SIZE]
+                for row_number, email, digest, state in self._conn.execute(
+                    "SELECT row_number, email, message_hash, state FROM sends "
+                    f"WHERE row_number IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ):
+                    states[(row_number, email, digest)] = state
+        return {key: states[key] for key in keys if key in states}
+
+    def reconcile(self, snapshot):
+        """
+        Match unrecorded sends against the sheet
+
+        Sends whose row already shows Sent for the same recipient are marked
+        recorded.
+
+        Args:
+            snapshot: SheetSnapshot downloaded at startup
+
+        Returns:
+            list: LedgerEntry for sends the sheet still needs to be told about
+        """
+        recorded = []
+        outstanding = []
+        for entry in self.unrecorded():
+            offset = entry.row_number - SHEET_FIRST_DATA_ROW
+            if not 0 <= offset < snapshot.row_count:
+                # The row is gone; nothing to write back to
+                recorded.append(entry.row_number)
+                continue
+            status = snapshot.value(offset, COL_STATUS).strip().lower()
+            email = snapshot.value(offset, COL_EMAIL).strip().lower()
+            if status == STATUS_SENT.lower() or email != entry.email:
+                recorded.append(entry.row_number)
+            else:
+                outstanding.append(entry)
+
+        self.mark_recorded(recorded)
+        return outstanding
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of entries per state, and sent but unrecorded
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT state, COUNT(*) FROM sends GROUP BY state"))
+            unrecorded = self._conn.execute(
+                "SELECT COUNT(*) FROM sends WHERE state = ? AND recorded = 0", (SENT,)
+            ).fetchone()[0]
+        return {
+            SENT: counts.get(SENT, 0),
+            SENDING: counts.get(SENDING, 0),
+            'unrecorded': unrecorded,
+        }
+
+    def clear(self):
+        """Forget every send"""
+        with self._lock:
+            self._conn.execute("DELETE FROM sends")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_ledger = None
+_ledger_lock = threading.Lock()
+
+
+def get_send_ledger():
+    """
+    Get the shared send ledger, opening it on first use
+
+    Returns:
+        SendLedger
+    """
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = SendLedger()
+        return _ledger
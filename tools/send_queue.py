@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Durable queue of scheduled sends
+
+Approved rows are queued with the delivery window they may go out in (the
+recipient's business hours, see timezones.py). The queue lives in SQLite
+under .tmp/, so scheduled sends survive restarts and the scheduler
+(send_scheduler.py) can run unattended.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import SEND_QUEUE_FILENAME
+from tools.timezones import timezone_for_location, delivery_window
+
+DEFAULT_QUEUE_PATH = Path(__file__).parent.parent / ".tmp" / SEND_QUEUE_FILENAME
+
+QUEUED = 'queued'
+SENT = 'sent'
+FAILED = 'failed'
+
+QueuedSend = namedtuple(
+    'QueuedSend',
+    ['row_number', 'name', 'email', 'subject', 'body', 'timezone', 'not_before', 'not_after']
+)
+
+COLUMNS = ', '.join(QueuedSend._fields)
+
+
+class SendQueue:
+    """SQLite-backed queue of emails waiting for their delivery window"""
+
+    def __init__(self, path=DEFAULT_QUEUE_PATH):
+        """
+        Open (or create) the queue
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = Path(path)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sends (
+                row_number INTEGER PRIMARY KEY,
+                name TEXT NOT NULL,
+                email TEXT NOT NULL,
+                subject TEXT NOT NULL,
+                body TEXT NOT NULL,
+                timezone TEXT NOT NULL,
+                not_before REAL NOT NULL,
+                not_after REAL NOT NULL,
+                status TEXT NOT NULL,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sends_due ON sends (status, not_before)"
+        )
+        self._conn.commit()
+
+    def enqueue(self, businesses, now=None):
+        """
+        Schedule approved businesses in their next delivery window
+
+        Rows already queued get the latest subject and body (they may have
+        been edited in the sheet) but keep their schedule. Rows the queue
+        has already sent or failed are scheduled again only if their
+        recipient, subject or body has changed since; an unchanged failed
+        row would just fail again.
+
+        Args:
+            businesses: Dicts with 'row_number', 'name', 'email', 'subject',
+                'body' and optionally 'location'
+            now: time.time() to schedule from (default: now)
+
+        Returns:
+            int: Number of newly queued rows
+        """
+        now = time.time() if now is None else now
+        rows = []
+        for business in businesses:
+            timezone = timezone_for_location(business.get('location', ''))
+            not_before, not_after = delivery_window(timezone, now)
+            rows.append((
+                business['row_number'], business['name'], business['email'],
+                business['subject'], business['body'], timezone,
+                not_before, not_after, QUEUED, now
+            ))
+        if not rows:
+            return 0
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO sends ({COLUMNS}, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            # Sent or failed rows whose message was edited since go out again
+            self._conn.executemany(
+                "UPDATE sends SET name = ?, email = ?, subject = ?, body = ?, timezone = ?, "
+                "not_before = ?, not_after = ?, status = ?, error = NULL, updated_at = ? "
+                "WHERE row_number = ? AND status != ? AND (email != ? OR subject != ? OR body != ?)",
+                [(*row[1:], row[0], QUEUED, row[2], row[3], row[4]) for row in rows]
+            )
+            added = self._conn.total_changes - before
+            self._conn.executemany(
+                "UPDATE sends SET name = ?, email = ?, subject = ?, body = ?, updated_at = ? "
+                "WHERE row_number = ? AND status = ?",
+                [(row[1], row[2], row[3], row[4], now, row[0], QUEUED) for row in rows]
+            )
+            self._conn.commit()
+        return added
+
+    def due(self, now=None, limit=None):
+        """
+        Queued sends whose delivery window is open
+
+        Args:
+            now: time.time() (default: now)
+            limit: Most sends to return
+
+        Returns:
+            list: QueuedSend tuples, earliest window first
+        """
+        now = time.time() if now is None else now
+        query = (
+            f"SELECT {COLUMNS} FROM sends WHERE status = ? AND not_before <= ? AND not_after > ? "
+            "ORDER BY not_before, row_number"
+        )
+        params = [QUEUED, now, now]
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            return [QueuedSend(*row) for row in self._conn.execute(query, params)]
+
+    def pending(self):
+        """
+        Every queued send, due or not
+
+        Returns:
+            list: QueuedSend tuples, earliest window first
+        """
+        with self._lock:
+            return [QueuedSend(*row) for row in self._conn.execute(
+                f"SELECT {COLUMNS} FROM sends WHERE status = ? ORDER BY not_before, row_number",
+                (QUEUED,)
+            )]
+
+    def reschedule_missed(self, now=None):
+        """
+        Move queued sends whose window closed unsent to their next window
+
+        Args:
+            now: time.time() (default: now)
+
+        Returns:
+            int: Number of sends rescheduled
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            missed = self._conn.execute(
+                "SELECT row_number, timezone FROM sends WHERE status = ? AND not_after <= ?",
+                (QUEUED, now)
+            ).fetchall()
+            self._conn.executemany(
+                "UPDATE sends SET not_before = ?, not_after = ?, updated_at = ? WHERE row_number = ?",
+                [(*delivery_window(timezone, now), now, row_number) for row_number, timezone in missed]
+            )
+            self._conn.commit()
+        return len(missed)
+
+    def mark_sent(self, row_number):
+        """Record that a queued email was sent"""
+        self._set_status(row_number, SENT, None)
+
+    def mark_failed(self, row_number, error):
+        """Record that a queued email was refused and won't be retried"""
+        self._set_status(row_number, FAILED, error)
+
+    def _set_status(self, row_number, status, error):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE sends SET status = ?, error = ?, updated_at = ? WHERE row_number = ?",
+                (status, error, time.time(), row_number)
+            )
+            self._conn.commit()
+
+    def retain(self, row_numbers):
+        """
+        Drop sends whose rows are no longer approved
+
+        Sent and failed rows are forgotten too, so approving a row again
+        later schedules it afresh.
+
+        Args:
+            row_numbers: Rows currently approved in the sheet
+
+        Returns:
+            int: Number of queued sends dropped
+        """
+        keep = set(row_numbers)
+        with self._lock:
+            statuses = dict(self._conn.execute("SELECT row_number, status FROM sends"))
+            dropped = [row for row in statuses if row not in keep]
+            self._conn.executemany("DELETE FROM sends WHERE row_number = ?", [(row,) for row in dropped])
+            self._conn.commit()
+        return sum(1 for row in dropped if statuses[row] == QUEUED)
+
+    def stats(self):
+        """
+        Returns:
+            dict: Number of sends per status
+        """
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM sends GROUP BY status"))
+        return {status: counts.get(status, 0) for status in (QUEUED, SENT, FAILED)}
+
+    def clear(self):
+        """Forget every send"""
+        with self._lock:
+            self._conn.execute("DELETE FROM sends")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Send scheduled emails in each recipient's business hours
+
+schedule_approved_emails() puts approved rows in the send queue
+(send_queue.py) with a delivery window in the recipient's timezone.
+run_scheduler() is a long-running loop that sends whatever is due through
+the pooled send engine at the governed rate, writes the outcomes back to the
+sheet, and picks up newly approved rows as they appear. Leave it running in
+the background:
+
+    nohup python tools/send_scheduler.py &
+
+or run one pass from cron with --once.
+"""
+
+import os
+import sys
+import time
+from collections import Counter
+from datetime import datetime
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    SEND_STATUS_BATCH_SIZE, SEND_STATUS_FLUSH_INTERVAL,
+    SCHEDULER_POLL_INTERVAL, SCHEDULER_SYNC_INTERVAL, SCHEDULER_BATCH_SIZE
+)
+from tools.sheet_snapshot import get_sheet_snapshot
+from tools.sheet_writer import BatchSheetWriter
+from tools.send_engine import SendEngine, SendGovernor
+from tools.send_queue import SendQueue
+from tools.send_ledger import get_send_ledger
+from tools.timezones import get_timezone
+from tools.send_emails import (
+    SMTPConnectionManager, validate_gmail_credentials, approved_businesses,
+    recent_send_times, update_sent_status, reconcile_send_ledger
+)
+
+
+def sync_queue(send_queue, snapshot, now=None, ledger=None):
+    """
+    Bring the queue in line with the sheet's approvals
+
+    Args:
+        send_queue: SendQueue
+        snapshot: Fresh SheetSnapshot
+        now: time.time() to schedule new rows from
+        ledger: Optional SendLedger to reconcile first, leaving out rows an
+            earlier run already sent or was interrupted sending
+
+    Returns:
+        tuple: (rows queued, rows dropped because they're no longer approved)
+    """
+    businesses = approved_businesses(snapshot)
+    if ledger is not None:
+        businesses = reconcile_send_ledger(ledger, snapshot, businesses)
+    added = send_queue.enqueue(businesses, now)
+    dropped = send_queue.retain(business['row_number'] for business in businesses)
+    return added, dropped
+
+
+def send_due(send_queue, engine, due):
+    """
+    Send a batch of due emails and record the outcomes
+
+    Args:
+        send_queue: SendQueue
+        engine: SendEngine
+        due: QueuedSend tuples
+
+    Returns:
+        int: Number of emails sent
+
+    Raises:
+        ValueError, ConnectionError: If Gmail can't be reached; unsent
+            emails stay queued
+    """
+    sent_count = 0
+    with BatchSheetWriter(
+        batch_size=SEND_STATUS_BATCH_SIZE,
+        flush_interval=SEND_STATUS_FLUSH_INTERVAL,
+        on_flush=engine.ledger.mark_recorded if engine.ledger is not None else None
+    ) as status_writer:
+        for business, success in engine.run([item._asdict() for item in due]):
+            row_number = business['row_number']
+            if success:
+                print(f"✅ Sent to {business['name']}")
+                send_queue.mark_sent(row_number)
+                sent_count += 1
+            else:
+                print(f"❌ Failed to send to {business['name']}")
+                send_queue.mark_failed(row_number, "Send failed")
+
+            update_sent_status(row_number, success=success, writer=status_writer)
+
+    # The ledger stopped these going out twice; don't offer them again
+    for business in engine.duplicates:
+        send_queue.mark_sent(business['row_number'])
+
+    return sent_count
+
+
+def schedule_approved_emails(send_queue=None):
+    """
+    Queue every approved email for its recipient's next delivery window
+
+    Args:
+        send_queue: SendQueue (default: the one under .tmp/)
+
+    Returns:
+        int: Number of newly scheduled emails
+    """
+    send_queue = send_queue or SendQueue()
+
+    print("\n🔍 Finding approved businesses...")
+    try:
+        snapshot = get_sheet_snapshot(refresh=True)
+    except Exception as error:
+        print(f"❌ Error getting approved businesses: {error}")
+        return 0
+
+    added, dropped = sync_queue(send_queue, snapshot, ledger=get_send_ledger())
+    if dropped:
+        print(f"🗑️  Removed {dropped} scheduled emails that are no longer approved")
+
+    stats = send_queue.stats()
+    if not stats['queued']:
+        print("❌ No approved businesses to schedule")
+        print("   Make sure businesses have Status = 'Approved' in Google Sheet")
+        return 0
+
+    print(f"\n📅 Scheduled {added} new emails ({stats['queued']} waiting in total)")
+    windows = Counter()
+    for item in send_queue.pending():
+        start = datetime.fromtimestamp(item.not_before, get_timezone(item.timezone))
+        windows[(item.timezone or 'local time', start.strftime('%a %H:%M'))] += 1
+    for (timezone, start), count in sorted(windows.items()):
+        print(f"  - {count} from {start} ({timezone})")
+
+    print("\n▶️  Start the scheduler to send them as their windows open:")
+    print("   python tools/send_scheduler.py")
+    return added
+
+
+def run_scheduler(send_queue=None, connect=None, governor=None, ledger=None, once=False,
+                  poll_interval=SCHEDULER_POLL_INTERVAL, sync_interval=SCHEDULER_SYNC_INTERVAL,
+                  batch_size=SCHEDULER_BATCH_SIZE, clock=time.time, sleep=time.sleep):
+    """
+    Send queued emails as their delivery windows open
+
+    Args:
+        send_queue: SendQueue (default: the one under .tmp/)
+        connect: Callable returning an SMTP connection context manager
+            (default: SMTPConnectionManager with the .env credentials)
+        governor: SendGovernor (default: limits from constants, counting
+            sends already in the sheet)
+        ledger: SendLedger guarding against duplicate sends (default: the
+            one under .tmp/); reconciled against the sheet on the first sync
+        once: Do a single pass instead of looping
+        poll_interval: Seconds to wait when nothing is due
+        sync_interval: Seconds between re-reading approvals while idle (the
+            sheet is also re-read before every batch)
+        batch_size: Due sends taken per pass
+        clock: Time source
+        sleep: Sleep function
+
+    Returns:
+        int: Number of emails sent
+    """
+    if connect is None:
+        try:
+            gmail_address, gmail_password = validate_gmail_credentials()
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 0
+        connect = lambda: SMTPConnectionManager(gmail_address, gmail_password)
+
+    send_queue = send_queue or SendQueue()
+    ledger = ledger or get_send_ledger()
+    sent_count = 0
+    last_sync = None
+
+    print("⏰ Send scheduler running (Ctrl+C to stop, scheduled emails are kept)")
+    try:
+        while True:
+            now = clock()
+            send_queue.reschedule_missed(now)
+
+            # Re-read the sheet before sending, so rows sent or unapproved
+            # elsewhere since the last sync aren't sent again
+            room = governor is None or governor.sent_today() < governor.per_day
+            stale = last_sync is None or now - last_sync >= sync_interval
+            synced = False
+            if stale or (room and send_queue.due(now, limit=1)):
+                try:
+                    snapshot = get_sheet_snapshot(refresh=True)
+                except Exception as error:
+                    print(f"⚠️  Could not read the sheet ({error}), retrying later")
+                else:
+                    # Later syncs rely on the engine's ledger check
+                    reconcile = ledger if last_sync is None else None
+                    synced = True
+                    last_sync = now
+                    added, dropped = sync_queue(send_queue, snapshot, now, reconcile)
+                    if added or dropped:
+                        print(f"📅 {added} emails scheduled, {dropped} removed")
+                    if governor is None:
+                        governor = SendGovernor(sent_times=recent_send_times(snapshot))
+                        room = governor.sent_today() < governor.per_day
+
+            due = send_queue.due(now, limit=batch_size) if synced and room else []
+            if due:
+                engine = SendEngine(connect, governor=governor, ledger=ledger)
+                try:
+                    sent_count += send_due(send_queue, engine, due)
+                except ValueError as e:
+                    print(f"\n❌ SMTP connection error: {e}")
+                    return sent_count
+                except ConnectionError as e:
+                    print(f"\n⚠️  SMTP connection error ({e}), retrying in {poll_interval}s")
+                    due = []
+
+            if once:
+                return sent_count
+            if not due:
+                sleep(poll_interval)
+
+    except KeyboardInterrupt:
+        print(f"\n⏹️  Scheduler stopped after sending {sent_count} emails")
+        return sent_count
+
+
+if __name__ == "__main__":
+    run_scheduler(once='--once' in sys.argv)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Shared snapshot of the campaign Google Sheet
+
+Downloads the data range once, keeps it column-oriented and indexes row
+offsets by status, so every tool that needs Draft / Approved / Sent / Replied
+rows filters only the matching rows instead of re-downloading the sheet.
+"""
+
+import os
+import sys
+import time
+import threading
+from dotenv import load_dotenv
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    SHEET_RANGE, SHEET_FIRST_DATA_ROW, SHEET_COLUMN_COUNT, SNAPSHOT_MAX_AGE,
+    COL_BUSINESS_NAME, COL_LOCATION, COL_EMAIL, COL_PHONE, COL_WEBSITE,
+    COL_CONTACT_PERSON, COL_GENERATED_SUBJECT, COL_GENERATED_BODY, COL_NOTES,
+    COL_STATUS
+)
+from tools.upload_to_sheets import get_sheets_service
+
+load_dotenv()
+
+# Fields returned for Draft rows (business dict key -> column index)
+DRAFT_FIELDS = {
+    'name': COL_BUSINESS_NAME,
+    'location': COL_LOCATION,
+    'email': COL_EMAIL,
+    'phone': COL_PHONE,
+    'website': COL_WEBSITE,
+    'contact_person': COL_CONTACT_PERSON,
+    'generated_subject': COL_GENERATED_SUBJECT,
+    'generated_body': COL_GENERATED_BODY,
+    'notes': COL_NOTES,
+    'status': COL_STATUS,
+}
+
+
+class SheetSnapshot:
+    """Column-oriented, status-indexed copy of the sheet data range"""
+
+    def __init__(self, rows, spreadsheet_id=None):
+        """
+        Build a snapshot from raw API rows
+
+        Args:
+            rows: List of row value lists as returned by values().get
+            spreadsheet_id: Sheet the rows were read from
+        """
+        self.spreadsheet_id = spreadsheet_id
+        self.fetched_at = time.monotonic()
+        self.row_count = len(rows)
+
+        # Pad / trim every row to the full width once, then transpose into
+        # one tuple per column
+        width = SHEET_COLUMN_COUNT
+        padded = (
+            row[:width] if len(row) >= width else row + [''] * (width - len(row))
+            for row in rows
+        )
+        self.columns = list(zip(*padded)) or [() for _ in range(width)]
+
+        # Status -> row offsets, so lookups only touch matching rows
+        self._status_index = {}
+        for offset, status in enumerate(self.columns[COL_STATUS]):
+            self._status_index.setdefault(status.strip().lower(), []).append(offset)
+
+    @classmethod
+    def fetch(cls, service=None, spreadsheet_id=None):
+        """
+        Download the sheet data range with a single API call
+
+        Args:
+            service: Authenticated Sheets service (default: get_sheets_service())
+            spreadsheet_id: Sheet ID (default: GOOGLE_SPREADSHEET_ID)
+
+        Returns:
+            SheetSnapshot
+
+        Raises:
+            ValueError: If no spreadsheet ID is available
+        """
+        spreadsheet_id = spreadsheet_id or os.getenv('GOOGLE_SPREADSHEET_ID')
+        if not spreadsheet_id:
+            raise ValueError("GOOGLE_SPREADSHEET_ID not set in .env")
+
+        service = service or get_sheets_service()
+        result = service.spreadsheets().values().get(
+            spreadsheetId=spreadsheet_id,
+            range=SHEET_RANGE
+        ).execute()
+
+        return cls(result.get('values', []), spreadsheet_id=spreadsheet_id)
+
+    def age(self):
+        """Seconds since the snapshot was downloaded"""
+        return time.monotonic() - self.fetched_at
+
+    def row_number(self, offset):
+        """Convert a 0-based data offset to a 1-indexed sheet row number"""
+        return offset + SHEET_FIRST_DATA_ROW
+
+    def value(self, offset, column):
+        """Get a single cell value by data offset and column index"""
+        return self.columns[column][offset]
+
+    def offsets(self, status):
+        """Data offsets of all rows with the given status (case-insensitive)"""
+        return self._status_index.get(status.strip().lower(), [])
+
+    def count(self, status):
+        """Number of rows with the given status"""
+        return len(self.offsets(status))
+
+    def businesses(self, status, fields=None):
+        """
+        Build business dictionaries for rows with the given status
+
+        Args:
+            status: Status value to match (e.g. STATUS_DRAFT)
+            fields: Mapping of dict key -> column index (default: DRAFT_FIELDS)
+
+        Returns:
+            list: Business dictionaries, each with a 'row_number'
+        """
+        fields = fields or DRAFT_FIELDS
+        columns = [(key, self.columns[col]) for key, col in fields.items()]
+
+        businesses = []
+        for offset in self.offsets(status):
+            business = {'row_number': self.row_number(offset)}
+            for key, column in columns:
+                business[key] = column[offset]
+            businesses.append(business)
+
+        return businesses
+
+
+_snapshots = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_sheet_snapshot(spreadsheet_id=None, max_age=SNAPSHOT_MAX_AGE, refresh=False):
+    """
+    Get a shared snapshot of the sheet, downloading it only when needed
+
+    Args:
+        spreadsheet_id: Sheet ID (default: GOOGLE_SPREADSHEET_ID)
+        max_age: Reuse a cached snapshot younger than this many seconds
+        refresh: Force a new download
+
+    Returns:
+        SheetSnapshot
+
+    Raises:
+        ValueError: If no spreadsheet ID is available
+    """
+    spreadsheet_id = spreadsheet_id or os.getenv('GOOGLE_SPREADSHEET_ID')
+    if not spreadsheet_id:
+        raise ValueError("GOOGLE_SPREADSHEET_ID not set in .env")
+
+    # Hold the lock while fetching so concurrent callers share one download
+    with _snapshots_lock:
+        snapshot = _snapshots.get(spreadsheet_id)
+        if snapshot is None or refresh or snapshot.age() > max_age:
+            snapshot = SheetSnapshot.fetch(spreadsheet_id=spreadsheet_id)
+            _snapshots[spreadsheet_id] = snapshot
+        return snapshot
+
+
+def invalidate_sheet_snapshot(spreadsheet_id=None):
+    """
+    Drop cached snapshots after the sheet has been modified
+
+    Args:
+        spreadsheet_id: Sheet to invalidate (default: all sheets)
+    """
+    with _snapshots_lock:
+        if spreadsheet_id:
+            _snapshots.pop(spreadsheet_id, None)
+        else:
+            _snapshots.clear()
+
+
+def test_sheet_snapshot():
+    """Test function"""
+    snapshot = get_sheet_snapshot()
+    print(f"Fetched {snapshot.row_count} rows")
+    for status in ('Draft', 'Approved', 'Sent', 'Replied'):
+        print(f"  {status}: {snapshot.count(status)}")
+
+
+if __name__ == "__main__":
+    test_sheet_snapshot()
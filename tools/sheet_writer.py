@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Buffered Google Sheets writer
+
+Collects cell updates in memory and writes them through
+spreadsheets.values.batchUpdate in size- or time-bounded chunks, instead of
+one values().update round trip per row.
+"""
+
+import os
+import sys
+import time
+import threading
+from dotenv import load_dotenv
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import SHEET_WRITE_BATCH_SIZE, SHEET_WRITE_FLUSH_INTERVAL
+from tools.upload_to_sheets import get_sheets_service
+from tools.sheet_snapshot import invalidate_sheet_snapshot
+
+load_dotenv()
+
+
+class BatchSheetWriter:
+    """
+    Context manager that buffers range updates and flushes them in batches
+
+    Pending updates are flushed when batch_size ranges are queued, when
+    flush_interval seconds have passed since the oldest pending update, and
+    on exit (including Ctrl-C).
+    """
+
+    def __init__(self, spreadsheet_id=None, service=None,
+                 batch_size=SHEET_WRITE_BATCH_SIZE,
+                 flush_interval=SHEET_WRITE_FLUSH_INTERVAL,
+                 on_flush=None):
+        """
+        Initialize writer
+
+        Args:
+            spreadsheet_id: Sheet ID (default: GOOGLE_SPREADSHEET_ID)
+            service: Authenticated Sheets service (default: built on first flush)
+            batch_size: Flush once this many ranges are pending
+            flush_interval: Flush once the oldest pending range is this old (seconds)
+            on_flush: Optional callable(tags) called after each successful
+                write with the tags of the ranges it saved
+
+        Raises:
+            ValueError: If no spreadsheet ID is available
+        """
+        self.spreadsheet_id = spreadsheet_id or os.getenv('GOOGLE_SPREADSHEET_ID')
+        if not self.spreadsheet_id:
+            raise ValueError("GOOGLE_SPREADSHEET_ID not set in .env")
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written_count = 0
+        self.on_flush = on_flush
+
+        self._service = service
+        self._pending = []
+        self._oldest_pending = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Flush whatever is left, even when interrupted"""
+        self.flush()
+        if self._pending:
+            rows = ', '.join(item['range'] for item, _ in self._pending)
+            print(f"   ⚠️  {len(self._pending)} updates were not saved: {rows}")
+
+    @property
+    def pending_count(self):
+        """Number of ranges waiting to be written"""
+        return len(self._pending)
+
+    def add_range(self, range_name, values, tag=None):
+        """
+        Queue an update for a range
+
+        Args:
+            range_name: A1 range (e.g. 'G5:H5')
+            values: 2D list of cell values
+            tag: Optional value passed to on_flush once the range is saved
+        """
+        with self._lock:
+            if not self._pending:
+                self._oldest_pending = time.monotonic()
+            self._pending.append(({'range': range_name, 'values': values}, tag))
+            due = (
+                len(self._pending) >= self.batch_size
+                or time.monotonic() - self._oldest_pending >= self.flush_interval
+            )
+
+        if due:
+            self.flush()
+
+    def add_email(self, row_number, subject, body):
+        """
+        Queue generated subject and body for a row (columns G:H)
+
+        Args:
+            row_number: Row number in the sheet (1-indexed, including header)
+            subject: Email subject line
+            body: Email body text
+        """
+        self.add_range(f'G{row_number}:H{row_number}', [[subject, body]], tag=row_number)
+
+    def flush(self):
+        """
+        Write all pending updates
+
+        Updates stay queued if the API call fails, so a later flush can
+        retry them.
+
+        Returns:
+            int: Number of ranges written
+        """
+        with self._lock:
+            if not self._pending:
+                return 0
+
+            batch, self._pending = self._pending, []
+            self._oldest_pending = None
+            written = 0
+            saved_tags = []
+
+            try:
+                if self._service is None:
+                    self._service = get_sheets_service()
+
+                while batch:
+                    chunk = batch[:self.batch_size]
+                    self._service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=self.spreadsheet_id,
+                        body={'valueInputOption': 'RAW', 'data': [item for item, _ in chunk]}
+                    ).execute()
+                    written += len(chunk)
+                    saved_tags.extend(tag for _, tag in chunk if tag is not None)
+                    batch = batch[len(chunk):]
+
+            except Exception as error:
+                print(f"   ⚠️  Could not write {len(batch)} sheet updates: {error}")
+                self._pending = batch
+                self._oldest_pending = time.monotonic()
+
+            self.written_count += written
+
+        if written:
+            invalidate_sheet_snapshot(self.spreadsheet_id)
+        if saved_tags and self.on_flush:
+            self.on_flush(saved_tags)
+        return written
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Check mailboxes exist with SMTP RCPT TO probes
+
+Addresses are grouped by the MX host that receives mail for their domain.
+Each host gets one connection at a time that checks many recipients
+(MAIL FROM once, then RCPT TO per address, no DATA, so nothing is sent),
+and different hosts are probed concurrently. Hosts that accept any address
+(catch-all) are detected with a random recipient and reported as unknown.
+
+Probing is optional: many networks block outbound port 25, and some servers
+only reject recipients after accepting the message.
+"""
+
+import os
+import sys
+import time
+import uuid
+import smtplib
+from collections import namedtuple, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+import dns.resolver
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    DNS_TIMEOUT, SMTP_PROBE_PORT, SMTP_PROBE_TIMEOUT, SMTP_PROBE_MAX_HOSTS,
+    SMTP_PROBE_RCPTS_PER_CONNECTION, SMTP_PROBE_RCPT_DELAY
+)
+
+DELIVERABLE = 'deliverable'
+UNDELIVERABLE = 'undeliverable'
+UNKNOWN = 'unknown'
+
+ProbeResult = namedtuple('ProbeResult', ['status', 'code', 'message'])
+
+# A 5xx reply mentioning one of these refuses the prober (its IP, network or
+# reputation), not the mailbox: 5.7.x is the "security or policy" class
+POLICY_REJECTION_MARKERS = (
+    '5.7.', 'block', 'blacklist', 'denylist', 'spamhaus', 'spamcop', 'policy', 'reputation'
+)
+
+
+def best_mx_host(domain, timeout=DNS_TIMEOUT):
+    """
+    Find the preferred mail server for a domain
+
+    Args:
+        domain: Domain name
+        timeout: Seconds before giving up on DNS
+
+    Returns:
+        str or None: Hostname with the lowest MX preference, the domain itself
+            if it has no MX records but has an address (implicit MX), or None
+            if the domain doesn't exist or can't receive mail
+
+    Raises:
+        dns.exception.DNSException: If DNS failed in a way that may be
+            temporary (timeouts, SERVFAIL, no nameservers reachable)
+    """
+    try:
+        answer = dns.resolver.resolve(domain, 'MX', lifetime=timeout)
+    except dns.resolver.NXDOMAIN:
+        return None
+    except dns.resolver.NoAnswer:
+        # No MX records: mail goes to the domain's own address, if it has one
+        for record_type in ('A', 'AAAA'):
+            try:
+                dns.resolver.resolve(domain, record_type, lifetime=timeout)
+                return domain
+            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+                continue
+        return None
+
+    records = sorted(answer, key=lambda record: record.preference)
+    return str(records[0].exchange).rstrip('.') or None
+
+
+def classify_reply(code, message=b''):
+    """
+    Turn an RCPT TO reply into a probe result
+
+    Args:
+        code: SMTP reply code
+        message: Reply text
+
+    Returns:
+        ProbeResult
+    """
+    if isinstance(message, bytes):
+        message = message.decode('utf-8', 'replace')
+    if code in (250, 251):
+        return ProbeResult(DELIVERABLE, code, message)
+    if 550 <= code <= 553:
+        lowered = message.lower()
+        if any(marker in lowered for marker in POLICY_REJECTION_MARKERS):
+            # Blocklisted or refused by policy: the mailbox may well exist
+            return ProbeResult(UNKNOWN, code, message)
+        return ProbeResult(UNDELIVERABLE, code, message)
+    # 4xx (greylisting, rate limits) and anything unusual say nothing definite
+    return ProbeResult(UNKNOWN, code, message)
+
+
+class HostProber:
+    """Checks recipients against one MX host over as few connections as possible"""
+
+    def __init__(self, host, port=SMTP_PROBE_PORT, mail_from='', timeout=SMTP_PROBE_TIMEOUT,
+                 rcpts_per_connection=SMTP_PROBE_RCPTS_PER_CONNECTION,
+                 rcpt_delay=SMTP_PROBE_RCPT_DELAY):
+        """
+        Initialize prober
+
+        Args:
+            host: MX hostname
+            port: SMTP port
+            mail_from: Envelope sender used for MAIL FROM
+            timeout: Seconds per SMTP command
+            rcpts_per_connection: RCPT checks before reconnecting
+            rcpt_delay: Seconds between RCPT checks (politeness)
+        """
+        self.host = host
+        self.port = port
+        self.mail_from = mail_from
+        self.timeout = timeout
+        self.rcpts_per_connection = rcpts_per_connection
+        self.rcpt_delay = rcpt_delay
+        self.connections = 0
+
+        self._server = None
+        self._rcpts = 0
+
+    def _connect(self):
+        self.close()
+        self._server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        self.connections += 1
+        self._server.ehlo_or_helo_if_needed()
+        code, message = self._server.mail(self.mail_from)
+        if code != 250:
+            raise smtplib.SMTPSenderRefused(code, message, self.mail_from)
+        self._rcpts = 0
+
+    def check(self, email):
+        """
+        Ask the host whether it accepts a recipient
+
+        Args:
+            email: Email address
+
+        Returns:
+            ProbeResult
+        """
+        if self._server is None or self._rcpts >= self.rcpts_per_connection:
+            self._connect()
+        elif self.rcpt_delay:
+            time.sleep(self.rcpt_delay)
+
+        self._rcpts += 1
+        code, message = self._server.rcpt(email)
+        return classify_reply(code, message)
+
+    def probe(self, emails):
+        """
+        Check many recipients, detecting catch-all domains first
+
+        Args:
+            emails: Addresses whose domains are served by this host
+
+        Returns:
+            dict: email -> ProbeResult
+        """
+        by_domain = defaultdict(list)
+        for email in emails:
+            by_domain[email.rsplit('@', 1)[-1]].append(email)
+
+        results = {}
+        try:
+            for domain, addresses in by_domain.items():
+                # A host that accepts a made-up mailbox accepts everything
+                canary = self.check(f"probe-{uuid.uuid4().hex[:12]}@{domain}")
+                if canary.status == DELIVERABLE:
+                    for email in addresses:
+                        results[email] = ProbeResult(UNKNOWN, canary.code, "Domain accepts all addresses")
+                    continue
+
+                for email in addresses:
+                    results[email] = self.check(email)
+
+        except (smtplib.SMTPException, OSError) as e:
+            # Whatever wasn't checked stays unknown
+            for email in emails:
+                results.setdefault(email, ProbeResult(UNKNOWN, None, f"Probe failed: {e}"))
+        finally:
+            self.close()
+
+        return results
+
+    def close(self):
+        """End the SMTP session"""
+        if self._server is not None:
+            try:
+                self._server.rset()
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                self._server.close()
+            self._server = None
+
+
+def probe_mailboxes(emails, mx_host=best_mx_host, port=SMTP_PROBE_PORT, mail_from=None,
+                    max_hosts=SMTP_PROBE_MAX_HOSTS, **prober_options):
+    """
+    Check many mailboxes, grouped by MX host
+
+    Args:
+        emails: Iterable of normalized email addresses
+        mx_host: Callable(domain) -> MX hostname or None, raising
+            dns.exception.DNSException if the lookup failed
+        port: SMTP port on the MX hosts
+        mail_from: Envelope sender (default: GMAIL_ADDRESS)
+        max_hosts: Hosts probed at the same time
+        prober_options: Passed to HostProber (timeout, rcpts_per_connection,
+            rcpt_delay)
+
+    Returns:
+        dict: email -> ProbeResult
+    """
+    mail_from = mail_from if mail_from is not None else os.getenv('GMAIL_ADDRESS', '')
+
+    emails = list(dict.fromkeys(emails))
+    hosts_by_domain = {}
+    dns_errors = {}
+    by_host = defaultdict(list)
+    results = {}
+
+    for email in emails:
+        domain = email.rsplit('@', 1)[-1]
+        if domain not in hosts_by_domain and domain not in dns_errors:
+            try:
+                hosts_by_domain[domain] = mx_host(domain)
+            except dns.exception.DNSException as e:
+                dns_errors[domain] = e
+
+        if domain in dns_errors:
+            # A failed lookup says nothing about the domain; try again later
+            results[email] = ProbeResult(UNKNOWN, None, f"DNS lookup failed: {dns_errors[domain]}")
+        elif hosts_by_domain[domain] is None:
+            results[email] = ProbeResult(UNDELIVERABLE, None, "Domain has no mail server")
+        else:
+            by_host[hosts_by_domain[domain]].append(email)
+
+    if not by_host:
+        return results
+
+    def probe_host(item):
+        host, addresses = item
+        prober = HostProber(host, port=port, mail_from=mail_from, **prober_options)
+        return prober.probe(addresses)
+
+    with ThreadPoolExecutor(max_workers=min(max_hosts, len(by_host))) as executor:
+        for host_results in executor.map(probe_host, by_host.items()):
+            results.update(host_results)
+
+    return results
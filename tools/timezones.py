@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Work out a business's timezone from its location and find delivery windows
+
+Locations come from Google Maps, JSON imports or manual entry, so they are
+free-form ("123 Main St, Austin, TX 78701", "Toronto, ON", "London, UK").
+The timezone is taken from the US state or Canadian province (the zone most
+of the state's population uses) or the country at the end of the address.
+Anything unrecognized uses a default zone.
+"""
+
+import os
+import re
+import sys
+from datetime import datetime, timedelta, time as dtime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    SEND_WINDOW_START_HOUR, SEND_WINDOW_END_HOUR, SEND_WEEKDAYS_ONLY, SEND_DEFAULT_TIMEZONE
+)
+
+REGION_TIMEZONES = {
+    # US states
+    'AL': 'America/Chicago', 'AK': 'America/Anchorage', 'AZ': 'America/Phoenix',
+    'AR': 'America/Chicago', 'CA': 'America/Los_Angeles', 'CO': 'America/Denver',
+    'CT': 'America/New_York', 'DE': 'America/New_York', 'DC': 'America/New_York',
+    'FL': 'America/New_York', 'GA': 'America/New_York', 'HI': 'Pacific/Honolulu',
+    'ID': 'America/Boise', 'IL': 'America/Chicago', 'IN': 'America/Indiana/Indianapolis',
+    'IA': 'America/Chicago', 'KS': 'America/Chicago', 'KY': 'America/New_York',
+    'LA': 'America/Chicago', 'ME': 'America/New_York', 'MD': 'America/New_York',
+    'MA': 'America/New_York', 'MI': 'America/Detroit', 'MN': 'America/Chicago',
+    'MS': 'America/Chicago', 'MO': 'America/Chicago', 'MT': 'America/Denver',
+    'NE': 'America/Chicago', 'NV': 'America/Los_Angeles', 'NH': 'America/New_York',
+    'NJ': 'America/New_York', 'NM': 'America/Denver', 'NY': 'America/New_York',
+    'NC': 'America/New_York', 'ND': 'America/Chicago', 'OH': 'America/New_York',
+    'OK': 'America/Chicago', 'OR': 'America/Los_Angeles', 'PA': 'America/New_York',
+    'RI': 'America/New_York', 'SC': 'America/New_York', 'SD': 'America/Chicago',
+    'TN': 'America/Chicago', 'TX': 'America/Chicago', 'UT': 'America/Denver',
+    'VT': 'America/New_York', 'VA': 'America/New_York', 'WA': 'America/Los_Angeles',
+    'WV': 'America/New_York', 'WI': 'America/Chicago', 'WY': 'America/Denver',
+    'PR': 'America/Puerto_Rico',
+    # Canadian provinces and territories
+    'AB': 'America/Edmonton', 'BC': 'America/Vancouver', 'MB': 'America/Winnipeg',
+    'NB': 'America/Moncton', 'NL': 'America/St_Johns', 'NS': 'America/Halifax',
+    'NT': 'America/Yellowknife', 'NU': 'America/Iqaluit', 'ON': 'America/Toronto',
+    'PE': 'America/Halifax', 'QC': 'America/Toronto', 'SK': 'America/Regina',
+    'YT': 'America/Whitehorse',
+}
+
+REGION_NAMES = {
+    'alabama': 'AL', 'alaska': 'AK', 'arizona': 'AZ', 'arkansas': 'AR', 'california': 'CA',
+    'colorado': 'CO', 'connecticut': 'CT', 'delaware': 'DE', 'district of columbia': 'DC',
+    'florida': 'FL', 'georgia': 'GA', 'hawaii': 'HI', 'idaho': 'ID', 'illinois': 'IL',
+    'indiana': 'IN', 'iowa': 'IA', 'kansas': 'KS', 'kentucky': 'KY', 'louisiana': 'LA',
+    'maine': 'ME', 'maryland': 'MD', 'massachusetts': 'MA', 'michigan': 'MI',
+    'minnesota': 'MN', 'mississippi': 'MS', 'missouri': 'MO', 'montana': 'MT',
+    'nebraska': 'NE', 'nevada': 'NV', 'new hampshire': 'NH', 'new jersey': 'NJ',
+    'new mexico': 'NM', 'new york': 'NY', 'north carolina': 'NC', 'north dakota': 'ND',
+    'ohio': 'OH', 'oklahoma': 'OK', 'oregon': 'OR', 'pennsylvania': 'PA',
+    'rhode island': 'RI', 'south carolina': 'SC', 'south dakota': 'SD', 'tennessee': 'TN',
+    'texas': 'TX', 'utah': 'UT', 'vermont': 'VT', 'virginia': 'VA', 'washington': 'WA',
+    'west virginia': 'WV', 'wisconsin': 'WI', 'wyoming': 'WY', 'puerto rico': 'PR',
+    'alberta': 'AB', 'british columbia': 'BC', 'manitoba': 'MB', 'new brunswick': 'NB',
+    'newfoundland and labrador': 'NL', 'nova scotia': 'NS', 'ontario': 'ON',
+    'prince edward island': 'PE', 'quebec': 'QC', 'saskatchewan': 'SK',
+}
+
+COUNTRY_TIMEZONES = {
+    'uk': 'Europe/London', 'united kingdom': 'Europe/London', 'england': 'Europe/London',
+    'scotland': 'Europe/London', 'wales': 'Europe/London', 'ireland': 'Europe/Dublin',
+    'france': 'Europe/Paris', 'germany': 'Europe/Berlin', 'deutschland': 'Europe/Berlin',
+    'spain': 'Europe/Madrid', 'italy': 'Europe/Rome', 'netherlands': 'Europe/Amsterdam',
+    'belgium': 'Europe/Brussels', 'switzerland': 'Europe/Zurich', 'austria': 'Europe/Vienna',
+    'portugal': 'Europe/Lisbon', 'sweden': 'Europe/Stockholm', 'norway': 'Europe/Oslo',
+    'denmark': 'Europe/Copenhagen', 'finland': 'Europe/Helsinki', 'poland': 'Europe/Warsaw',
+    'australia': 'Australia/Sydney', 'new zealand': 'Pacific/Auckland',
+    'singapore': 'Asia/Singapore', 'japan': 'Asia/Tokyo', 'india': 'Asia/Kolkata',
+    'united arab emirates': 'Asia/Dubai', 'uae': 'Asia/Dubai', 'south africa': 'Africa/Johannesburg',
+    'mexico': 'America/Mexico_City', 'brazil': 'America/Sao_Paulo',
+    'usa': 'America/New_York', 'us': 'America/New_York', 'united states': 'America/New_York',
+    'canada': 'America/Toronto',
+}
+
+CANADIAN_REGIONS = {'AB', 'BC', 'MB', 'NB', 'NL', 'NS', 'NT', 'NU', 'ON', 'PE', 'QC', 'SK', 'YT'}
+
+# Regions that can appear in an address ending in each country
+COUNTRY_REGIONS = {
+    'usa': set(REGION_TIMEZONES) - CANADIAN_REGIONS,
+    'us': set(REGION_TIMEZONES) - CANADIAN_REGIONS,
+    'united states': set(REGION_TIMEZONES) - CANADIAN_REGIONS,
+    'canada': CANADIAN_REGIONS,
+}
+
+# US ZIP ("78701", "78701-1234"), Canadian ("M5V 2T6") and UK ("SW1A 1AA")
+# postcodes; every form has digits, so it can't swallow a place name
+POSTCODE = r'(?:\d{5}(?:-\d{4})?|[a-z]\d[a-z]\s?\d[a-z]\d|[a-z]{1,2}\d[a-z\d]?\s?\d[a-z]{2})'
+
+# "TX", "TX 78701", "ON M5V 2T6" as an address part
+REGION_CODE_PATTERN = re.compile(rf'^([a-z]{{2}})(?:\s+{POSTCODE})?$', re.IGNORECASE)
+POSTCODE_SUFFIX_PATTERN = re.compile(rf'\s+{POSTCODE}$', re.IGNORECASE)
+
+
+def region_for_part(part, allow_code=True):
+    """
+    Find the state or province an address part names
+
+    Args:
+        part: One comma-separated part of an address
+        allow_code: Whether a bare two-letter code counts
+
+    Returns:
+        str or None: Region code (e.g. 'TX'), or None
+    """
+    match = REGION_CODE_PATTERN.match(part)
+    if allow_code and match and match.group(1).upper() in REGION_TIMEZONES:
+        return match.group(1).upper()
+    return REGION_NAMES.get(POSTCODE_SUFFIX_PATTERN.sub('', part).lower())
+
+
+def timezone_name_for_location(location):
+    """
+    Guess the IANA timezone of a free-form location
+
+    A country at the end of the address limits the regions that apply, so
+    "DE" in a German address isn't taken for Delaware. Without a country, a
+    two-letter code only counts after a city ("Dover, DE").
+
+    Args:
+        location: Address or "City, ST" text
+
+    Returns:
+        str or None: Timezone name, or None if the location isn't recognized
+    """
+    parts = [part.strip() for part in (location or '').split(',') if part.strip()]
+
+    for index in range(len(parts) - 1, -1, -1):
+        country = parts[index].lower()
+        if country in COUNTRY_TIMEZONES:
+            # Keep looking for a state or province before a plain country name
+            regions = COUNTRY_REGIONS.get(country, ())
+            for part in reversed(parts[:index]):
+                region = region_for_part(part)
+                if region in regions:
+                    return REGION_TIMEZONES[region]
+            return COUNTRY_TIMEZONES[country]
+
+    # The region is usually near the end of the address
+    for index in range(len(parts) - 1, -1, -1):
+        region = region_for_part(parts[index], allow_code=index > 0)
+        if region:
+            return REGION_TIMEZONES[region]
+
+    return None
+
+
+def get_timezone(name):
+    """
+    Load a timezone, falling back to this machine's local zone
+
+    Args:
+        name: IANA timezone name, or None/'' for local time
+
+    Returns:
+        tzinfo
+    """
+    if name:
+        try:
+            return ZoneInfo(name)
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return datetime.now().astimezone().tzinfo
+
+
+def timezone_for_location(location, default=SEND_DEFAULT_TIMEZONE):
+    """
+    Timezone name to schedule a business's email in
+
+    Args:
+        location: Business location text
+        default: Zone used when the location isn't recognized (None means
+            this machine's local time)
+
+    Returns:
+        str: Timezone name ('' for local time)
+    """
+    return timezone_name_for_location(location) or default or ''
+
+
+def delivery_window(timezone_name, now, start_hour=SEND_WINDOW_START_HOUR,
+                    end_hour=SEND_WINDOW_END_HOUR, weekdays_only=SEND_WEEKDAYS_ONLY):
+    """
+    The current or next delivery window in a timezone
+
+    Args:
+        timezone_name: IANA timezone name ('' for local time)
+        now: time.time() to schedule from
+        start_hour: Local hour sending may start
+        end_hour: Local hour sending must stop (exclusive)
+        weekdays_only: Skip Saturdays and Sundays
+
+    Returns:
+        tuple: (not_before, not_after) as time.time() values; not_before is
+            now if the window is already open
+    """
+    tz = get_timezone(timezone_name)
+    day = datetime.fromtimestamp(now, tz).date()
+
+    for _ in range(8):
+        if not weekdays_only or day.weekday() < 5:
+            start = datetime.combine(day, dtime(start_hour), tzinfo=tz).timestamp()
+            end = datetime.combine(day, dtime(0), tzinfo=tz) + timedelta(hours=end_hour)
+            end = end.timestamp()
+            if end > now:
+                return max(start, now), end
+        day += timedelta(days=1)
+
+    raise ValueError(f"No delivery window between {start_hour}:00 and {end_hour}:00")
@@ -4,17 +4,18 @@ Track email responses from Gmail
 """
 
 import os
+import sys
 import time
 from datetime import datetime
 from dotenv import load_dotenv
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
-import pickle
-from pathlib import Path
 import requests
+from .google_services import get_google_service
 from .upload_to_sheets import get_sheets_service
+from .sheet_snapshot import get_sheet_snapshot, invalidate_sheet_snapshot
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import STATUS_SENT, COL_BUSINESS_NAME, COL_EMAIL, COL_DATE_SENT
 
 load_dotenv()
 
@@ -23,60 +24,26 @@ GMAIL_SCOPES = ['https://www.googleapis.com/auth/gmail.readonly']
 
 
 def get_gmail_service():
-    """Get authenticated Gmail service"""
-
-    creds = None
-    token_path = Path(__file__).parent.parent / "gmail_token.pickle"
-    creds_file = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
-
-    if token_path.exists():
-        with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
-
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(creds_file, GMAIL_SCOPES)
-            creds = flow.run_local_server(port=0)
-
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+    """
+    Get authenticated Gmail service
 
-    return build('gmail', 'v1', credentials=creds)
+    Credentials and the API client are cached; each thread gets its own
+    service instance, so this is cheap to call repeatedly.
+    """
+    return get_google_service('gmail', 'v1', 'gmail_token.pickle', GMAIL_SCOPES)
 
 
-def get_sent_businesses():
+def get_sent_businesses(refresh=False):
     """Get all businesses with Status = "Sent" """
 
     try:
-        service = get_sheets_service()
-        spreadsheet_id = os.getenv('GOOGLE_SPREADSHEET_ID')
+        snapshot = get_sheet_snapshot(refresh=refresh)
 
-        result = service.spreadsheets().values().get(
-            spreadsheetId=spreadsheet_id,
-            range='A2:N'
-        ).execute()
-
-        rows = result.get('values', [])
-
-        sent_businesses = []
-        for i, row in enumerate(rows, start=2):
-            while len(row) < 14:
-                row.append('')
-
-            status = row[9] if len(row) > 9 else ''
-
-            if status.lower() == 'sent':
-                business = {
-                    'row_number': i,
-                    'name': row[0],
-                    'email': row[2],
-                    'date_sent': row[11] if len(row) > 11 else ''
-                }
-                sent_businesses.append(business)
-
-        return sent_businesses
+        return snapshot.businesses(STATUS_SENT, {
+            'name': COL_BUSINESS_NAME,
+            'email': COL_EMAIL,
+            'date_sent': COL_DATE_SENT,
+        })
 
     except Exception as error:
         print(f"❌ Error getting sent businesses: {error}")
@@ -147,6 +114,8 @@ def update_reply_status(row_number, response_text):
             body={'values': values}
         ).execute()
 
+        invalidate_sheet_snapshot(spreadsheet_id)
+
     except Exception as error:
         print(f"   ⚠️  Could not update reply status: {error}")
 
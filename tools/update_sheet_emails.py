@@ -6,6 +6,8 @@ Update Google Sheet with generated emails
 import os
 from dotenv import load_dotenv
 from .upload_to_sheets import get_sheets_service
+from .sheet_snapshot import invalidate_sheet_snapshot
+from .sheet_writer import BatchSheetWriter
 
 load_dotenv()
 
@@ -41,10 +43,35 @@ def update_email(row_number, subject, body):
             body={'values': values}
         ).execute()
 
+        invalidate_sheet_snapshot(spreadsheet_id)
+
     except Exception as error:
         print(f"❌ Error updating row {row_number}: {error}")
 
 
+def update_emails(emails, spreadsheet_id=None):
+    """
+    Write many generated emails using batched API calls
+
+    Args:
+        emails: Iterable of (row_number, subject, body) tuples
+        spreadsheet_id: Sheet ID (default: GOOGLE_SPREADSHEET_ID)
+
+    Returns:
+        int: Number of rows written
+    """
+
+    try:
+        with BatchSheetWriter(spreadsheet_id=spreadsheet_id) as writer:
+            for row_number, subject, body in emails:
+                writer.add_email(row_number, subject, body)
+        return writer.written_count
+
+    except ValueError as error:
+        print(f"❌ {error}")
+        return 0
+
+
 def test_update_sheet_emails():
     """Test function"""
     # This will update row 2 (first business)
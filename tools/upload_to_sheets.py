@@ -4,14 +4,13 @@ Upload businesses to Google Sheets
 """
 
 import os
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import sys
 from googleapiclient.errors import HttpError
 from dotenv import load_dotenv
-import pickle
-from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tools.google_services import get_google_service
 
 load_dotenv()
 
@@ -20,30 +19,13 @@ SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
 
 
 def get_sheets_service():
-    """Get authenticated Google Sheets service"""
-
-    creds = None
-    token_path = Path(__file__).parent.parent / "token.pickle"
-    creds_file = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
-
-    # Load existing credentials
-    if token_path.exists():
-        with open(token_path, 'rb') as token:
-            creds = pickle.load(token)
-
-    # If no valid credentials, get new ones
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(creds_file, SCOPES)
-            creds = flow.run_local_server(port=0)
-
-        # Save credentials for next time
-        with open(token_path, 'wb') as token:
-            pickle.dump(creds, token)
+    """
+    Get authenticated Google Sheets service
 
-    return build('sheets', 'v4', credentials=creds)
+    Credentials and the API client are cached; each thread gets its own
+    service instance, so this is cheap to call repeatedly.
+    """
+    return get_google_service('sheets', 'v4', 'token.pickle', SCOPES)
 
 
 def upload_businesses(businesses):
@@ -130,6 +112,10 @@ def upload_businesses(businesses):
             body={'values': rows}
         ).execute()
 
+        # Imported here because sheet_snapshot depends on this module
+        from tools.sheet_snapshot import invalidate_sheet_snapshot
+        invalidate_sheet_snapshot(spreadsheet_id)
+
         print(f"   ✅ Uploaded {len(businesses)} businesses to Google Sheets")
 
     except HttpError as error:
@@ -5,20 +5,50 @@ Uses multiple validation techniques:
 1. Syntax validation (RFC 5322)
 2. Domain validation (DNS MX records)
 3. Disposable email detection
+4. Bounce history of the domain
+5. Mailbox existence via SMTP RCPT TO (optional, smtp_probe.py)
+
+MX results, disposable status and bounces are remembered per domain in the
+domain store (domain_store.py), so repeat runs only query DNS for domains
+whose results have expired.
 """
 
+import os
 import re
+import sys
+import time
+import threading
+from array import array
+from itertools import compress
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 import dns.resolver
 from email_validator import validate_email, EmailNotValidError
 
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import (
+    DNS_MAX_WORKERS, DNS_TIMEOUT, MX_CACHE_MIN_TTL, MX_CACHE_MAX_TTL, MX_NEGATIVE_TTL,
+    DOMAIN_BOUNCE_LIMIT, DOMAIN_BOUNCE_TTL
+)
+from tools.domain_store import get_domain_store
+from tools.disposable_domains import get_disposable_index, normalize_domain
+from tools.smtp_probe import probe_mailboxes, DELIVERABLE, UNDELIVERABLE
+
 
-# Common disposable email domains
+# Always treated as disposable, on top of data/disposable_domains.txt
 DISPOSABLE_DOMAINS = {
     'tempmail.com', 'guerrillamail.com', 'mailinator.com',
     '10minutemail.com', 'throwaway.email', 'temp-mail.org'
 }
 
 
+# Basic regex pattern for email validation
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+BulkSyntaxResult = namedtuple('BulkSyntaxResult', ['emails', 'valid', 'domains', 'domain_ids'])
+
+
 def is_valid_syntax(email):
     """
     Check if email has valid syntax
@@ -30,9 +60,139 @@ def is_valid_syntax(email):
         bool: True if syntax is valid
     """
 
-    # Basic regex pattern for email validation
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return EMAIL_PATTERN.match(email) is not None
+
+
+def validate_syntax_bulk(emails):
+    """
+    Normalize and syntax-check many addresses in one pass
+
+    Meant for large imports: the per-address work is a strip/lower and one
+    compiled-pattern match, and results are kept in flat arrays rather than
+    a dict per address.
+
+    Args:
+        emails: Iterable of email addresses (None and blanks are invalid)
+
+    Returns:
+        BulkSyntaxResult: emails (stripped, lowercased, in input order),
+            valid (bytearray, 1 where the syntax is valid), domains (distinct
+            domains of valid addresses, in first-seen order) and domain_ids
+            (array of indexes into domains, -1 for invalid addresses)
+    """
+    normalized = [email.strip().lower() if email else '' for email in emails]
+    valid = bytearray(map(bool, map(EMAIL_PATTERN.match, normalized)))
+
+    # A valid address has exactly one '@'
+    domains = {}
+    domain_ids = array('i', [
+        domains.setdefault(email.partition('@')[2], len(domains)) if ok else -1
+        for email, ok in zip(normalized, valid)
+    ])
+
+    return BulkSyntaxResult(normalized, valid, list(domains), domain_ids)
+
+
+class MXCache:
+    """
+    In-memory cache of MX lookups
+
+    Found records are kept for their DNS TTL (clamped to
+    MX_CACHE_MIN_TTL..MX_CACHE_MAX_TTL); missing domains and domains without
+    MX records for MX_NEGATIVE_TTL.
+    """
+
+    def __init__(self, min_ttl=MX_CACHE_MIN_TTL, max_ttl=MX_CACHE_MAX_TTL):
+        """
+        Initialize cache
+
+        Args:
+            min_ttl: Shortest time a found record is kept (seconds)
+            max_ttl: Longest time a found record is kept (seconds)
+        """
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        """
+        Look up a cached result
+
+        Args:
+            domain: Lowercase domain name
+
+        Returns:
+            bool or None: Cached result, or None if unknown or expired
+        """
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            return None
+
+    def store(self, domain, has_mx, ttl):
+        """
+        Cache a lookup result
+
+        Args:
+            domain: Lowercase domain name
+            has_mx: Whether MX records were found
+            ttl: Seconds to keep the result (None: don't cache)
+        """
+        if ttl is None:
+            return
+        if has_mx:
+            ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        with self._lock:
+            self._entries[domain] = (has_mx, time.monotonic() + ttl)
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_mx_cache = MXCache()
+
+
+def get_mx_cache():
+    """
+    Get the shared MX cache
+
+    Returns:
+        MXCache
+    """
+    return _mx_cache
+
+
+def lookup_mx(domain, timeout=DNS_TIMEOUT):
+    """
+    Query DNS for a domain's MX records
+
+    Args:
+        domain: Domain name (e.g., 'gmail.com')
+        timeout: Seconds before giving up
+
+    Returns:
+        tuple: (has_mx, ttl) where ttl is how long the answer may be cached;
+            failures that may be temporary (timeouts, SERVFAIL, servers
+            down) give (None, None): unknown, and not cached
+    """
+    try:
+        answer = dns.resolver.resolve(domain, 'MX', lifetime=timeout)
+        return True, answer.rrset.ttl
+    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+        return False, MX_NEGATIVE_TTL
+    except dns.exception.DNSException:
+        return None, None
 
 
 def has_mx_record(domain):
@@ -43,14 +203,111 @@ def has_mx_record(domain):
         domain: Domain name (e.g., 'gmail.com')
 
     Returns:
-        bool: True if MX records exist
+        bool or None: True if MX records exist, None if DNS couldn't say
     """
 
-    try:
-        dns.resolver.resolve(domain, 'MX')
-        return True
-    except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer, dns.exception.Timeout):
-        return False
+    domain = domain.lower()
+    return resolve_mx_records([domain])[domain]
+
+
+def resolve_mx_records(domains, max_workers=DNS_MAX_WORKERS):
+    """
+    Check MX records for many domains concurrently
+
+    Each distinct domain is looked up once. Results are taken from the
+    in-memory cache, then the domain store, and only the rest are queried;
+    new answers are saved to both.
+
+    Args:
+        domains: Iterable of domain names (duplicates are fine)
+        max_workers: Number of DNS queries in flight at once
+
+    Returns:
+        dict: Lowercase domain -> True if MX records exist, False if not,
+            None if the lookup failed
+    """
+    results = {}
+    uncached = []
+    for domain in {d.lower() for d in domains if d}:
+        cached = _mx_cache.get(domain)
+        if cached is None:
+            uncached.append(domain)
+        else:
+            results[domain] = cached
+
+    if not uncached:
+        return results
+
+    store = get_domain_store()
+    for domain, (has_mx, ttl) in store.get_mx_many(uncached).items():
+        _mx_cache.store(domain, has_mx, ttl)
+        results[domain] = has_mx
+
+    to_resolve = [domain for domain in uncached if domain not in results]
+    if to_resolve:
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(to_resolve))) as executor:
+            lookups = list(zip(to_resolve, executor.map(lookup_mx, to_resolve)))
+
+        for domain, (has_mx, ttl) in lookups:
+            _mx_cache.store(domain, has_mx, ttl)
+            results[domain] = has_mx
+        store.store_mx_many((domain, has_mx, ttl) for domain, (has_mx, ttl) in lookups)
+
+    return results
+
+
+def check_domains(emails, check_dns=True):
+    """
+    Look up everything needed to verify many addresses, once per domain
+
+    Disposable domains are recorded in the domain store, stored reputation
+    is loaded in one query, and (with check_dns) MX records are resolved
+    concurrently for the remaining domains.
+
+    Args:
+        emails: Iterable of email addresses
+        check_dns: Whether to resolve MX records
+
+    Returns:
+        tuple: (mx_records, reputation) dicts keyed by lowercase domain, to
+            pass to verify_email(); mx_records is None without check_dns
+    """
+    domains = validate_syntax_bulk(emails).domains
+
+    store = get_domain_store()
+    index = get_disposable_index(extra=DISPOSABLE_DOMAINS)
+    disposable = {d for d in domains if d in index}
+    store.mark_disposable(disposable)
+    reputation = store.get_many(domains)
+
+    mx_records = None
+    if check_dns:
+        mx_records = resolve_mx_records(
+            d for d in domains
+            if d not in disposable and not (d in reputation and reputation[d].disposable)
+        )
+
+    return mx_records, reputation
+
+
+def has_bounced(record):
+    """
+    Check whether a domain's send history says it doesn't accept mail
+
+    Only refusals of the domain as a whole count; a refused mailbox is
+    remembered for its own address (DomainStore.has_bounced).
+
+    Args:
+        record: DomainRecord from the domain store (or None)
+
+    Returns:
+        bool: True if the domain was refused DOMAIN_BOUNCE_LIMIT times,
+            the last within DOMAIN_BOUNCE_TTL, and never accepted a recipient
+    """
+    return (
+        bool(record) and record.bounced >= DOMAIN_BOUNCE_LIMIT and not record.delivered
+        and record.bounced_at is not None and time.time() - record.bounced_at < DOMAIN_BOUNCE_TTL
+    )
 
 
 def is_disposable(email):
@@ -64,17 +321,20 @@ def is_disposable(email):
         bool: True if disposable
     """
 
-    domain = email.split('@')[-1].lower()
-    return domain in DISPOSABLE_DOMAINS
+    domain = normalize_domain(email.split('@')[-1])
+    return domain in get_disposable_index(extra=DISPOSABLE_DOMAINS)
 
 
-def verify_email(email, check_dns=True):
+def verify_email(email, check_dns=True, mx_records=None, reputation=None):
     """
     Comprehensive email verification
 
     Args:
         email: Email address to verify
         check_dns: Whether to check DNS MX records (slower but more thorough)
+        mx_records: Optional dict of domain -> has MX from check_domains()
+        reputation: Optional dict of domain -> DomainRecord from
+            check_domains() (default: looked up in the domain store)
 
     Returns:
         dict: Verification result with status and details
@@ -105,16 +365,39 @@ def verify_email(email, check_dns=True):
 
     result['checks']['syntax'] = True
 
+    domain = email.split('@')[-1]
+    if reputation is None:
+        record = get_domain_store().get(domain)
+    else:
+        record = reputation.get(domain)
+
     # 2. Check for disposable email
-    if is_disposable(email):
+    if is_disposable(email) or (record and record.disposable):
         result['reason'] = 'Disposable email address'
         result['checks']['disposable'] = True
         return result
 
-    # 3. DNS validation (optional)
+    # 3. Earlier sends to this domain were all refused
+    if has_bounced(record):
+        result['reason'] = 'Previous emails to this domain bounced'
+        return result
+    if get_domain_store().has_bounced(email):
+        result['reason'] = 'Previous email to this address bounced'
+        return result
+
+    # 4. DNS validation (optional)
     if check_dns:
-        domain = email.split('@')[-1]
-        if not has_mx_record(domain):
+        if mx_records is not None and domain in mx_records:
+            found = mx_records[domain]
+        else:
+            found = has_mx_record(domain)
+        if found is None:
+            # DNS failed, which says nothing about the domain; keep the lead
+            # with checks['dns'] False so it can be checked again later
+            result['valid'] = True
+            result['reason'] = 'Valid syntax (MX lookup failed, domain not checked)'
+            return result
+        if not found:
             result['reason'] = 'No MX records found for domain'
             return result
         result['checks']['dns'] = True
@@ -154,11 +437,28 @@ def verify_email_list(emails, check_dns=True, show_progress=True):
         'invalid_count': 0,
     }
 
+    # Syntax is checked for the whole list up front; each distinct domain
+    # of the valid addresses is then resolved once, concurrently
+    syntax = validate_syntax_bulk(emails)
+    mx_records, reputation = check_domains(
+        compress(syntax.emails, syntax.valid), check_dns=check_dns
+    )
+    progress_every = max(10, len(emails) // 20)
+
     for i, email in enumerate(emails, 1):
-        if show_progress and i % 10 == 0:
+        if show_progress and i % progress_every == 0:
             print(f"   Processed {i}/{len(emails)}...")
 
-        verification = verify_email(email, check_dns=check_dns)
+        if not syntax.valid[i - 1]:
+            results['invalid'].append({
+                'email': email,
+                'reason': 'Invalid email syntax' if syntax.emails[i - 1] else 'Empty email address'
+            })
+            results['invalid_count'] += 1
+            continue
+
+        verification = verify_email(email, check_dns=check_dns,
+                                    mx_records=mx_records, reputation=reputation)
 
         if verification['valid']:
             results['valid'].append(email)
@@ -186,13 +486,15 @@ def verify_email_list(emails, check_dns=True, show_progress=True):
     return results
 
 
-def verify_businesses(businesses, check_dns=True):
+def verify_businesses(businesses, check_dns=True, probe_smtp=False):
     """
     Verify emails in a list of business dictionaries
 
     Args:
         businesses: List of business dicts with 'email' field
         check_dns: Whether to check DNS
+        probe_smtp: Whether to ask each mail server if the mailbox exists
+            (needs check_dns and outbound port 25)
 
     Returns:
         list: Businesses with verified emails only
@@ -212,22 +514,57 @@ def verify_businesses(businesses, check_dns=True):
 
     print(f"📊 Verifying {len(businesses_with_email)} business emails...")
 
+    mx_records, reputation = check_domains(
+        (b['email'] for b in businesses_with_email), check_dns=check_dns
+    )
+    if check_dns:
+        stats = get_domain_store().stats()
+        print(f"🌐 Checked {len(mx_records)} distinct domains "
+              f"({stats['mx_hits']} from the domain store)")
+
     verified_businesses = []
     invalid_businesses = []
 
     for business in businesses_with_email:
         email = business.get('email', '').strip()
-        verification = verify_email(email, check_dns=check_dns)
+        verification = verify_email(email, check_dns=check_dns,
+                                    mx_records=mx_records, reputation=reputation)
 
         if verification['valid']:
             business['email_verified'] = True
-            business['email_status'] = 'valid'
+            if check_dns and not verification['checks']['dns']:
+                business['email_status'] = 'unverified (MX lookup failed)'
+            else:
+                business['email_status'] = 'valid'
             verified_businesses.append(business)
         else:
             business['email_verified'] = False
             business['email_status'] = verification['reason']
             invalid_businesses.append(business)
 
+    # Mailboxes the server says don't exist move to invalid; unknown stays valid
+    if check_dns and probe_smtp and verified_businesses:
+        print(f"📮 Probing {len(verified_businesses)} mailboxes...")
+        probes = probe_mailboxes(b['email'].strip().lower() for b in verified_businesses)
+
+        # The recipients' own servers accepting them is a real delivery
+        # signal for their domains (unlike Gmail accepting a send)
+        store = get_domain_store()
+        for email, probe in probes.items():
+            if probe.status == DELIVERABLE:
+                store.record_delivery(email.rsplit('@', 1)[-1], delivered=True)
+
+        still_valid = []
+        for business in verified_businesses:
+            probe = probes.get(business['email'].strip().lower())
+            if probe and probe.status == UNDELIVERABLE:
+                business['email_verified'] = False
+                business['email_status'] = 'Mailbox does not exist'
+                invalid_businesses.append(business)
+            else:
+                still_valid.append(business)
+        verified_businesses = still_valid
+
     # Add businesses without emails (not verified)
     businesses_without_email = [
         b for b in businesses
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Persistent cache for scraped website context
+
+Stores the extracted text of each website in SQLite under .tmp/, together
+with its ETag / Last-Modified validators. Fresh entries are served without a
+request; stale entries are revalidated with a conditional GET.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import threading
+from collections import namedtuple
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from constants import WEBSITE_CACHE_TTL, WEBSITE_CACHE_FILENAME
+
+DEFAULT_CACHE_PATH = Path(__file__).parent.parent / ".tmp" / WEBSITE_CACHE_FILENAME
+
+CacheEntry = namedtuple('CacheEntry', ['text', 'etag', 'last_modified', 'fetched_at', 'fresh'])
+
+
+def normalize_url(url):
+    """
+    Normalize a website URL so equivalent spellings share a cache entry
+
+    Adds https:// when no scheme is given, lowercases scheme and host, drops
+    default ports, fragments and a bare trailing slash.
+
+    Args:
+        url: Website URL as entered in the sheet
+
+    Returns:
+        str: Normalized URL
+    """
+    url = url.strip()
+    if not url.lower().startswith(('http://', 'https://')):
+        url = 'https://' + url
+
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+
+    port = parts.port
+    if port and not (scheme == 'http' and port == 80) and not (scheme == 'https' and port == 443):
+        host = f"{host}:{port}"
+
+    path = parts.path if parts.path != '/' else ''
+    return urlunsplit((scheme, host, path, parts.query, ''))
+
+
+class WebsiteCache:
+    """SQLite-backed cache of extracted website text"""
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, ttl=WEBSITE_CACHE_TTL):
+        """
+        Open (or create) the cache
+
+        Args:
+            path: SQLite database file
+            ttl: Seconds an entry is served without revalidation
+        """
+        self.path = Path(path)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get(self, url):
+        """
+        Look up a URL
+
+        Counts a hit when a fresh entry is found and a miss otherwise (stale
+        entries are still returned so they can be revalidated).
+
+        Args:
+            url: Normalized URL
+
+        Returns:
+            CacheEntry or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            fresh = time.time() - row[3] < self.ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return CacheEntry(*row, fresh=fresh)
+
+    def store(self, url, text, etag=None, last_modified=None):
+        """
+        Save extracted text and validators for a URL
+
+        Args:
+            url: Normalized URL
+            text: Extracted website text
+            etag: ETag response header, if any
+            last_modified: Last-Modified response header, if any
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, text, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        """
+        Mark an entry fresh again after a 304 Not Modified
+
+        Args:
+            url: Normalized URL
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE pages SET fetched_at = ? WHERE url = ?",
+                (time.time(), url)
+            )
+            self._conn.commit()
+            self.revalidated += 1
+
+    def stats(self):
+        """
+        Cache counters for this session
+
+        Returns:
+            dict: hits, misses, revalidated and stored entry count
+        """
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'entries': entries,
+        }
+
+    def clear(self):
+        """Remove all cached pages"""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages")
+            self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_website_cache():
+    """
+    Get the shared website cache, opening it on first use
+
+    Returns:
+        WebsiteCache
+    """
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = WebsiteCache()
+        return _cache
@@ -7,6 +7,9 @@ import re
 from pathlib import Path
 from logger import logger
 
+BUSINESS_TYPE_PATTERN = re.compile(r'^[a-zA-Z\s\-&]+$')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 
 def validate_business_type(business_type):
     """
@@ -28,7 +31,7 @@ def validate_business_type(business_type):
         return False, "Business type must be 50 characters or less"
 
     # Check for reasonable characters (letters, spaces, hyphens)
-    if not re.match(r'^[a-zA-Z\s\-&]+$', business_type):
+    if not BUSINESS_TYPE_PATTERN.match(business_type):
         return False, "Business type can only contain letters, spaces, hyphens, and ampersands"
 
     return True, None
@@ -47,10 +50,7 @@ def validate_email(email):
     if not email:
         return False, "Email cannot be empty"
 
-    # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-
-    if not re.match(pattern, email):
+    if not EMAIL_PATTERN.match(email):
         return False, "Invalid email format. Expected: user@domain.com"
 
     if len(email) > 254:  # RFC 5321